@@ -0,0 +1,56 @@
+"""Cost of parsing and validating very long argument lists.
+
+Feeds a million ``-n VALUE`` options through ``--args-from -``
+into a command collecting them with :class:`cli.Parse`
+and measures the whole invocation through :class:`cli.testing.CliRunner`.
+
+Run with ``python benchmarks/bench_args.py``.
+"""
+
+# ruff: noqa: B008, S101
+import sys
+import time
+from typing import Annotated
+
+from pydantic import PositiveInt
+
+from cli import CLI, Option, Parse
+from cli.testing import CliRunner
+
+N_VALUES = 1_000_000
+
+
+def build_app() -> CLI:
+    app = CLI(args_from=True, output="raw")
+
+    @app.command("count")
+    def count(
+        numbers: Annotated[list[int], Parse(set[PositiveInt])] = Option(
+            [], "--number", "-n"
+        ),
+    ) -> int:
+        return len(numbers)
+
+    @app.command("noop")
+    def noop() -> None:
+        pass
+
+    return app
+
+
+def main(n: int = N_VALUES) -> None:
+    app = build_app()
+    runner = CliRunner()
+    results = {}
+    for option in ("-n", "--number"):
+        data = "".join(f"{option} {i}\n" for i in range(1, n + 1))
+        start = time.perf_counter()
+        result = runner.invoke(app, "count --args-from -", input=data)
+        results[f"{option} x {n}"] = time.perf_counter() - start
+        assert result.stdout == f"{n}\n", result.output
+    for label, value in results.items():
+        print(f"{label:<24}{value:>10.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
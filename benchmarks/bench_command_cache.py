@@ -0,0 +1,62 @@
+"""Cost of getting the :mod:`click` command of large applications.
+
+Registers thousands of commands and measures building of the :mod:`click`
+command from scratch, getting the cached command, rebuilding it after
+registering one more command and repeated invocations through
+:class:`cli.testing.CliRunner`.
+
+Run with ``python benchmarks/bench_command_cache.py``.
+"""
+
+import sys
+import time
+
+from cli import CLI
+from cli.testing import CliRunner
+
+N_COMMANDS = 2_000
+N_CALLS = 100
+
+
+def build_app(n: int) -> CLI:
+    app = CLI()
+    for i in range(n):
+
+        def command(x: int, y: int = 1) -> None:
+            pass
+
+        app.command(f"command-{i}")(command)
+    return app
+
+
+def main(n: int = N_COMMANDS, calls: int = N_CALLS) -> None:
+    app = build_app(n)
+    results = {}
+    start = time.perf_counter()
+    app.get_command()
+    results["build"] = time.perf_counter() - start
+    start = time.perf_counter()
+    app.get_command()
+    results["cached"] = time.perf_counter() - start
+
+    @app.command("extra")
+    def extra() -> None:
+        pass
+
+    start = time.perf_counter()
+    app.get_command()
+    results["incremental"] = time.perf_counter() - start
+
+    runner = CliRunner()
+    start = time.perf_counter()
+    for _ in range(calls):
+        runner.invoke(app, "command-0 1")
+    results[f"{calls} invocations"] = time.perf_counter() - start
+
+    print(f"{n} commands", file=sys.stderr)
+    for label, value in results.items():
+        print(f"{label:<20}{value * 1e3:>10.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Latency of shell completion with and without the metadata index.
+
+Generates an application with hundreds of commands registered lazily
+across many modules and measures completion requests answered
+by the regular :mod:`click` completion and from the index.
+The interpreter start-up time is reported for reference, along with
+the overhead of completion from the index over it and whether
+the target latency of completion from the index is met.
+
+Run with ``python benchmarks/bench_completion.py``.
+"""
+
+# ruff: noqa: S603
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+from subprocess import DEVNULL
+
+N_MODULES = 20
+N_COMMANDS = 20
+# Target latency of a completion request answered from the index
+TARGET_MS = 30
+
+MODULE = """
+from enum import Enum
+
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, Option
+
+
+class Mode(str, Enum):
+    fast = "fast"
+    slow = "slow"
+
+
+app = CLI()
+{commands}
+"""
+
+COMMAND = """
+@app.command("command-{i}")
+def command_{i}(
+    x: PositiveInt = Argument(1),
+    mode: Mode = Option(Mode.fast),
+    name: str = Option("x", help="Name."),
+) -> None:
+    \"\"\"Command {i}.\"\"\"
+"""
+
+APP = """
+import sys
+
+import cli
+
+index = sys.argv.pop(1) == "index"
+if index:
+    cli.fast_complete()
+
+app = cli.CLI(index=index)
+
+
+@app.callback()
+def callback() -> None:
+    pass
+
+{groups}
+
+if __name__ == "__main__":
+    app(prog_name="prog")
+"""
+
+
+def timed(func, number: int) -> float:
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main(number: int = 10) -> None:
+    commands = "".join(COMMAND.format(i=i) for i in range(N_COMMANDS))
+    groups = "\n".join(
+        f'app.add_lazy_typer("group_{m}:app", name="group-{m}", help="Group {m}.")'
+        for m in range(N_MODULES)
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for m in range(N_MODULES):
+            module = textwrap.dedent(MODULE).format(commands=commands)
+            Path(tmpdir, f"group_{m}.py").write_text(module)
+        script = Path(tmpdir, "prog")
+        script.write_text(textwrap.dedent(APP).format(groups=groups))
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join([tmpdir, str(Path(__file__).parents[1])]),
+            "_PROG_COMPLETE": "complete_bash",
+            "COMP_WORDS": "prog group-3 command-1 --mode ",
+            "COMP_CWORD": "4",
+        }
+        options = {"check": True, "env": env, "stdin": DEVNULL, "stdout": DEVNULL}
+
+        def run(*args: str, cache: str = "cache") -> None:
+            env["CLI_CACHE_DIR"] = str(Path(tmpdir, cache))
+            subprocess.run([sys.executable, *args], **options)
+
+        run(str(script), "index")
+        results = {
+            "interpreter": timed(lambda: run("-c", "pass"), number),
+            # Index of the program is never built in this cache directory
+            "click": timed(lambda: run(str(script), "click", cache="empty"), number),
+            "index": timed(lambda: run(str(script), "index"), number),
+        }
+    print(f"{N_MODULES * N_COMMANDS} commands", file=sys.stderr)
+    for label, value in results.items():
+        print(f"{label:<16}{value:>10.2f} ms", file=sys.stderr)
+    overhead = results["index"] - results["interpreter"]
+    met = "yes" if results["index"] < TARGET_MS else "no"
+    print(f"{'index overhead':<16}{overhead:>10.2f} ms", file=sys.stderr)
+    print(f"target met (<{TARGET_MS} ms): {met}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Latency of cold and warm (daemon) invocations.
+
+Compares running an application in a fresh interpreter with forwarding
+the same invocation to a warm daemon, both through the ``cli.daemon``
+client process and through an in-process :func:`cli.daemon.request` call.
+
+Run with ``python benchmarks/bench_daemon.py``.
+"""
+
+# ruff: noqa: S603
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+from subprocess import DEVNULL
+
+from cli.daemon import request
+
+APP = """
+from typing import Annotated
+
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, Option, Parse
+
+app = CLI()
+
+
+@app.callback()
+def callback() -> None:
+    pass
+
+
+@app.command("command")
+def command(
+    x: Annotated[int, Parse(PositiveInt)] = Argument(1),
+    names: list[str] = Option([], "--name"),
+) -> None:
+    print(x, names)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1] == "serve":
+        app.serve(sys.argv[2])
+    else:
+        app()
+"""
+
+ARGS = ["command", "2", "--name", "a"]
+
+
+def timed(func, number: int) -> float:
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main(number: int = 20) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        script = Path(tmpdir, "app.py")
+        script.write_text(textwrap.dedent(APP))
+        sock = Path(tmpdir, "app.sock")
+        daemon = subprocess.Popen([sys.executable, str(script), "serve", str(sock)])
+        try:
+            while not sock.exists():
+                time.sleep(0.01)
+            run = [sys.executable, str(script), *ARGS]
+            client = [sys.executable, "-m", "cli.daemon", str(sock), *ARGS]
+            env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent)}
+            options = {"check": True, "env": env, "stdin": DEVNULL, "stdout": DEVNULL}
+            results = {
+                "cold": timed(lambda: subprocess.run(run, **options), number),
+                "warm (client)": timed(
+                    lambda: subprocess.run(client, **options), number
+                ),
+                "warm (request)": timed(lambda: request(sock, ARGS), number),
+            }
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    for label, value in results.items():
+        print(f"{label:<16}{value:>10.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
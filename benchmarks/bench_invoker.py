@@ -0,0 +1,74 @@
+"""Per-call overhead of command invokers.
+
+Compares compiled single-frame invokers generated by
+:class:`cli.commands.CommandDescriptor` with the chain of
+:func:`cli.decorators.validated_with` and :func:`cli.decorators.debuggable`
+wrappers that was used before.
+
+Run with ``python benchmarks/bench_invoker.py``.
+"""
+
+# ruff: noqa: B008
+import timeit
+from typing import Annotated
+
+from pydantic import NonNegativeInt, PositiveInt
+
+from cli import CLI, Argument, Option, Parse
+from cli.decorators import debuggable, validated_with
+
+app = CLI()
+
+
+@app.command("simple")
+def simple(x: int = Argument(1), y: str = Option("y")) -> None:
+    pass
+
+
+@app.command("complex")
+def complex(
+    count: NonNegativeInt = Argument(1),
+    names: list[str] = Option([], "--name"),
+    numbers: Annotated[list[int], Parse(set[PositiveInt])] = Option([], "--number"),
+) -> None:
+    pass
+
+
+def chain(descriptor, func):
+    """Recreate the wrapper chain applied on every call."""
+
+    def decorated(*args, **kwds):
+        local_func = validated_with(descriptor.model)(func)
+        local_func = debuggable(local_func)
+        return local_func(*args, **kwds)
+
+    return decorated
+
+
+CASES = {
+    "simple": (simple, {"x": 1, "y": "y"}),
+    "complex": (complex, {"count": 3, "names": ["a", "b"], "numbers": [1, 2, 3]}),
+}
+
+
+def main(number: int = 20_000) -> None:
+    print(f"{'command':<10}{'chain [us]':>14}{'invoker [us]':>14}{'speedup':>10}")
+    for name, (descriptor, kwds) in CASES.items():
+        command = next(c for c in app.registered_commands if c.name == name)
+        invoker = command.callback
+        wrapped = chain(descriptor, invoker.__wrapped__)
+        results = {}
+        for label, func in (("chain", wrapped), ("invoker", invoker)):
+            func(**kwds)
+            timer = timeit.Timer(lambda func=func, kwds=kwds: func(**kwds))
+            best = min(timer.repeat(repeat=5, number=number))
+            results[label] = best / number * 1e6
+        speedup = results["chain"] / results["invoker"]
+        print(
+            f"{name:<10}{results['chain']:>14.2f}"
+            f"{results['invoker']:>14.2f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
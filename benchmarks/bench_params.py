@@ -0,0 +1,65 @@
+"""Cost of building applications with thousands of parameters.
+
+Builds a command with 5,000 options created programmatically
+and measures construction of parameters, registration of the command,
+building of the :mod:`click` command and of the validation model.
+Memory retained by parameter objects is reported as well.
+
+Run with ``python benchmarks/bench_params.py``.
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from cli import CLI, Option
+
+N_OPTIONS = 5_000
+
+
+def build_options(n: int) -> dict[str, Any]:
+    return {
+        f"option_{i}": Option(i, f"--option-{i}", help=f"Option {i}.", ge=0)
+        for i in range(n)
+    }
+
+
+def build_command(options: dict[str, Any]) -> Any:
+    params = ", ".join(f"{name}: int = __options[{name!r}]" for name in options)
+    namespace = {"__options": options}
+    exec(f"def command({params}) -> None:\n    pass\n", namespace)  # noqa: S102
+    return namespace["command"]
+
+
+def main(n: int = N_OPTIONS) -> None:
+    results = {}
+    start = time.perf_counter()
+    options = build_options(n)
+    results["options"] = time.perf_counter() - start
+
+    app = CLI()
+    func = build_command(options)
+    start = time.perf_counter()
+    descriptor = app.command("command")(func)
+    results["registration"] = time.perf_counter() - start
+    start = time.perf_counter()
+    app.get_command()
+    results["click command"] = time.perf_counter() - start
+    start = time.perf_counter()
+    _ = descriptor.model
+    results["model"] = time.perf_counter() - start
+
+    tracemalloc.start()
+    options = build_options(n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{n} options", file=sys.stderr)
+    for label, value in results.items():
+        print(f"{label:<16}{value * 1e3:>10.2f} ms", file=sys.stderr)
+    print(f"{'memory':<16}{size / 2**20:>10.2f} MiB", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
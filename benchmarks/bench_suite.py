@@ -0,0 +1,302 @@
+"""Decoration, first-call and per-call overhead of command styles.
+
+Covers all command styles exercised in ``tests/test_basic.py``
+(functions, static and class methods, class- and instance-bound
+methods and their derived variants) as well as commands with
+:class:`cli.Parse` collection parameters and command validators.
+For every case three costs are measured:
+
+``decoration``
+    Defining and registering the command on a fresh application.
+``first_call``
+    The first call of the registered callback, which builds
+    validation models.
+``per_call``
+    Steady-state cost of calling the registered callback.
+
+Results are reported in microseconds and can be saved as JSON
+and compared against a previously saved baseline::
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json
+
+Comparison exits with status 1 when any result is slower than
+the baseline by more than the tolerance. The same cases are exposed
+to ``pytest-benchmark`` in ``benchmarks/test_bench_suite.py``.
+"""
+
+# ruff: noqa: B008
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from typing import Annotated, Any
+
+from pydantic import NonNegativeInt, PositiveInt
+
+from cli import CLI, Argument, Option, Parse
+
+Case = Callable[[CLI], dict[str, Any]]
+CASES: dict[str, Case] = {}
+KWDS = {"count": 2, "names": ["a", "b"]}
+
+Count = Argument(annotation=NonNegativeInt)
+Names = Option(..., "--name", "-n", annotation=list[str], default_factory=list)
+
+
+def case(func: Case) -> Case:
+    """Register a case defining a command on the application.
+
+    Cases return keyword arguments of a call of the command.
+    """
+    CASES[func.__name__] = func
+    return func
+
+
+def callback(app: CLI) -> Callable[..., Any]:
+    """Get callback of the last command registered on the application."""
+    return app.registered_commands[-1].callback  # type: ignore
+
+
+# Cases --------------------------------------------------------------------------------
+
+
+@case
+def function(app: CLI) -> dict[str, Any]:
+    @app.command("command")
+    def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+        pass
+
+    return KWDS
+
+
+@case
+def function_typer(app: CLI) -> dict[str, Any]:
+    @app.command("command", validate=False)
+    def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+        pass
+
+    return KWDS
+
+
+@case
+def staticmethod_(app: CLI) -> dict[str, Any]:
+    class StaticMethod:
+        @app.command("command")
+        @staticmethod
+        def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    return KWDS
+
+
+@case
+def classmethod_(app: CLI) -> dict[str, Any]:
+    class ClassMethod:
+        @app.command("command")
+        @classmethod
+        def command(cls, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    return KWDS
+
+
+@case
+def classmethod_bound(app: CLI) -> dict[str, Any]:
+    class ClassMethod:
+        @classmethod
+        def command(cls, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    app.command("command")(ClassMethod.command)
+    return KWDS
+
+
+@case
+def method_bound(app: CLI) -> dict[str, Any]:
+    class SomeClass:
+        def command(self, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    app.command("command")(SomeClass().command)
+    return KWDS
+
+
+@case
+def derived_staticmethod(app: CLI) -> dict[str, Any]:
+    class StaticMethod:
+        @app.command("base")
+        @staticmethod
+        def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    class DerivedStaticMethod(StaticMethod):
+        @app.command("command")
+        @staticmethod
+        def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+            super(DerivedStaticMethod, DerivedStaticMethod).command(count, names)
+
+    return KWDS
+
+
+@case
+def derived_classmethod(app: CLI) -> dict[str, Any]:
+    class ClassMethod:
+        @app.command("base")
+        @classmethod
+        def command(cls, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    class DerivedClassMethod(ClassMethod):
+        @app.command("command")
+        @classmethod
+        def command(cls, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            super().command(count, names)
+
+    return KWDS
+
+
+@case
+def derived_method_bound(app: CLI) -> dict[str, Any]:
+    class SomeClass:
+        def command(self, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            pass
+
+    class SomeDerivedClass(SomeClass):
+        def command(self, count: Count.ann = Count, names: Names.ann = Names) -> None:
+            super().command(count, names)
+
+    app.command("command")(SomeDerivedClass().command)
+    return KWDS
+
+
+@case
+def parse_collection(app: CLI) -> dict[str, Any]:
+    @app.command("command")
+    def command(
+        count: Count.ann = Count,
+        numbers: Annotated[list[int], Parse(set[PositiveInt])] = Option([], "--number"),
+    ) -> None:
+        pass
+
+    return {"count": 2, "numbers": [1, 2, 3, 2]}
+
+
+@case
+def validator(app: CLI) -> dict[str, Any]:
+    @app.command("command")
+    def command(count: Count.ann = Count, names: Names.ann = Names) -> None:
+        pass
+
+    @command.validator(mode="after")
+    def validate(obj: Any) -> Any:
+        obj.names = obj.names * obj.count
+        return obj
+
+    return KWDS
+
+
+# Measurements -------------------------------------------------------------------------
+
+
+def measure(case: Case, number: int = 2_000, repeat: int = 5) -> dict[str, float]:
+    """Measure costs of a case in microseconds (best of repeats)."""
+    decoration, first_call = [], []
+    for _ in range(max(number // 20, 1)):
+        app = CLI()
+        start = time.perf_counter()
+        kwds = case(app)
+        decoration.append(time.perf_counter() - start)
+        func = callback(app)
+        start = time.perf_counter()
+        func(**kwds)
+        first_call.append(time.perf_counter() - start)
+    timer = timeit.Timer(lambda: func(**kwds))
+    per_call = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {
+        "decoration": min(decoration) * 1e6,
+        "first_call": min(first_call) * 1e6,
+        "per_call": per_call * 1e6,
+    }
+
+
+def run(number: int = 2_000) -> dict[str, Any]:
+    """Run all cases and collect results with environment metadata."""
+    from importlib.metadata import version
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "cli": version("cli"),
+            "pydantic": version("pydantic"),
+            "typer": version("typer"),
+        },
+        "results": {name: measure(c, number) for name, c in CASES.items()},
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Print comparison with a baseline and return regressed results."""
+    regressions = []
+    print(f"{'case':<24}{'metric':<12}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for name, metrics in results["results"].items():
+        for metric, value in metrics.items():
+            base = baseline["results"].get(name, {}).get(metric)
+            if base is None:
+                continue
+            ratio = value / base
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = " !"
+                regressions.append(f"{name}.{metric}")
+            print(
+                f"{name:<24}{metric:<12}{base:>12.2f}{value:>12.2f}{ratio:>7.2f}x{flag}"
+            )
+    return regressions
+
+
+def report(results: dict[str, Any]) -> None:
+    print(f"{'case':<24}{'decoration':>12}{'first_call':>12}{'per_call':>12}")
+    for name, metrics in results["results"].items():
+        values = "".join(f"{v:>12.2f}" for v in metrics.values())
+        print(f"{name:<24}{values}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-o", "--output", help="save results as JSON")
+    parser.add_argument("-b", "--baseline", help="compare with saved results")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown (default: %(default)s)",
+    )
+    parser.add_argument("-n", "--number", type=int, default=2_000)
+    opts = parser.parse_args(argv)
+
+    results = run(opts.number)
+    if opts.output:
+        with open(opts.output, "w") as stream:  # noqa: PTH123
+            json.dump(results, stream, indent=2)
+    if not opts.baseline:
+        report(results)
+        return 0
+    with open(opts.baseline) as stream:  # noqa: PTH123
+        baseline = json.load(stream)
+    if regressions := compare(results, baseline, opts.tolerance):
+        print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Cost of parameter validators run by :mod:`click` and compiled into models.
+
+Builds two commands with hundreds of options having validators, once
+registered as :mod:`click` callbacks and once compiled into validation
+models with ``compiled=True``, and measures invocations of both
+through :class:`cli.testing.CliRunner` with all options passed.
+
+Run with ``python benchmarks/bench_validators.py``.
+"""
+
+# ruff: noqa: S101
+import sys
+import time
+from typing import Any
+
+from cli import CLI, Option
+from cli.testing import CliRunner
+
+N_OPTIONS = 500
+N_CALLS = 50
+
+
+def check(value: int) -> int:
+    if value < 0:
+        errmsg = "negative value"
+        raise ValueError(errmsg)
+    return value
+
+
+def build_options(n: int, *, compiled: bool) -> dict[str, Any]:
+    options = {}
+    for i in range(n):
+        option = Option(i, f"--option-{i}", ge=0)
+        option.validator(check, compiled=compiled)
+        options[f"option_{i}"] = option
+    return options
+
+
+def build_app(n: int, *, compiled: bool) -> CLI:
+    options = build_options(n, compiled=compiled)
+    params = ", ".join(f"{name}: int = __options[{name!r}]" for name in options)
+    namespace = {"__options": options}
+    source = f"def command({params}) -> int:\n    return option_0\n"
+    exec(source, namespace)  # noqa: S102
+    app = CLI(output="raw")
+    app.command("command")(namespace["command"])
+    app.command("noop")(lambda: None)
+    return app
+
+
+def main(n: int = N_OPTIONS, calls: int = N_CALLS) -> None:
+    runner = CliRunner()
+    args = ["command"]
+    for i in range(n):
+        args += [f"--option-{i}", str(i + 1)]
+    results = {}
+    for label, compiled in (("click callbacks", False), ("compiled", True)):
+        app = build_app(n, compiled=compiled)
+        assert runner.invoke(app, args).stdout == "1\n"
+        start = time.perf_counter()
+        for _ in range(calls):
+            runner.invoke(app, args)
+        results[label] = (time.perf_counter() - start) / calls
+    print(f"{n} options with validators, {calls} calls", file=sys.stderr)
+    for label, value in results.items():
+        print(f"{label:<20}{value * 1e3:>10.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Benchmarks import shared cases from sibling modules
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
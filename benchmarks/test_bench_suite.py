@@ -0,0 +1,37 @@
+# type: ignore
+"""Cases of ``bench_suite.py`` as ``pytest-benchmark`` benchmarks.
+
+Run with ``pytest benchmarks/test_bench_suite.py``, results are saved
+and compared using the ``--benchmark-autosave`` and
+``--benchmark-compare`` options of the plugin.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from bench_suite import CASES, callback
+
+from cli import CLI
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_decoration(benchmark, name: str) -> None:
+    benchmark(lambda: CASES[name](CLI()))
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_first_call(benchmark, name: str) -> None:
+    def setup():
+        app = CLI()
+        kwds = CASES[name](app)
+        return (), {"func": callback(app), "kwds": kwds}
+
+    benchmark.pedantic(lambda func, kwds: func(**kwds), setup=setup, rounds=50)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_per_call(benchmark, name: str) -> None:
+    app = CLI()
+    kwds = CASES[name](app)
+    benchmark(callback(app), **kwds)
@@ -1,9 +1,58 @@
-from .__about__ import __version__
-
-# from .commands import command_validator
-from .main import (
-    CLI,
-    Context,
-    Exit,
-)
-from .params import Argument, ArgumentInfo, Option, OptionInfo, ParameterInfo, Parse
+# Package exports are imported lazily on first access,
+# so 'import cli' does not pull in 'typer', 'click' or 'pydantic'
+# (nor 'typing', so that 'cli.fast_complete' answers completion requests quickly).
+from importlib import import_module
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .__about__ import __version__
+    from ._fastpath import fast_complete
+    from .files import MappedBytes, MappedFile
+    from .main import CLI, Context, Exit
+    from .params import (
+        Argument,
+        ArgumentInfo,
+        Option,
+        OptionInfo,
+        ParameterInfo,
+        Parse,
+        Stream,
+    )
+    from .resources import Resource
+
+_exports = {
+    "__version__": ".__about__",
+    "CLI": ".main",
+    "Context": ".main",
+    "Exit": ".main",
+    "fast_complete": "._fastpath",
+    "MappedFile": ".files",
+    "MappedBytes": ".files",
+    "Argument": ".params",
+    "ArgumentInfo": ".params",
+    "Option": ".params",
+    "OptionInfo": ".params",
+    "ParameterInfo": ".params",
+    "Parse": ".params",
+    "Stream": ".params",
+    "Resource": ".resources",
+}
+
+__all__ = tuple(_exports)
+
+
+def __getattr__(name: str) -> "Any":
+    try:
+        module = _exports[name]
+    except KeyError:
+        errmsg = f"module '{__name__}' has no attribute '{name}'"
+        raise AttributeError(errmsg) from None
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_exports})
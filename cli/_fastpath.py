@@ -0,0 +1,359 @@
+"""Shell completion from completion indexes using only builtin modules.
+
+Completion requests are answered on every key press, so everything needed
+to answer them from a fresh completion index (see :mod:`cli.index`)
+lives here and imports only modules built into the interpreter,
+i.e. not even :mod:`typing`, :mod:`pathlib`, :mod:`json` or :mod:`re`.
+Completion indexes are stored with :mod:`marshal` for the same reason.
+Public functions are exposed by :mod:`cli.completion` and :mod:`cli.index`.
+"""
+
+# Paths are handled with 'os' functions, since 'pathlib' is slow to import
+# ruff: noqa: PTH111, PTH116, PTH118, PTH119, PTH123
+import marshal
+import os
+import sys
+import zlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Any
+
+    _Item = tuple[str, str, str | None]
+    _State = tuple[dict[str, Any] | None, set[str], int, dict[str, Any] | None, bool]
+
+INDEX_FORMAT = 4
+# Default values of parameter metadata omitted from completion indexes
+COMPLETION_DEFAULTS: "dict[str, Any]" = {
+    "kind": "option",
+    "secondary_opts": [],
+    "help": None,
+    "nargs": 1,
+    "multiple": False,
+    "takes_value": True,
+    "hidden": False,
+    "choices": None,
+    "complete_type": "plain",
+    "dynamic": False,
+}
+
+_SHELLS = ("bash", "zsh", "fish", "powershell", "pwsh")
+_QUOTES = ("'", '"', "\\")
+
+
+def get_cache_dir() -> str:
+    """Get cache directory of :mod:`cli` (see :func:`cli.index.get_cache_dir`)."""
+    if path := os.environ.get("CLI_CACHE_DIR"):
+        return path
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(home, "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(home, "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache")
+    return os.path.join(base, "cli")
+
+
+def get_index_file(prog_name: str, kind: str = "index") -> str:
+    """Get path of an index file of a program.
+
+    Paths depend on the environment and the resolved path of the running
+    script too, so programs with the same name do not share indexes.
+
+    Parameters
+    ----------
+    prog_name
+        Program name.
+    kind
+        ``"index"``, ``"help"`` (help pages) or ``"complete"`` (completion index).
+    """
+    script = os.path.realpath(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    key = f"{prog_name}\0{sys.prefix}\0{script}".encode()
+    # Checksums are enough to tell programs apart and 'hashlib' is slow to import
+    digest = f"{zlib.crc32(key):08x}{zlib.adler32(key):08x}"
+    extension = "marshal" if kind == "complete" else "json"
+    return os.path.join(get_cache_dir(), f"{kind}-{digest}.{extension}")
+
+
+def is_fresh(index: "dict[str, Any]", prog_name: str) -> bool:
+    """Check that the index is of the program and its sources are unchanged."""
+    if index.get("format") != INDEX_FORMAT or index.get("prog_name") != prog_name:
+        return False
+    try:
+        return all(
+            os.stat(source).st_mtime_ns == mtime
+            for source, mtime in index["sources"].items()
+        )
+    except OSError:
+        return False
+
+
+def load_completion_index(prog_name: str) -> "dict[str, Any] | None":
+    """Load completion index of a program.
+
+    Returns ``None`` when the index does not exist or is stale.
+    """
+    try:
+        with open(get_index_file(prog_name, "complete"), "rb") as file:
+            data = file.read()
+        # Loading from bytes is much faster than 'marshal.load' reading
+        # the file piecewise. Cache directories must not be writable
+        # by untrusted users.
+        index = marshal.loads(data)  # noqa: S302
+    except (OSError, EOFError, ValueError, TypeError):
+        # Missing or written by another version of Python
+        return None
+    return index if isinstance(index, dict) and is_fresh(index, prog_name) else None
+
+
+def get_complete_var(prog_name: str) -> str:
+    """Get name of the environment variable with completion instructions."""
+    name = prog_name.replace("-", "_").replace(".", "_")
+    return f"_{name}_COMPLETE".upper()
+
+
+def get_shell(complete_var: str) -> str | None:
+    """Get shell requesting completion or ``None`` for other requests."""
+    # Typer uses instructions like 'complete_bash'
+    action, _, shell = os.environ.get(complete_var, "").partition("_")
+    return shell if action == "complete" and shell in _SHELLS else None
+
+
+def fast_complete() -> None:
+    """Answer completion request of the running program from a fresh index.
+
+    Exits when the request is served. Does nothing when the program
+    is not completing or a fresh index of the program does not exist.
+    """
+    if not sys.argv or not sys.argv[0]:
+        return
+    prog_name = os.path.basename(sys.argv[0])
+    shell = get_shell(get_complete_var(prog_name))
+    if shell is None:
+        return
+    index = load_completion_index(prog_name)
+    if index is not None:
+        complete(index, shell)
+
+
+def complete(index: "dict[str, Any]", shell: str) -> None:
+    """Answer completion request of a shell from a completion index.
+
+    Exits when the request is served and returns when it must be handled
+    by the :mod:`click` completion.
+    """
+    args, incomplete = _get_completion_args(shell)
+    items = get_completions(index["root"], args, incomplete)
+    if items is None:
+        return
+    output, exit_code = _format_completions(shell, items)
+    if output is not None:
+        sys.stdout.write(f"{output}\n")
+        sys.stdout.flush()
+    sys.exit(exit_code)
+
+
+def get_completions(
+    root: "dict[str, Any]", args: "Sequence[str]", incomplete: str
+) -> "list[_Item] | None":
+    """Get completions as ``(value, type, help)`` tuples.
+
+    See :func:`cli.completion.get_completions`.
+    """
+    state = _walk(root, args)
+    if state is None:
+        return None
+    node, used, n_args, pending, only_args = state
+    if node is None:
+        return []
+    if pending is not None:
+        return _complete_value(pending, incomplete)
+    if not only_args and incomplete.startswith("-") and "=" in incomplete:
+        name, _, incomplete = incomplete.partition("=")
+        param = _find_option(node, name)
+        return None if param is None else _complete_value(param, incomplete)
+    if "commands" not in node and not (
+        incomplete and not incomplete[0].isalnum() and not only_args
+    ):
+        argument = _next_argument(node, n_args)
+        if argument is not None:
+            return _complete_value(argument, incomplete)
+    return _complete_command(node, used, incomplete)
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _get(param: "dict[str, Any]", key: str) -> "Any":
+    # Completion indexes omit default values of parameter metadata
+    return param.get(key, COMPLETION_DEFAULTS[key])
+
+
+def _walk(root: "dict[str, Any]", args: "Sequence[str]") -> "_State | None":
+    # Follow complete arguments through the command tree. The final node
+    # is 'None' for unknown commands and the whole state is 'None'
+    # when the command line cannot be followed statically.
+    node, used, n_args = root, set(), 0
+    pending: dict[str, Any] | None = None
+    only_args = False
+    for arg in args:
+        if pending is not None:
+            pending = None
+        elif not only_args and arg == "--":
+            only_args = True
+        elif not only_args and arg.startswith("-") and arg != "-":
+            name, eq, _ = arg.partition("=")
+            param = _find_option(node, name)
+            if param is None or (
+                _get(param, "takes_value") and _get(param, "nargs") != 1
+            ):
+                return None
+            used.add(param["name"])
+            if _get(param, "takes_value") and not eq:
+                pending = param
+        elif "commands" in node:
+            if _arguments(node):
+                return None
+            if arg not in node["commands"]:
+                return None, used, n_args, None, only_args
+            node, used, n_args, only_args = node["commands"][arg], set(), 0, False
+        else:
+            n_args += 1
+    return node, used, n_args, pending, only_args
+
+
+def _find_option(node: "dict[str, Any]", name: str) -> "dict[str, Any] | None":
+    for param in node["params"]:
+        if _get(param, "kind") == "option" and (
+            name in param["opts"] or name in _get(param, "secondary_opts")
+        ):
+            return param
+    return None
+
+
+def _arguments(node: "dict[str, Any]") -> "list[dict[str, Any]]":
+    return [p for p in node["params"] if _get(p, "kind") == "argument"]
+
+
+def _next_argument(node: "dict[str, Any]", n_args: int) -> "dict[str, Any] | None":
+    consumed = 0
+    for param in _arguments(node):
+        nargs = _get(param, "nargs")
+        if nargs < 0:
+            return param
+        consumed += nargs
+        if n_args < consumed:
+            return param
+    return None
+
+
+def _complete_value(param: "dict[str, Any]", incomplete: str) -> "list[_Item] | None":
+    if _get(param, "dynamic"):
+        return None
+    if (complete_type := _get(param, "complete_type")) != "plain":
+        return [(incomplete, complete_type, None)]
+    choices = _get(param, "choices") or []
+    return [(c, "plain", None) for c in choices if c.startswith(incomplete)]
+
+
+def _complete_command(
+    node: "dict[str, Any]", used: set[str], incomplete: str
+) -> "list[_Item]":
+    items = [
+        (name, "plain", child["help"])
+        for name, child in node.get("commands", {}).items()
+        if not child["hidden"] and name.startswith(incomplete)
+    ]
+    if incomplete and not incomplete[0].isalnum():
+        for param in node["params"]:
+            if (
+                _get(param, "kind") != "option"
+                or _get(param, "hidden")
+                or (param["name"] in used and not _get(param, "multiple"))
+            ):
+                continue
+            items.extend(
+                (name, "plain", _get(param, "help"))
+                for name in (*param["opts"], *_get(param, "secondary_opts"))
+                if name.startswith(incomplete)
+            )
+    return items
+
+
+# Arguments and output formats follow completion classes of 'typer'
+
+
+def _split_arg_string(string: str) -> list[str]:
+    # Same as 'click.parser.split_arg_string', but 'shlex' (and 're')
+    # are imported only for strings which are not split on whitespace
+    if not any(q in string for q in _QUOTES):
+        return string.split()
+    import shlex
+
+    lex = shlex.shlex(string, posix=True)
+    lex.whitespace_split = True
+    lex.commenters = ""
+    out = []
+    try:
+        out.extend(lex)
+    except ValueError:
+        # Incomplete quoted argument
+        out.append(lex.token)
+    return out
+
+
+def _get_completion_args(shell: str) -> tuple[list[str], str]:
+    if shell == "bash":
+        cwords = _split_arg_string(os.environ["COMP_WORDS"])
+        cword = int(os.environ["COMP_CWORD"])
+        incomplete = cwords[cword] if cword < len(cwords) else ""
+        return cwords[1:cword], incomplete
+    completion_args = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+    args = _split_arg_string(completion_args)[1:]
+    if shell in ("powershell", "pwsh"):
+        return args, os.environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+    if args and not completion_args.endswith(" "):
+        return args[:-1], args[-1]
+    return args, ""
+
+
+def _format_completions(shell: str, items: "list[_Item]") -> tuple[str | None, int]:
+    if shell == "bash":
+        return "\n".join(value for value, _, _ in items), 0
+    if shell == "zsh":
+        if not items:
+            return "_files", 0
+        lines = "\n".join(map(_format_zsh, items))
+        return f"_arguments '*: :(({lines}))'", 0
+    if shell == "fish":
+        action = os.environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if action == "is-args":
+            return None, 0 if items else 1
+        lines = [_format_fish(item) for item in items]
+        return ("\n".join(lines) if action == "get-args" and lines else ""), 0
+    return "\n".join(f"{value}:::{help or ' '}" for value, _, help in items), 0
+
+
+def _format_zsh(item: "_Item") -> str:
+    def escape(s: str) -> str:
+        return (
+            s.replace('"', '""')
+            .replace("'", "''")
+            .replace("$", "\\$")
+            .replace("`", "\\`")
+        )
+
+    value, _, help = item
+    if help:
+        return f'"{escape(value)}":"{escape(help)}"'
+    return f'"{escape(value)}"'
+
+
+def _format_fish(item: "_Item") -> str:
+    value, _, help = item
+    if help:
+        formatted_help = "".join(" " if c.isspace() else c for c in help)
+        return f"{value}\t{formatted_help}"
+    return value
@@ -0,0 +1,217 @@
+"""Expansion of argument lists and parsing of long command lines.
+
+Applications created with ``args_from=True`` read arguments from
+response files given as ``@path`` and from files (or standard input)
+given with the ``--args-from PATH`` option of the root command::
+
+    prog command @numbers.txt
+    seq 1000000 | sed 's/^/-n /' | prog command --args-from -
+
+Files are read line by line and lines are split into arguments
+like in shells when they contain quotes or backslashes and on whitespace
+otherwise. Arguments read from files are not expanded again and arguments
+after ``--`` are not expanded at all. Arguments starting with ``@@``
+are passed with the first ``@`` removed.
+
+Commands and groups of :class:`cli.CLI` applications with ``args_from=True``
+are created with :class:`Command` and :class:`Group` classes parsing command
+lines in linear time (:mod:`click` parser takes quadratic time in the number
+of arguments and matching short options is particularly costly),
+so a single process can handle millions of arguments. Other applications
+and commands use them only when they are passed as ``cls``.
+"""
+
+import shlex
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+import click
+from click.parser import OptionParser, ParsingState
+from typer.core import TyperCommand, TyperGroup
+
+__all__ = (
+    "ArgQueue",
+    "Parser",
+    "ParserMixin",
+    "Command",
+    "Group",
+    "args_from_option",
+    "enable_args_from",
+    "expand_args",
+)
+
+_QUOTES = ("'", '"', "\\")
+
+
+def expand_args(args: Iterable[str], stdin: IO[str] | None = None) -> list[str]:
+    """Expand response files and ``--args-from`` options in arguments.
+
+    Parameters
+    ----------
+    args
+        Command-line arguments.
+    stdin
+        Stream read for ``--args-from -``. Defaults to the standard input.
+
+    Raises
+    ------
+    click.FileError
+        When a file cannot be read.
+    """
+    expanded: list[str] = []
+    args = iter(args)
+    for arg in args:
+        if arg == "--":
+            expanded.append(arg)
+            expanded.extend(args)
+            break
+        if arg.startswith("@@"):
+            expanded.append(arg[1:])
+        elif arg.startswith("@") and len(arg) > 1:
+            expanded.extend(_read_args(arg[1:], stdin))
+        elif arg == "--args-from":
+            path = next(args, None)
+            if path is None:
+                expanded.append(arg)
+            else:
+                expanded.extend(_read_args(path, stdin))
+        elif arg.startswith("--args-from="):
+            expanded.extend(_read_args(arg.partition("=")[2], stdin))
+        else:
+            expanded.append(arg)
+    return expanded
+
+
+def args_from_option() -> click.Option:
+    """Create ``--args-from`` option.
+
+    Arguments are expanded before parsing, so the option only
+    documents the feature in help pages.
+    """
+    return click.Option(
+        ["--args-from"],
+        metavar="FILE",
+        expose_value=False,
+        help="Read more arguments from FILE (or stdin with '-'). "
+        "Arguments '@FILE' are expanded too.",
+    )
+
+
+def enable_args_from(command: click.Command) -> None:
+    """Expand arguments of root command and add ``--args-from`` option to it.
+
+    Raises
+    ------
+    TypeError
+        When the command does not use :class:`ParserMixin`.
+    """
+    if not isinstance(command, ParserMixin):
+        errmsg = f"'{type(command).__name__}' does not support expanding arguments"
+        raise TypeError(errmsg)
+    command.params.append(args_from_option())
+    command.args_from = True
+
+
+class ArgQueue(deque):
+    """Queue of arguments supporting list operations used by :mod:`click` parser.
+
+    Arguments are consumed from the front of the queue in constant time.
+    """
+
+    def pop(self, index: int = -1) -> Any:  # type: ignore
+        if index == 0:
+            return self.popleft()
+        if index == -1:
+            return super().pop()
+        items = list(self)
+        item = items.pop(index)
+        self._replace(items)
+        return item
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return list(self)[index]
+        return super().__getitem__(index)
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice) and index.start in (None, 0) and index.step is None:
+            for _ in range(min(len(self), index.stop or 0)):
+                self.popleft()
+        elif isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self._replace(items)
+        else:
+            super().__delitem__(index)
+
+    def __radd__(self, other: Any) -> list[Any]:
+        return [*other, *self]
+
+    def _replace(self, items: list[Any]) -> None:
+        self.clear()
+        self.extend(items)
+
+
+class Parser(OptionParser):
+    """Option parser consuming arguments in linear time."""
+
+    def parse_args(self, args: list[str]) -> Any:
+        return super().parse_args(ArgQueue(args))  # type: ignore
+
+    def _process_opts(self, arg: str, state: ParsingState) -> None:
+        # Short options are matched directly and not after failed matching
+        # of long options, which costs a lot because of suggestions of similar names
+        if arg in self._short_opt and arg not in self._long_opt:
+            self._match_short_opt(arg, state)
+        else:
+            super()._process_opts(arg, state)
+
+
+class ParserMixin(click.Command):
+    """Command parsing arguments with :class:`Parser`.
+
+    Arguments of root commands with ``args_from`` set are expanded
+    with :func:`expand_args` before parsing.
+    """
+
+    args_from: bool = False
+
+    def make_parser(self, ctx: click.Context) -> OptionParser:
+        parser = Parser(ctx)
+        for param in self.get_params(ctx):
+            param.add_to_parser(parser, ctx)
+        return parser
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if self.args_from and ctx.parent is None and not ctx.resilient_parsing:
+            args = expand_args(args)
+        return super().parse_args(ctx, args)
+
+
+class Command(ParserMixin, TyperCommand):
+    """Default class of commands of :class:`cli.CLI` applications with ``args_from``."""
+
+
+class Group(ParserMixin, TyperGroup):
+    """Default class of groups of :class:`cli.CLI` applications with ``args_from``."""
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _read_args(path: str, stdin: IO[str] | None) -> Iterator[str]:
+    try:
+        stream = (stdin or sys.stdin) if path == "-" else open(path)  # noqa: PTH123, SIM115
+    except OSError as exc:
+        raise click.FileError(path, exc.strerror) from exc
+    try:
+        for line in stream:
+            if any(q in line for q in _QUOTES):
+                yield from shlex.split(line)
+            else:
+                yield from line.split()
+    finally:
+        if path != "-":
+            stream.close()
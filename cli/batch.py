@@ -0,0 +1,263 @@
+"""Batch mode running many command lines against one loaded application.
+
+Command lines may be run sequentially or fanned out to a pool
+of threads or processes. Results are always produced in the order
+of command lines. Workers build the :mod:`click` command and validation
+models once at start and reuse them for all their tasks.
+"""
+
+import multiprocessing
+import shlex
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+import click
+
+from .lazy import import_object
+from .runner import Result, invoke
+
+if TYPE_CHECKING:
+    from .main import CLI
+
+__all__ = ("run_batch", "batch_options", "parse_line")
+
+ExecutorType = Literal["thread", "process"]
+
+
+def run_batch(
+    app: "CLI | str",
+    lines: Iterable[str | Sequence[str]],
+    *,
+    jobs: int = 1,
+    executor: ExecutorType = "thread",
+    command: click.Command | None = None,
+    prog_name: str | None = None,
+) -> Iterator[Result]:
+    """Run many command lines in the current process or a pool of workers.
+
+    The :mod:`click` command and validation models are built once
+    (per worker) and reused for all lines. Each line gets a fresh
+    context object. Uncaught exceptions, including validation errors,
+    are reported as failures of individual lines.
+
+    Parameters
+    ----------
+    app
+        Application to run or its import path in the
+        ``'package.module:attribute'`` format.
+    lines
+        Command lines given as strings (split with :func:`shlex.split`)
+        or sequences of arguments. Blank lines and comments are skipped.
+    jobs
+        Number of parallel workers.
+    executor
+        Type of workers. Process workers inherit the application from
+        the current process when the ``'fork'`` start method is available
+        and no other threads are running. Otherwise they are started with
+        ``'forkserver'`` (or ``'spawn'``) and import the application
+        at start, which requires an import path.
+        Exceptions are not sent back from process workers, so only
+        :attr:`cli.runner.Result.error` is available in their results.
+    command
+        :mod:`click` command of the application used when running
+        in the current thread. Built with :meth:`cli.CLI.get_command` when ``None``.
+    prog_name
+        Program name used in usage messages.
+
+    Yields
+    ------
+    result
+        Results of invocations in the order of lines.
+    """
+    if jobs < 1:
+        errmsg = "'jobs' must be a positive integer"
+        raise ValueError(errmsg)
+    tasks = filter(None, map(parse_line, lines))
+    if jobs == 1:
+        worker = _Worker(app, prog_name, command)
+        yield from map(worker.run, tasks)
+        return
+    with _get_executor(app, prog_name, jobs, executor) as pool:
+        yield from _ordered_map(pool, _run_task, tasks, window=jobs * 4)
+
+
+def parse_line(line: str | Sequence[str]) -> list[str] | None:
+    """Parse batch line into arguments.
+
+    Returns ``None`` for blank lines and comments.
+    """
+    if not isinstance(line, str):
+        return list(line)
+    args = shlex.split(line, comments=True)
+    return args or None
+
+
+def batch_options(app: "CLI") -> list[click.Option]:
+    """Create batch options of the root command of the application.
+
+    ``--batch`` runs command lines from a file (or standard input with ``-``)
+    and exits with the highest exit code of all lines. ``--jobs``
+    and ``--executor`` control parallel execution.
+    """
+
+    def store(ctx: click.Context, param: click.Parameter, value: Any) -> None:
+        ctx.meta[f"cli.batch.{param.name}"] = value
+
+    def callback(ctx: click.Context, _: click.Parameter, value: IO[str]) -> None:
+        if value is None or ctx.resilient_parsing:
+            return
+        exit_code = 0
+        results = run_batch(
+            app,
+            value,
+            jobs=ctx.meta.get("cli.batch.jobs", 1),
+            executor=ctx.meta.get("cli.batch.executor", "thread"),
+            command=ctx.command,
+            prog_name=ctx.info_name,
+        )
+        for lineno, result in enumerate(results, start=1):
+            _write_result(result)
+            if result.exit_code:
+                click.echo(
+                    f"Batch command {lineno} failed with exit code {result.exit_code}",
+                    err=True,
+                )
+            exit_code = max(exit_code, result.exit_code)
+        ctx.exit(exit_code)
+
+    return [
+        _BatchOption(
+            ["--batch"],
+            type=click.File("r"),
+            is_eager=True,
+            expose_value=False,
+            callback=callback,
+            help="Run command lines from FILE (or standard input with '-').",
+        ),
+        click.Option(
+            ["--jobs"],
+            type=click.IntRange(min=1),
+            default=1,
+            is_eager=True,
+            expose_value=False,
+            callback=store,
+            help="Number of parallel workers in batch mode.",
+        ),
+        click.Option(
+            ["--executor"],
+            type=click.Choice(["thread", "process"]),
+            default="thread",
+            is_eager=True,
+            expose_value=False,
+            callback=store,
+            help="Type of parallel workers in batch mode.",
+        ),
+    ]
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+class _BatchOption(click.Option):
+    """Batch option processing ``--jobs`` and ``--executor`` options first.
+
+    The option is eager, so that command lines are run before other
+    options are processed, but it needs values of parallel execution
+    options regardless of their positions on the command line.
+    """
+
+    def handle_parse_result(
+        self, ctx: click.Context, opts: Mapping[str, Any], args: list[str]
+    ) -> tuple[Any, list[str]]:
+        for param in ctx.command.get_params(ctx):
+            if param.name in ("jobs", "executor"):
+                param.handle_parse_result(ctx, opts, args)
+        return super().handle_parse_result(ctx, opts, args)
+
+
+class _Worker:
+    """Runner of batch tasks with the command built once."""
+
+    def __init__(
+        self,
+        app: "CLI | str",
+        prog_name: str | None = None,
+        command: click.Command | None = None,
+    ) -> None:
+        self.app = import_object(app) if isinstance(app, str) else app
+        self.command = self.app.get_command() if command is None else command
+        self.prog_name = prog_name
+        self.app.prebuild_models()
+
+    def run(self, args: list[str]) -> Result:
+        obj = self.app.context_obj()
+        return invoke(self.command, args, prog_name=self.prog_name, obj=obj)
+
+
+_local = threading.local()
+
+
+def _init_worker(app: "CLI | str", prog_name: str | None) -> None:
+    # Commands built by 'typer' are not reentrant, so every thread
+    # (or process) gets its own command (cached per thread by the application)
+    _local.worker = _Worker(app, prog_name)
+
+
+def _run_task(args: list[str]) -> Result:
+    result = _local.worker.run(args)
+    if multiprocessing.parent_process() is not None:
+        result = replace(result, exception=None)
+    return result
+
+
+def _get_executor(
+    app: "CLI | str", prog_name: str | None, jobs: int, executor: ExecutorType
+) -> Executor:
+    initargs = (app, prog_name)
+    if executor == "thread":
+        return ThreadPoolExecutor(jobs, initializer=_init_worker, initargs=initargs)
+    if executor == "process":
+        methods = multiprocessing.get_all_start_methods()
+        # Forking while other threads run (e.g. the event loop of async
+        # commands) may deadlock children on locks held by those threads
+        if "fork" in methods and threading.active_count() == 1:
+            mp_context = multiprocessing.get_context("fork")
+        elif isinstance(app, str):
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            mp_context = multiprocessing.get_context(method)
+        else:
+            errmsg = (
+                "process workers require an import path of the application "
+                "when other threads are running or 'fork' is not available"
+            )
+            raise ValueError(errmsg)
+        return ProcessPoolExecutor(
+            jobs, mp_context=mp_context, initializer=_init_worker, initargs=initargs
+        )
+    errmsg = f"unknown executor '{executor}'"
+    raise ValueError(errmsg)
+
+
+def _ordered_map(
+    pool: Executor, func: Callable[[Any], Result], tasks: Iterable[Any], window: int
+) -> Iterator[Result]:
+    futures: deque = deque()
+    for task in tasks:
+        futures.append(pool.submit(func, task))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def _write_result(result: Result) -> None:
+    for data, stream in ((result.stdout, sys.stdout), (result.stderr, sys.stderr)):
+        if data:
+            stream.flush()
+            stream.buffer.write(data)
+            stream.buffer.flush()
@@ -0,0 +1,244 @@
+"""Disk-backed memoization of results of deterministic commands.
+
+Commands registered with ``cache=True`` (or a :class:`ResultCache`)
+store their return values together with their captured standard output
+and error on disk. Calls with the same arguments replay the output
+and return the stored value without running the command.
+
+Cache keys are hashes of the import path of the command and its
+arguments serialized with :mod:`pydantic` after validation, so they
+are normalized, e.g. after :class:`cli.Parse` coercions. Parameters
+consumed or changing while commands run (iterators such as :class:`cli.Stream`,
+files and memory maps) cannot be used as keys, so commands with such parameters
+cannot be cached. Paths are keyed by names, not contents. Entries expire
+after ``ttl`` seconds and least recently used entries are evicted when
+the cache grows above ``max_size`` bytes. Failed calls are not cached.
+
+Applications with cached commands get ``--no-cache`` and ``--refresh-cache``
+options, which bypass the cache and recompute (and store) results respectively.
+
+Output of cached commands is captured while they run, so it is written
+only after they finish. Iterators returned by cached commands are turned
+into lists. Values which cannot be pickled are not cached. Entries are
+stored with :mod:`pickle`, so cache directories must not be writable
+by untrusted users.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+import click
+
+from .index import get_cache_dir, write_atomic
+from .runner import capture
+
+__all__ = (
+    "ResultCache",
+    "Entry",
+    "CacheMode",
+    "cache_options",
+    "get_mode",
+    "make_key",
+)
+
+CacheMode = Literal["use", "refresh", "off"]
+
+
+class Entry(NamedTuple):
+    """Cached result of a command call.
+
+    Attributes
+    ----------
+    value
+        Return value.
+    stdout, stderr
+        Captured output.
+    created
+        Creation time as a POSIX timestamp.
+    """
+
+    value: Any
+    stdout: bytes = b""
+    stderr: bytes = b""
+    created: float = 0.0
+
+    def replay(self) -> None:
+        """Write captured output to the standard streams."""
+        for name, data in (("stdout", self.stdout), ("stderr", self.stderr)):
+            if data:
+                getattr(sys, name).flush()
+                stream = click.get_binary_stream(name)  # type: ignore
+                stream.write(data)
+                stream.flush()
+
+
+@dataclass
+class ResultCache:
+    """Disk-backed cache of results of commands.
+
+    Attributes
+    ----------
+    ttl
+        Time to live of entries in seconds (no expiration when ``None``).
+    max_size
+        Maximum total size of entries in bytes.
+    directory
+        Cache directory. Defaults to ``results`` subdirectory
+        of :func:`cli.index.get_cache_dir`.
+    """
+
+    ttl: float | None = None
+    max_size: int = 256 * 2**20
+    directory: str | Path | None = None
+
+    @property
+    def path(self) -> Path:
+        """Path of the cache directory."""
+        if self.directory is None:
+            return get_cache_dir() / "results"
+        return Path(self.directory)
+
+    def get(self, key: str) -> Entry | None:
+        """Get entry or ``None`` when it is missing or expired."""
+        path = self.path / f"{key}.pkl"
+        try:
+            with path.open("rb") as stream:
+                entry = Entry(*pickle.load(stream))  # noqa: S301
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupted or written by incompatible versions
+            path.unlink(missing_ok=True)
+            return None
+        if self.ttl is not None and time.time() - entry.created > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        # Modification times track recent use for eviction
+        with suppress(OSError):
+            os.utime(path)
+        return entry
+
+    def set(self, key: str, entry: Entry) -> bool:
+        """Store entry and evict old ones.
+
+        Returns ``False`` when the entry cannot be pickled.
+        """
+        try:
+            data = pickle.dumps(tuple(entry), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        path = self.path / f"{key}.pkl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Remove expired entries and least recently used ones above the size limit."""
+        now = time.time()
+        entries = []
+        for path in self.path.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if self.ttl is not None and now - stat.st_mtime > self.ttl:
+                # Not used within the time to live, so expired for sure
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path in self.path.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+    def call(self, key: str, func: Callable[..., Any], /, **kwds: Any) -> Any:
+        """Call function or replay its cached result.
+
+        The result is recomputed (and stored) in the ``refresh`` mode
+        and not cached at all in the ``off`` mode (see :func:`get_mode`).
+        """
+        mode = get_mode()
+        if mode == "off":
+            return func(**kwds)
+        if mode == "use" and (entry := self.get(key)) is not None:
+            entry.replay()
+            return entry.value
+        created = time.time()
+        try:
+            with capture(stdin=None) as (stdout, stderr):
+                value = func(**kwds)
+                if isinstance(value, Iterator):
+                    value = list(value)
+        finally:
+            entry = Entry(None, stdout.getvalue(), stderr.getvalue(), created)
+            entry.replay()
+        self.set(key, entry._replace(value=value))
+        return value
+
+
+def make_key(name: str, arguments: dict[str, Any]) -> str:
+    """Make cache key of a command call.
+
+    Arguments are serialized with :mod:`pydantic`,
+    so validated values give stable keys.
+    :class:`click.Context` arguments are skipped.
+    """
+    from pydantic_core import to_json
+
+    data = {k: v for k, v in arguments.items() if not isinstance(v, click.Context)}
+    digest = hashlib.sha256(name.encode())
+    digest.update(b"\0")
+    digest.update(to_json(data, serialize_unknown=True))
+    return digest.hexdigest()
+
+
+def get_mode() -> CacheMode:
+    """Get cache mode of the current invocation."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return "use"
+    return ctx.find_root().meta.get("cli.cache", "use")
+
+
+def cache_options() -> list[click.Option]:
+    """Create ``--no-cache`` and ``--refresh-cache`` options."""
+
+    def callback(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+        if value:
+            mode = "off" if param.name == "no_cache" else "refresh"
+            ctx.find_root().meta["cli.cache"] = mode
+
+    return [
+        click.Option(
+            ["--no-cache"],
+            is_flag=True,
+            is_eager=True,
+            expose_value=False,
+            callback=callback,
+            help="Run cached commands without reading or storing results.",
+        ),
+        click.Option(
+            ["--refresh-cache"],
+            is_flag=True,
+            is_eager=True,
+            expose_value=False,
+            callback=callback,
+            help="Recompute and store results of cached commands.",
+        ),
+    ]
@@ -1,25 +1,51 @@
 # ruff: noqa: UP007
 # pyright: reportArgumentType=false
 # mypy: disable-error-code="assignment"
+import io
+import linecache
+import mmap
 import typing
-from collections.abc import Callable
-from functools import wraps
-from inspect import Parameter, signature
+from collections.abc import Callable, Iterator
+from functools import update_wrapper, wraps
+from inspect import Parameter, isawaitable, iscoroutinefunction, signature
 from types import UnionType
 from typing import (  # type: ignore
+    IO,
+    TYPE_CHECKING,
+    Annotated,
     Any,
     Union,
     _UnionGenericAlias,  # type: ignore
+    get_args,
+    get_origin,
 )
+from weakref import WeakKeyDictionary, ref
 
-from pydantic import BaseModel, ConfigDict, Field, create_model, model_validator
-from pydantic.alias_generators import to_pascal
-from pydantic.fields import FieldInfo
 from typer.models import CommandFunctionType
 from typing_extensions import _AnnotatedAlias
 
-from .decorators import debuggable, validated_with  # type: ignore
+from . import profiling, timings
+from .decorators import debuggable, post_mortem, validated_with  # type: ignore
 from .params import Parse, _TypeHint
+from .resources import ResourceInfo
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from pydantic.fields import FieldInfo
+
+    from .cache import ResultCache
+    from .resources import Resources
+
+_MISSING = object()
+_FLAT_KINDS = (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+# Types of values converted by 'click' that 'pydantic' would not change
+_PLAIN_TYPES = (str, int, float, bool)
+# Field arguments which do not affect validation
+_INFO_FIELD_KWARGS = ("description", "title", "examples")
+# Number of keyword arguments above which invokers pass them as dictionaries
+_MAX_KEYWORDS = 255
+# Values consumed or changing while commands run, so they cannot be cache keys
+_UNCACHEABLE_TYPES = (Iterator, IO, io.IOBase, mmap.mmap, memoryview)
 
 
 class CommandDescriptor:
@@ -30,6 +56,8 @@ class CommandDescriptor:
         *,
         validate: bool = True,
         allow_pdb: bool = True,
+        cache: "bool | ResultCache" = False,
+        resources: "Resources | None" = None,
     ) -> None:
         self.func = func
         self.command_decorator = command_decorator
@@ -37,57 +65,483 @@ class CommandDescriptor:
         self.owner: type | None = None
         self.validate = validate
         self.allow_pdb = allow_pdb
+        self.cache: ResultCache | None = None
+        if cache is True:
+            from . import cache as caching
+
+            self.cache = caching.ResultCache()
+        elif cache:
+            self.cache = cache
+        self.resources = resources
+        func_params = signature(_unwrap_method(func)).parameters.values()
+        # Names of resources by names of parameters receiving them
+        self._resource_params = {
+            p.name: p.default.name or p.name
+            for p in func_params
+            if isinstance(p.default, ResourceInfo)
+        }
+        if not validate and any(_get_validator(p) for p in func_params):
+            errmsg = "compiled parameter validators require 'validate=True'"
+            raise TypeError(errmsg)
         self.__validators__: dict[str, Callable[..., Any]] | None = None
+        self._async_validator: tuple[str, Callable[..., Any]] | None = None
+        self._model: type[BaseModel] | None = None
+        self._slim_model: type[BaseModel] | None = None
+        self.is_async = iscoroutinefunction(_unwrap_method(func))
+        # Wrappers of class methods bound to (possibly derived) classes
+        self._bound: WeakKeyDictionary[type, Callable[..., Any]] = WeakKeyDictionary()
+        self._wrapper: Callable[..., Any] | None = None
 
         if not isinstance(self.func, classmethod):
-            func = self._decorate(self.func)
-            func = typing.cast(CommandFunctionType, func)
-            self.command_decorator(func)
+            self._wrapper = self._decorate(self.func)
+            self.command_decorator(self._wrapper.__click_callback__)  # type: ignore
 
     def __get__(self, obj: object, cls: type | None = None) -> Callable[..., Any]:
-        func = self.func
-        if isinstance(func, classmethod):
-            if cls is None:
-                cls = type(obj)
+        if self._wrapper is not None:
+            return self._wrapper
+        if cls is None:
+            cls = type(obj)
+        try:
+            return self._bound[cls]
+        except KeyError:
             func = self.func.__get__(None, cls)
-        return self._decorate(func)
+            wrapper = self._bound[cls] = self._decorate(func, ref(cls))
+            return wrapper
 
     def __set_name__(self, owner: type, name: str) -> None:
         self.name = name
         self.owner = owner
         if isinstance(self.func, classmethod):
             callback = getattr(owner, name)
-            self.command_decorator(callback)
+            self.command_decorator(callback.__click_callback__)
 
     def validator(
         self, **kwargs: Any
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            from pydantic import model_validator
+
             if not self.validate:
                 errmsg = "cannot set validator on command with 'validate=False'"
                 raise TypeError(errmsg)
-            self.__validators__ = {
-                "__command_validator__": model_validator(**kwargs)(func)
-            }
+            if iscoroutinefunction(_unwrap_method(func)):
+                mode = kwargs.get("mode")
+                if mode not in ("before", "after"):
+                    errmsg = (
+                        "async command validators must use 'before' or 'after' mode"
+                    )
+                    raise TypeError(errmsg)
+                params = signature(_unwrap_method(self.func)).parameters.values()
+                if any(p.kind not in _FLAT_KINDS for p in params):
+                    errmsg = (
+                        "async command validators require commands "
+                        "without variadic parameters"
+                    )
+                    raise TypeError(errmsg)
+                self.__validators__ = None
+                self._async_validator = (mode, func)
+            else:
+                self.__validators__ = {
+                    "__command_validator__": model_validator(**kwargs)(func)
+                }
+                self._async_validator = None
+            self._model = None
             return func
 
         return decorator
 
-    def _decorate(self, func: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(func)
+    @property
+    def model(self) -> "type[BaseModel]":
+        """Validation model of the command.
+
+        The model is built on first access and cached until
+        the command validator is changed.
+        """
+        if self._model is None:
+            self._model = self._create_model()
+        return self._model
+
+    @property
+    def validated_fields(self) -> list[str]:
+        """Names of parameters which need validation without a command validator.
+
+        Parameters annotated with plain types (possibly optional)
+        already converted by :mod:`click` and without field constraints
+        are passed to the command as they are.
+        """
+        func = typing.cast(Callable, _unwrap_method(self.func))
+        return [
+            name
+            for name, param in signature(func).parameters.items()
+            if name in self.func.__annotations__
+            and name not in self._resource_params
+            and _needs_validation(param)
+        ]
+
+    @property
+    def slim_model(self) -> "type[BaseModel] | None":
+        """Validation model of :attr:`validated_fields`.
+
+        It is used instead of :attr:`model` when there is no command
+        validator and is ``None`` when no parameter needs validation.
+        """
+        if self._slim_model is None:
+            fields = self.validated_fields
+            if not fields:
+                return None
+            self._slim_model = self._create_model(fields, slim=True)
+        return self._slim_model
+
+    def _decorate(
+        self, func: Callable[..., Any], owner: "ref[type] | None" = None
+    ) -> Callable[..., Any]:
+        """Decorate the command function.
+
+        Class methods are decorated with a weak reference to their ``owner``
+        class and bound on every call, so wrappers cached per class
+        do not keep dynamically created classes alive.
+        """
+        sig = signature(func)
+        params = list(sig.parameters.values())
+        if self.cache is not None:
+            for param in params:
+                if _is_uncacheable(param):
+                    errmsg = (
+                        "cached commands cannot have iterator, stream or file "
+                        f"parameters, but '{param.name}' is one"
+                    )
+                    raise TypeError(errmsg)
+        if any(p.kind not in _FLAT_KINDS for p in params):
+            if self.cache is not None:
+                errmsg = "cached commands cannot have variadic parameters"
+                raise TypeError(errmsg)
+            wrapper = self._decorate_chain(func, owner)
+            wrapper.__click_callback__ = wrapper  # type: ignore
+        else:
+            wrapper = self._compile_invoker(func, params, owner)
+        if owner is not None:
+            wrapper.__wrapped__ = _unwrap_method(self.func)  # type: ignore
+            wrapper.__signature__ = sig  # type: ignore
+        if self._resource_params:
+            # Parameters receiving resources are not exposed on the command line
+            wrapper.__signature__ = sig.replace(  # type: ignore
+                parameters=[p for p in params if p.name not in self._resource_params]
+            )
+        callback = wrapper.__click_callback__  # type: ignore
+        if callback is not wrapper:
+            update_wrapper(callback, wrapper)
+            # Keep the reference cycle out of the copied attributes
+            del callback.__click_callback__
+        return wrapper
+
+    def _decorate_chain(
+        self, func: Callable[..., Any], owner: "ref[type] | None" = None
+    ) -> Callable[..., Any]:
         def decorated(*args: Any, **kwds: Any) -> Any:
-            nonlocal func
-            local_func = typing.cast(Callable, func)
+            for param, name in self._resource_params.items():
+                if param not in kwds:
+                    kwds[param] = self._get_resource(name)
+            if timings._active:
+                recorder = timings.get_recorder()
+                if recorder is not None and not recorder.running:
+                    return recorder.run("execution", decorated, *args, **kwds)
+            if owner is None:
+                local_func = typing.cast(Callable, bound)
+            else:
+                local_func = self.func.__get__(None, owner())
             if self.validate:
-                model = self._create_model()
-                local_func = validated_with(model)(local_func)
+                local_func = validated_with(self.model)(local_func)
             if self.allow_pdb:
                 local_func = debuggable(local_func)
-            return local_func(*args, **kwds)
+            result = local_func(*args, **kwds)
+            if self.is_async:
+                result = _run_coroutine(result)
+            return result
 
+        update_wrapper(decorated, func)
+        bound = func if owner is None else None
         return decorated
 
-    def _create_model(self) -> type[BaseModel]:
+    def _compile_invoker(
+        self,
+        func: Callable[..., Any],
+        params: list[Parameter],
+        owner: "ref[type] | None" = None,
+    ) -> Callable[..., Any]:
+        """Compile flat invoker of a command.
+
+        The generated function binds arguments, validates them
+        and calls the command in a single frame. Calls with missing
+        arguments are delegated to :meth:`_invoke_partial` and calls
+        of commands with async validators to :meth:`_invoke_async`.
+        Coroutines of async commands are run on the shared event loop.
+        With ``allow_pdb`` the invoker also starts post-mortem sessions
+        and runs itself under the profiler of profiled invocations.
+        Calls within invocations with enabled timings are delegated
+        to :meth:`_invoke_timed` and calls of cached commands
+        to :meth:`_invoke_cached`.
+
+        Arguments converted by :mod:`click` to plain types are not validated
+        again, so the invoker gets a companion callback registered
+        as the :mod:`click` callback, which validates only
+        :attr:`validated_fields`. Direct calls validate all arguments.
+        """
+        names = [p.name for p in params]
+        signature_parts = []
+        for p in params:
+            if p.kind is Parameter.KEYWORD_ONLY and "*" not in signature_parts:
+                signature_parts.append("*")
+            signature_parts.append(f"{p.name}=__MISSING")
+        if "*" not in signature_parts:
+            signature_parts.append("*")
+        # Set only by the callback invoked by 'click' (see below)
+        signature_parts.append("__slim=False")
+        kwds = f", {_format_kwargs(names)}" if names else ""
+        if self.cache is not None:
+            body = [f"return __descriptor._invoke_cached(__func{kwds})"]
+        else:
+            body = self._invoker_body(params, kwds)
+        if self.allow_pdb:
+            body = [
+                "try:",
+                *(f"    {line}" for line in body),
+                "except Exception:",
+                "    __post_mortem()",
+                "    raise",
+            ]
+        body = [*self._invoker_preamble(kwds, bound=owner is not None), *body]
+        lines = [
+            f"def __invoke__({', '.join(signature_parts)}):",
+            *(f"    {line}" for line in body),
+            "def __click_invoke__(*__args, **__kwds):",
+            "    return __invoke__(*__args, __slim=True, **__kwds)",
+        ]
+
+        source = "\n".join(lines) + "\n"
+        qualname = getattr(func, "__qualname__", func.__class__.__name__)
+        filename = f"<cli generated invoker {qualname} {id(self):x}>"
+        namespace = {
+            "__MISSING": _MISSING,
+            "__descriptor": self,
+            "__partial": self._invoke_partial,
+            "__run": _run_coroutine,
+            "__post_mortem": post_mortem,
+            "__profiling": profiling,
+            "__timings": timings,
+        }
+        if owner is None:
+            namespace["__func"] = func
+        else:
+            namespace.update(__method=self.func, __owner=owner)
+        exec(compile(source, filename, "exec"), namespace)  # noqa: S102
+        linecache.cache[filename] = (
+            len(source),
+            None,
+            source.splitlines(True),
+            filename,
+        )
+        invoker = update_wrapper(namespace["__invoke__"], func)
+        invoker.__click_callback__ = namespace["__click_invoke__"]  # type: ignore
+        return invoker
+
+    def _invoker_body(self, params: list[Parameter], kwds: str) -> list[str]:
+        # Lines of invokers validating arguments and calling the command
+        fields = [
+            p.name
+            for p in params
+            if p.name in self.func.__annotations__
+            and p.name not in self._resource_params
+        ]
+        slim_fields = self.validated_fields if self.validate else []
+        names = [p.name for p in params]
+
+        def call(validated: list[str]) -> str:
+            parts = []
+            validated_set = set(validated)
+            for p in params:
+                value = f"__v.{p.name}" if p.name in validated_set else p.name
+                if p.kind is Parameter.KEYWORD_ONLY:
+                    value = f"{p.name}={value}"
+                parts.append(value)
+            code = f"__func({', '.join(parts)})"
+            return f"return __run({code})" if self.is_async else f"return {code}"
+
+        body = []
+        if self.validate:
+            body += [
+                "if __descriptor._async_validator is not None:",
+                f"    return __run(__descriptor._invoke_async(__func{kwds}))",
+            ]
+        if names:
+            missing = " or ".join(f"{n} is __MISSING" for n in names)
+            body += [f"if {missing}:", f"    return __partial(__func{kwds})"]
+        if self.validate:
+            # Without a command validator only the slim model is needed
+            body.append("if __slim and __descriptor.__validators__ is None:")
+            if slim_fields:
+                data = _format_kwargs(slim_fields)
+                body.append(
+                    "    __v = (__descriptor._slim_model "
+                    f"or __descriptor.slim_model)({data})"
+                )
+            body.append(f"    {call(slim_fields)}")
+            data = _format_kwargs(fields)
+            body.append(f"__v = (__descriptor._model or __descriptor.model)({data})")
+        body.append(call(fields if self.validate else []))
+        return body
+
+    def _invoker_preamble(self, kwds: str, *, bound: bool) -> list[str]:
+        # Lines of invokers run before the bound arguments are validated
+        lines = []
+        for param, name in self._resource_params.items():
+            lines += [
+                f"if {param} is __MISSING:",
+                f"    {param} = __descriptor._get_resource({name!r})",
+            ]
+        if bound:
+            lines.append("__func = __method.__get__(None, __owner())")
+        if self.allow_pdb:
+            # Profiled calls run the invoker again under the profiler
+            lines += [
+                "__p = __profiling._active and __profiling.get_profile()",
+                "if __p and not __p.running:",
+                f"    return __p.run(__invoke__{kwds}, __slim=__slim)",
+            ]
+        if self.cache is None:
+            lines += [
+                "__r = __timings._active and __timings.get_recorder()",
+                "if __r and not __r.running:",
+                f"    return __descriptor._invoke_timed(__func, __r, __slim{kwds})",
+            ]
+        return lines
+
+    def _invoke_partial(self, func: Callable[..., Any], **kwds: Any) -> Any:
+        all_args = {k: v for k, v in kwds.items() if v is not _MISSING}
+        if self.validate:
+            # Missing arguments are reported by the full model
+            model = self.model
+            validated_args = {
+                k: v for k, v in all_args.items() if k in model.model_fields
+            }
+            validated_args = dict(model(**validated_args))
+            all_args = {**all_args, **validated_args}
+        result = func(**all_args)
+        if self.is_async:
+            result = _run_coroutine(result)
+        return result
+
+    def _invoke_timed(
+        self,
+        func: Callable[..., Any],
+        recorder: "timings.Recorder",
+        slim: bool,
+        **kwds: Any,
+    ) -> Any:
+        """Call the command recording timings of phases of the call.
+
+        Calls with missing arguments and of commands with async validators
+        are timed as a whole in the execution phase.
+        """
+        try:
+            recorder.begin("model")
+            if self._async_validator is not None and self.validate:
+                recorder.begin("execution")
+                return _run_coroutine(self._invoke_async(func, **kwds))
+            if any(v is _MISSING for v in kwds.values()):
+                recorder.begin("execution")
+                return self._invoke_partial(func, **kwds)
+            model = None
+            if self.validate:
+                model = self.model
+                if slim and self.__validators__ is None:
+                    model = self.slim_model
+            recorder.begin("validation")
+            if model is not None:
+                data = {k: v for k, v in kwds.items() if k in model.model_fields}
+                kwds.update(dict(model(**data)))
+            recorder.begin("execution")
+            result = func(**kwds)
+            if self.is_async:
+                result = _run_coroutine(result)
+            return result
+        except Exception:
+            if self.allow_pdb:
+                recorder.begin("debugger")
+                post_mortem()
+            raise
+        finally:
+            recorder.end()
+
+    def _invoke_cached(self, func: Callable[..., Any], **kwds: Any) -> Any:
+        """Call the command or replay its result stored in :attr:`cache`.
+
+        Arguments are validated with the full model before cache keys
+        are made, so keys are built from normalized values. Calls with
+        missing arguments and of commands with async validators are not
+        cached and no keys are made with caching turned off. Calls within
+        invocations with enabled timings are timed as a whole
+        in the execution phase.
+        """
+        from .cache import get_mode, make_key
+
+        if timings._active:
+            recorder = timings.get_recorder()
+            if recorder is not None and not recorder.running:
+                return recorder.run("execution", self._invoke_cached, func, **kwds)
+        if any(v is _MISSING for v in kwds.values()):
+            return self._invoke_partial(func, **kwds)
+        if self.validate:
+            if self._async_validator is not None:
+                return _run_coroutine(self._invoke_async(func, **kwds))
+            model = self.model
+            data = {k: v for k, v in kwds.items() if k in model.model_fields}
+            kwds.update(dict(model(**data)))
+        if self.is_async:
+            func = _run_coroutine_of(func)
+        if get_mode() == "off":
+            return func(**kwds)
+        command = _unwrap_method(self.func)
+        arguments = {k: v for k, v in kwds.items() if k not in self._resource_params}
+        key = make_key(f"{command.__module__}.{command.__qualname__}", arguments)
+        return self.cache.call(key, func, **kwds)  # type: ignore
+
+    def _get_resource(self, name: str) -> Any:
+        if self.resources is None:
+            errmsg = f"unknown resource '{name}'"
+            raise LookupError(errmsg)
+        return self.resources.get(name)
+
+    async def _invoke_async(self, func: Callable[..., Any], **kwds: Any) -> Any:
+        """Validate arguments with an async validator and call the command."""
+        mode, validator = typing.cast(tuple, self._async_validator)
+        all_args = {k: v for k, v in kwds.items() if v is not _MISSING}
+        model = self.model
+        data = {k: v for k, v in all_args.items() if k in model.model_fields}
+        if mode == "before":
+            data = await self._call_validator(validator, data)
+        instance = model(**data)
+        if mode == "after":
+            instance = await self._call_validator(validator, instance)
+        result = func(**{**all_args, **dict(instance)})
+        if isawaitable(result):
+            result = await result
+        return result
+
+    async def _call_validator(self, validator: Callable[..., Any], value: Any) -> Any:
+        # Follow 'pydantic' conventions, i.e. validators
+        # with the first parameter named 'cls' get the model class
+        func = _unwrap_method(validator)
+        params = list(signature(func).parameters)
+        if isinstance(validator, classmethod) or params[:1] == ["cls"]:
+            return await func(self.model, value)
+        return await func(value)
+
+    def _create_model(
+        self, names: list[str] | None = None, *, slim: bool = False
+    ) -> "type[BaseModel]":
+        from pydantic import ConfigDict, create_model
+        from pydantic.alias_generators import to_pascal
+
         func = self.func.__func__ if isinstance(self.func, classmethod) else self.func
         func = typing.cast(Callable, func)
         func_sig = signature(func)
@@ -95,17 +549,22 @@ class CommandDescriptor:
             name: self._get_field_spec(param)
             for name, param in func_sig.parameters.items()
             if name in self.func.__annotations__
+            and name not in self._resource_params
+            and (names is None or name in names)
         }
         mconf = ConfigDict(
             arbitrary_types_allowed=True,
         )
-        mname = f"{to_pascal(self.func.__name__)}Model"
+        mname = f"{to_pascal(self.func.__name__)}{'Slim' if slim else ''}Model"
+        validators = None if slim else self.__validators__
 
         return create_model(  # type: ignore
-            mname, **fields, __config__=mconf, __validators__=self.__validators__
+            mname, **fields, __config__=mconf, __validators__=validators
         )
 
-    def _get_field_spec(self, param: Parameter) -> tuple[_TypeHint, FieldInfo]:
+    def _get_field_spec(self, param: Parameter) -> tuple[_TypeHint, "FieldInfo"]:
+        from pydantic import Field
+
         def _get_input_ann(ann: _TypeHint) -> _TypeHint:
             if isinstance(ann, _AnnotatedAlias):
                 for obj in ann.__metadata__:
@@ -117,4 +576,99 @@ class CommandDescriptor:
         ann = _get_input_ann(param.annotation)
         if isinstance(ann, UnionType | _UnionGenericAlias):
             ann = Union[*tuple(_get_input_ann(a) for a in ann.__args__)]  # type: ignore
+        if (validator := _get_validator(param)) is not None:
+            from pydantic import AfterValidator
+
+            ann = Annotated[ann, AfterValidator(validator)]
         return ann, Field(**getattr(param.default, "field_kwargs", {}))
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _format_kwargs(names: list[str]) -> str:
+    # Calls with many keyword arguments take quadratic time to compile,
+    # so they are passed as a dictionary display instead
+    if len(names) > _MAX_KEYWORDS:
+        items = ", ".join(f"{n!r}: {n}" for n in names)
+        return f"**{{{items}}}"
+    return ", ".join(f"{n}={n}" for n in names)
+
+
+def _unwrap_method(func: Any) -> Any:
+    if isinstance(func, classmethod | staticmethod):
+        return func.__func__
+    return func
+
+
+def _get_validator(param: Parameter) -> Callable[..., Any] | None:
+    # Compiled validator of the parameter (see 'ParameterInfoExtensionsMixin')
+    return getattr(param.default, "_validator", None)
+
+
+def _needs_validation(param: Parameter) -> bool:
+    field_kwargs = getattr(param.default, "field_kwargs", None) or {}
+    if any(k not in _INFO_FIELD_KWARGS for k in field_kwargs):
+        return True
+    if _get_validator(param) is not None:
+        return True
+    ann = param.annotation
+    optional = False
+    if isinstance(ann, UnionType | _UnionGenericAlias):
+        args = [a for a in ann.__args__ if a is not type(None)]
+        if len(args) != 1:
+            return True
+        optional = len(args) < len(ann.__args__)
+        ann = args[0]
+    # Defaults are not converted by 'click' when they are 'None',
+    # so they must be checked against the annotation
+    default = getattr(param.default, "default", param.default)
+    if default is None and not optional:
+        return True
+    return ann not in _PLAIN_TYPES
+
+
+def _is_uncacheable(param: Parameter) -> bool:
+    import click
+
+    if isinstance(getattr(param.default, "click_type", None), click.File):
+        return True
+    anns = [param.annotation]
+    while anns:
+        ann = anns.pop()
+        if isinstance(ann, _AnnotatedAlias):
+            anns.extend(m.ann for m in ann.__metadata__ if isinstance(m, Parse))
+        anns.extend(get_args(ann))
+        origin = get_origin(ann) or ann
+        if isinstance(origin, type) and issubclass(origin, _UNCACHEABLE_TYPES):
+            return True
+    return False
+
+
+def _run_coroutine(coro: Any) -> Any:
+    import asyncio
+
+    from .loop import run_coroutine
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # Commands called from coroutines (e.g. of commands of derived classes)
+        # are awaited by them, since waiting would block the running loop
+        return coro
+    profile = profiling._active and profiling.get_profile()
+    if profile and profile.running:
+        # Profilers see only the calling thread, so profiled
+        # coroutines are not run on the shared event loop
+        return asyncio.run(coro)
+    return run_coroutine(coro)
+
+
+def _run_coroutine_of(func: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(func)
+    def run(*args: Any, **kwds: Any) -> Any:
+        return _run_coroutine(func(*args, **kwds))
+
+    return run
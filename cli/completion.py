@@ -0,0 +1,82 @@
+"""Shell completion served from the metadata index.
+
+Completion requests of applications with ``index=True`` are answered
+from static metadata stored in the index (see :mod:`cli.index`):
+names of subcommands and options and choices of parameters derived
+from :class:`click.Choice` types (e.g. :class:`enum.Enum` annotations)
+and :data:`typing.Literal` parse types. Output follows the formats
+of completion scripts installed by :mod:`typer`.
+
+Entry points may call :func:`fast_complete` (also available as
+``cli.fast_complete``) before importing the application, so requests
+are answered from a fresh index of the running program without importing
+the application, :mod:`typer`, :mod:`click` or :mod:`pydantic`::
+
+    import cli
+
+    cli.fast_complete()
+
+    from package.app import app
+
+Otherwise requests are answered by :meth:`cli.CLI.__call__`
+before the :mod:`click` command is built. Requests are answered from compact
+completion indexes by code importing only builtin modules, so answering
+them takes little more than starting the interpreter.
+
+Parameters with dynamic completion (``autocompletion`` or ``shell_complete``
+callbacks) opt in to the regular :mod:`click` completion, which is also used
+for command lines that cannot be resolved statically.
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from . import _fastpath
+from ._fastpath import fast_complete, get_complete_var
+from .index import build_index, compact_index, load_completion_index
+
+if TYPE_CHECKING:
+    from .main import CLI
+
+__all__ = (
+    "Completion",
+    "complete_from_index",
+    "fast_complete",
+    "get_completions",
+    "get_complete_var",
+)
+
+
+class Completion(NamedTuple):
+    """Completion item (same as :class:`click.shell_completion.CompletionItem`)."""
+
+    value: str
+    type: str = "plain"
+    help: str | None = None
+
+
+def complete_from_index(app: "CLI", prog_name: str, complete_var: str) -> None:
+    """Answer completion request of the application from the index.
+
+    The index is built when it does not exist or is stale. Exits when
+    the request is served and returns otherwise, i.e. when it is not
+    a completion request or it must be handled by the :mod:`click` completion.
+    """
+    shell = _fastpath.get_shell(complete_var)
+    if shell is None:
+        return
+    index = load_completion_index(prog_name)
+    if index is None:
+        index = compact_index(build_index(app, prog_name))
+    _fastpath.complete(index, shell)
+
+
+def get_completions(
+    root: dict[str, Any], args: Sequence[str], incomplete: str
+) -> list[Completion] | None:
+    """Get completions of a command line from a node of a completion index.
+
+    Returns ``None`` when completions cannot be determined statically.
+    """
+    items = _fastpath.get_completions(root, args, incomplete)
+    return None if items is None else [Completion(*item) for item in items]
@@ -0,0 +1,179 @@
+"""Warm daemon serving invocations of :class:`cli.CLI` applications.
+
+The daemon keeps the application, its :mod:`click` command and validation
+models loaded and serves invocations over a Unix socket. Clients forward
+command-line arguments, environment, working directory and standard input
+and get back standard output, standard error and the exit code.
+
+Messages are framed as a 4-byte big-endian length of a JSON header
+followed by the header and binary payload (standard input in requests;
+standard output and standard error in responses).
+
+Start the daemon with :meth:`cli.CLI.serve` and call it with
+``cli-client SOCKET [ARGS]...`` or ``python -m cli.daemon SOCKET [ARGS]...``.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, NoReturn
+
+if TYPE_CHECKING:
+    from .main import CLI
+    from .runner import Result
+
+__all__ = ("Server", "serve", "request", "main")
+
+_HEADER = struct.Struct(">I")
+
+
+class Server(socketserver.UnixStreamServer):
+    """Unix socket server invoking commands of a warm application.
+
+    Requests are served one at a time, since invocations
+    replace environment and working directory of the process.
+    """
+
+    def __init__(self, app: "CLI", path: str | Path) -> None:
+        self.app = app
+        self.command = app.get_command()
+        app.prebuild_models()
+        super().__init__(str(path), _RequestHandler)
+
+    def invoke(
+        self, argv: Sequence[str], env: Mapping[str, str], cwd: str, stdin: bytes
+    ) -> "Result":
+        """Invoke command of the application."""
+        from .runner import invoke
+
+        with _environment(env, cwd):
+            return invoke(self.command, argv, stdin=stdin, obj=self.app.context_obj())
+
+
+def serve(app: "CLI", path: str | Path) -> None:
+    """Serve invocations of the application over a Unix socket.
+
+    Stale socket file at ``path`` is replaced and the socket
+    is created with permissions restricted to the current user.
+    """
+    path = Path(path)
+    if path.is_socket():
+        path.unlink()
+    umask = os.umask(0o177)
+    try:
+        server = Server(app, path)
+    finally:
+        os.umask(umask)
+    with server:
+        try:
+            server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def request(
+    path: str | Path,
+    argv: Sequence[str],
+    *,
+    stdin: bytes = b"",
+    env: Mapping[str, str] | None = None,
+    cwd: str | None = None,
+) -> "Result":
+    """Send invocation request to a daemon.
+
+    Environment and working directory default to those
+    of the current process.
+    """
+    from .runner import Result
+
+    header = {
+        "argv": list(argv),
+        "env": dict(os.environ if env is None else env),
+        "cwd": str(Path.cwd()) if cwd is None else cwd,
+        "stdin": len(stdin),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        with sock.makefile("rwb") as stream:
+            _send(stream, header, stdin)
+            header, payload = _recv(stream)
+    stdout, stderr = payload[: header["stdout"]], payload[header["stdout"] :]
+    return Result(header["exit_code"], stdout, stderr)
+
+
+def main(argv: Sequence[str] | None = None) -> NoReturn:
+    """Client entry point forwarding an invocation to a daemon."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: cli-client SOCKET [ARGS]...", file=sys.stderr)
+        sys.exit(2)
+    path, *args = argv
+    stdin = b"" if sys.stdin.isatty() else sys.stdin.buffer.read()
+    result = request(path, args, stdin=stdin)
+    sys.stdout.buffer.write(result.stdout)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(result.stderr)
+    sys.stderr.flush()
+    sys.exit(result.exit_code)
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: Server
+
+    def handle(self) -> None:
+        header, stdin = _recv(self.rfile)
+        result = self.server.invoke(header["argv"], header["env"], header["cwd"], stdin)
+        response = {
+            "exit_code": result.exit_code,
+            "stdout": len(result.stdout),
+            "stderr": len(result.stderr),
+        }
+        _send(self.wfile, response, result.stdout + result.stderr)
+
+
+def _send(stream: IO[bytes], header: dict[str, Any], payload: bytes) -> None:
+    data = json.dumps(header).encode()
+    stream.write(_HEADER.pack(len(data)) + data + payload)
+    stream.flush()
+
+
+def _recv(stream: IO[bytes]) -> tuple[dict[str, Any], bytes]:
+    (size,) = _HEADER.unpack(_read_exactly(stream, _HEADER.size))
+    header = json.loads(_read_exactly(stream, size))
+    size = sum(header[k] for k in ("stdin", "stdout", "stderr") if k in header)
+    return header, _read_exactly(stream, size)
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        errmsg = "connection closed before the message was received"
+        raise ConnectionError(errmsg)
+    return data
+
+
+@contextmanager
+def _environment(env: Mapping[str, str], cwd: str) -> Iterator[None]:
+    saved_env, saved_cwd = dict(os.environ), Path.cwd()
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(cwd)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+
+if __name__ == "__main__":
+    main()
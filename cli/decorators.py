@@ -4,37 +4,50 @@ import traceback
 from collections.abc import Callable
 from functools import wraps
 from inspect import signature
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import click
-from pydantic import BaseModel
 
+from . import profiling
 from .utils import match_signature
 
-try:
-    import ipdb as pdb
-except ImportError:
-    import pdb
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+def post_mortem() -> None:
+    """Start post-mortem debugger session for the exception being handled.
+
+    The session is started only when it is enabled
+    in the object of the root context.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and getattr(ctx.find_root().obj, "pdb", False):
+        try:
+            import ipdb as pdb
+        except ImportError:
+            import pdb
+        *_, tb = sys.exc_info()
+        traceback.print_exc()
+        pdb.post_mortem(tb)
 
 
 def debuggable(callable: Callable[..., Any]) -> Callable[..., Any]:
     @wraps(callable)
     def decorated(*args: Any, **kwargs: Any) -> Any:
         try:
+            if profiling._active and (profile := profiling.get_profile()):
+                return profile.run(callable, *args, **kwargs)
             return callable(*args, **kwargs)
         except Exception as exc:
-            ctx = click.get_current_context().find_root()
-            if getattr(ctx.obj, "pdb", False):
-                *_, tb = sys.exc_info()
-                traceback.print_exc()
-                pdb.post_mortem(tb)
+            post_mortem()
             raise exc
 
     return decorated
 
 
 def validated_with(
-    model: type[BaseModel],
+    model: "type[BaseModel]",
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         func_sig = signature(func)
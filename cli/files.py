@@ -0,0 +1,149 @@
+"""Memory-mapped file parameter types.
+
+Commands annotated with :data:`MappedFile` or :data:`MappedBytes`
+take paths on the command line and get read-only memory maps
+of the files, so even very large inputs are paged in on demand
+instead of being read into memory. Validation checks only existence,
+permissions and size limits of the files and never reads their contents.
+Maps created within invocations are closed when their :mod:`click`
+contexts close, so commands must not keep references to them.
+
+Examples
+--------
+>>> import tempfile
+>>> with tempfile.NamedTemporaryFile() as file:
+...     _ = file.write(b"data")
+...     file.flush()
+...     view = Mapped(view=True, max_size=10).open(Path(file.name))
+...     bytes(view[:2])
+b'da'
+"""
+
+import mmap
+import os
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any
+
+import click
+
+from .params import Parse
+
+if TYPE_CHECKING:
+    from pydantic import GetCoreSchemaHandler
+    from pydantic_core import CoreSchema
+
+__all__ = ("Mapped", "MappedFile", "MappedBytes")
+
+
+class Mapped:
+    """Parse type of read-only memory-mapped files.
+
+    Attributes
+    ----------
+    view
+        Hand the command a read-only :class:`memoryview` of the mapped file
+        instead of the :class:`mmap.mmap` object.
+    min_size, max_size
+        Limits of the file size in bytes.
+    """
+
+    def __init__(
+        self,
+        *,
+        view: bool = False,
+        min_size: int | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.view = view
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(view={self.view}, "
+            f"min_size={self.min_size}, max_size={self.max_size})"
+        )
+
+    @classmethod
+    def file(cls, *, min_size: int | None = None, max_size: int | None = None) -> Any:
+        """Annotation of a path parameter parsed as :class:`mmap.mmap`.
+
+        Empty files cannot be mapped, so they are rejected.
+        """
+        mapped = cls(min_size=min_size, max_size=max_size)
+        return Annotated[Path, Parse(Annotated[mmap.mmap, mapped])]
+
+    @classmethod
+    def bytes(cls, *, min_size: int | None = None, max_size: int | None = None) -> Any:
+        """Annotation of a path parameter parsed as read-only :class:`memoryview`.
+
+        Empty files give empty views.
+        """
+        mapped = cls(view=True, min_size=min_size, max_size=max_size)
+        return Annotated[Path, Parse(Annotated[memoryview, mapped])]
+
+    def open(self, path: Path) -> mmap.mmap | memoryview:
+        """Check and map file.
+
+        Raises
+        ------
+        ValueError
+            If the file does not exist, is not readable,
+            violates size limits or cannot be mapped.
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            errmsg = f"file '{path}' does not exist"
+            raise ValueError(errmsg) from None
+        if not path.is_file():
+            errmsg = f"'{path}' is not a regular file"
+            raise ValueError(errmsg)
+        if not os.access(path, os.R_OK):
+            errmsg = f"file '{path}' is not readable"
+            raise ValueError(errmsg)
+        size = stat.st_size
+        if self.min_size is not None and size < self.min_size:
+            errmsg = f"file '{path}' is smaller than {self.min_size} bytes"
+            raise ValueError(errmsg)
+        if self.max_size is not None and size > self.max_size:
+            errmsg = f"file '{path}' is larger than {self.max_size} bytes"
+            raise ValueError(errmsg)
+        if size == 0:
+            if self.view:
+                return memoryview(b"")
+            errmsg = f"cannot memory-map empty file '{path}'"
+            raise ValueError(errmsg)
+        with path.open("rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        value = memoryview(mapped) if self.view else mapped
+        ctx = click.get_current_context(silent=True)
+        if ctx is not None:
+            ctx.call_on_close(partial(_close, mapped, value))
+        return value
+
+    def __get_pydantic_core_schema__(
+        self, source: Any, handler: "GetCoreSchemaHandler"
+    ) -> "CoreSchema":
+        from pydantic_core import core_schema
+
+        return core_schema.no_info_after_validator_function(
+            self.open, handler.generate_schema(Path)
+        )
+
+
+MappedFile = Mapped.file()
+MappedBytes = Mapped.bytes()
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _close(mapped: mmap.mmap, value: mmap.mmap | memoryview) -> None:
+    if isinstance(value, memoryview):
+        value.release()
+    # Maps still exported through other views are closed by garbage collection
+    with suppress(BufferError):
+        mapped.close()
@@ -0,0 +1,417 @@
+"""Persistent metadata index of :class:`cli.CLI` applications.
+
+The index stores names, help texts, parameter declarations and defaults
+of all commands together with their rendered help pages. It is kept
+in the user cache directory (``CLI_CACHE_DIR`` when set) under the program
+name and path of the running script and keyed by versions of :mod:`cli`
+and the application package and modification times of all modules defining
+or registering commands (e.g. with :meth:`cli.CLI.add_lazy_command`).
+Versions are checked via modification times of installed package metadata,
+so loading the index requires only the standard library (and no :mod:`click`).
+
+With a fresh index ``--help`` (also of unknown commands) is served
+without importing modules of lazy commands, building the :mod:`click`
+command tree or :mod:`pydantic` models. A stale index is rebuilt
+when help is requested. Help pages are rendered when the index
+is built, so they use the terminal width of that moment. They are stored
+in a separate file and shell completion (see :mod:`cli.completion`) reads
+a compact copy of the index with only the metadata it needs, so completion
+requests parse a small fraction of the index.
+"""
+
+import json
+import marshal
+import os
+import sys
+from collections.abc import Sequence
+from enum import Enum
+from pathlib import Path
+from types import NoneType, UnionType
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Literal,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from . import _fastpath
+from ._fastpath import (
+    COMPLETION_DEFAULTS,
+    INDEX_FORMAT,
+    get_index_file,
+    is_fresh,
+    load_completion_index,
+)
+
+if TYPE_CHECKING:
+    import click
+
+    from .main import CLI
+
+__all__ = (
+    "build_index",
+    "load_index",
+    "load_completion_index",
+    "compact_index",
+    "serve_from_index",
+    "get_cache_dir",
+    "get_index_path",
+    "write_atomic",
+)
+
+_MISSING = object()
+
+
+def get_cache_dir() -> Path:
+    """Get cache directory of :mod:`cli`.
+
+    It is ``CLI_CACHE_DIR`` when set and ``cli`` subdirectory
+    of the platform-specific user cache directory otherwise.
+    """
+    return Path(_fastpath.get_cache_dir())
+
+
+def get_index_path(prog_name: str) -> Path:
+    """Get path of the index of a program.
+
+    Paths depend on the environment and the resolved path of the running
+    script too, so programs with the same name do not share indexes.
+    """
+    return Path(get_index_file(prog_name))
+
+
+def build_index(app: "CLI", prog_name: str) -> dict[str, Any]:
+    """Build metadata index of the application and save it in the cache.
+
+    All lazy commands are loaded, so this is done only
+    when the index does not exist or is stale.
+    """
+    from .runner import capture
+
+    command = app.get_command()
+    ctx = command.make_context(prog_name, [], resilient_parsing=True)
+    sources: dict[str, int] = {}
+    pages: dict[str, str] = {}
+    with capture() as (stdout, _):
+        root = _describe(command, ctx, stdout, sources, pages)
+    _add_registering_sources(app, sources)
+    versions = {
+        package: _add_distribution(package, sources)
+        for package in ("cli", _get_package(app))
+        if package is not None
+    }
+    index = {
+        "format": INDEX_FORMAT,
+        "versions": versions,
+        "prog_name": prog_name,
+        "sources": sources,
+        "root": root,
+    }
+    path = get_index_path(prog_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Help pages and the completion index go first,
+    # so they are never older than a fresh index
+    _write_json(Path(get_index_file(prog_name, "help")), pages)
+    completion_path = Path(get_index_file(prog_name, "complete"))
+    write_atomic(completion_path, marshal.dumps(compact_index(index)))
+    _write_json(path, index)
+    return index
+
+
+def load_index(prog_name: str) -> dict[str, Any] | None:
+    """Load metadata index of a program.
+
+    Returns ``None`` when the index does not exist or is stale.
+    """
+    try:
+        index = json.loads(get_index_path(prog_name).read_text())
+    except (OSError, ValueError):
+        return None
+    return index if is_fresh(index, prog_name) else None
+
+
+def compact_index(index: dict[str, Any]) -> dict[str, Any]:
+    """Get completion index, i.e. a compact copy of the index.
+
+    Nodes keep only metadata used by shell completion and parameters
+    keep only values other than their defaults in :data:`COMPLETION_DEFAULTS`.
+    """
+    return {
+        "format": index["format"],
+        "prog_name": index["prog_name"],
+        "sources": index["sources"],
+        "root": _compact_node(index["root"]),
+    }
+
+
+def serve_from_index(app: "CLI", args: Sequence[str], prog_name: str) -> None:
+    """Serve help or unknown-command error of a help request from the index.
+
+    Exits when the request is served and returns otherwise,
+    i.e. when the command line must be handled by the application.
+    The index is not even loaded for command lines without help options.
+    """
+    if not any(a in _help_option_names(app) for a in args):
+        return
+    index = load_index(prog_name) or build_index(app, prog_name)
+    resolved = _resolve(index["root"], args)
+    if resolved is None:
+        return
+    path, unknown = resolved
+    node = index["root"]
+    for name in path:
+        node = node["commands"][name]
+    if unknown is None:
+        try:
+            pages = json.loads(Path(get_index_file(prog_name, "help")).read_text())
+        except (OSError, ValueError):
+            return
+        sys.stdout.write(pages[" ".join(path)])
+        sys.exit(0)
+    _show_unknown_command(node, [prog_name, *path], unknown)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write file atomically, so concurrent readers never see partial files.
+
+    Data is written to a temporary file next to the target,
+    which then replaces the target.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _compact_node(node: dict[str, Any]) -> dict[str, Any]:
+    compact: dict[str, Any] = {"help": node["help"], "hidden": node["hidden"]}
+    compact["params"] = [
+        {
+            key: value
+            for key in ("name", "opts", *COMPLETION_DEFAULTS)
+            if (value := param[key]) != COMPLETION_DEFAULTS.get(key, _MISSING)
+        }
+        for param in node["params"]
+    ]
+    if "commands" in node:
+        compact["commands"] = {
+            name: _compact_node(child) for name, child in node["commands"].items()
+        }
+    return compact
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    data = json.dumps(obj, separators=(",", ":"), default=_json_default)
+    write_atomic(path, data.encode())
+
+
+def _help_option_names(app: "CLI") -> list[str]:
+    return app.info.context_settings.get("help_option_names", ["--help"])
+
+
+def _describe(
+    command: "click.Command",
+    ctx: "click.Context",
+    stdout: Any,
+    sources: dict[str, int],
+    pages: dict[str, str],
+    path: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    import click
+
+    from .lazy import LazyCommand
+
+    _add_source(command.callback, sources)
+    stdout.seek(0)
+    stdout.truncate()
+    click.echo(command.get_help(ctx), color=ctx.color)
+    pages[" ".join(path)] = stdout.getvalue().decode()
+    node: dict[str, Any] = {
+        "name": command.name,
+        "help": command.get_short_help_str(limit=300),
+        "hidden": command.hidden,
+        "usage": ctx.get_usage(),
+        "help_option_names": ctx.help_option_names if command.add_help_option else [],
+        "params": [_describe_param(command, p) for p in command.get_params(ctx)],
+    }
+    if isinstance(command, click.MultiCommand):
+        node["commands"] = {}
+        for name in command.list_commands(ctx):
+            subcommand = command.get_command(ctx, name)
+            if subcommand is None:
+                continue
+            if isinstance(subcommand, LazyCommand):
+                subcommand = subcommand.load()
+            subctx = subcommand.make_context(
+                name, [], parent=ctx, resilient_parsing=True
+            )
+            node["commands"][name] = _describe(
+                subcommand, subctx, stdout, sources, pages, (*path, name)
+            )
+    return node
+
+
+def _describe_param(
+    command: "click.Command", param: "click.Parameter"
+) -> dict[str, Any]:
+    import click
+
+    choices = getattr(param.type, "choices", None)
+    if choices is None:
+        choices = _get_annotation_choices(command, param)
+    complete_type = "plain"
+    if isinstance(param.type, click.Path):
+        dir_only = param.type.dir_okay and not param.type.file_okay
+        complete_type = "dir" if dir_only else "file"
+    elif isinstance(param.type, click.File):
+        complete_type = "file"
+    return {
+        "name": param.name,
+        "kind": param.param_type_name,
+        "opts": param.opts,
+        "secondary_opts": param.secondary_opts,
+        "help": getattr(param, "help", None),
+        "default": None if callable(param.default) else param.default,
+        "required": param.required,
+        "nargs": param.nargs,
+        "multiple": param.multiple,
+        "is_flag": getattr(param, "is_flag", False),
+        "takes_value": not (
+            getattr(param, "is_flag", False) or getattr(param, "count", False)
+        ),
+        "hidden": getattr(param, "hidden", False),
+        "choices": None if choices is None else [str(c) for c in choices],
+        "complete_type": complete_type,
+        "dynamic": getattr(param, "_custom_shell_complete", None) is not None,
+    }
+
+
+def _get_annotation_choices(
+    command: "click.Command", param: "click.Parameter"
+) -> list[Any] | None:
+    # Choices of 'Literal' and 'Enum' parse types, which 'click' does not know
+    from inspect import signature
+
+    from .params import Parse
+
+    try:
+        ann = signature(command.callback).parameters[param.name].annotation  # type: ignore
+    except (TypeError, ValueError, KeyError):
+        return None
+    if get_origin(ann) is Annotated:
+        parse = next((m for m in ann.__metadata__ if isinstance(m, Parse)), None)
+        ann = get_args(ann)[0] if parse is None else parse.ann
+    args = get_args(ann)
+    if get_origin(ann) in (Union, UnionType) and len(args) == 2 and NoneType in args:
+        ann = next(a for a in args if a is not NoneType)
+    if get_origin(ann) is Literal:
+        return list(get_args(ann))
+    if isinstance(ann, type) and issubclass(ann, Enum):
+        return [m.value for m in ann]
+    return None
+
+
+def _add_source(func: Any, sources: dict[str, int]) -> None:
+    module = sys.modules.get(getattr(func, "__module__", None) or "")
+    filename = getattr(module, "__file__", None)
+    if filename and filename not in sources:
+        sources[filename] = Path(filename).stat().st_mtime_ns
+
+
+def _add_registering_sources(app: Any, sources: dict[str, int]) -> None:
+    # Modules registering commands are tracked too, since registering
+    # a lazy command in a module without callbacks must invalidate the index
+    from typer import Typer
+
+    for filename in getattr(app, "registering_files", ()):
+        if filename not in sources and Path(filename).is_file():
+            sources[filename] = Path(filename).stat().st_mtime_ns
+    typers = [group.typer_instance for group in app.registered_groups]
+    lazy_commands = getattr(app, "lazy_commands", {}).values()
+    typers.extend(c._target for c in lazy_commands if isinstance(c._target, Typer))
+    for typer_instance in typers:
+        _add_registering_sources(typer_instance, sources)
+
+
+def _get_package(app: "CLI") -> str | None:
+    callback = app.registered_callback.callback if app.registered_callback else None
+    if callback is None and app.registered_commands:
+        callback = app.registered_commands[0].callback
+    module = getattr(callback, "__module__", None)
+    return module.partition(".")[0] if module else None
+
+
+def _add_distribution(package: str, sources: dict[str, int]) -> str | None:
+    # Metadata files are rewritten when packages are (re)installed,
+    # so their modification times track versions without reading them
+    from importlib.metadata import PackageNotFoundError, distribution
+
+    try:
+        dist = distribution(package)
+    except (PackageNotFoundError, ValueError):
+        return None
+    # Metadata directory is not exposed by the public API
+    metadata_dir = getattr(dist, "_path", None)
+    for name in ("METADATA", "PKG-INFO"):
+        path = Path(metadata_dir or "", name)
+        if metadata_dir is not None and path.is_file():
+            sources[str(path)] = path.stat().st_mtime_ns
+    return dist.version
+
+
+def _resolve(
+    root: dict[str, Any], args: Sequence[str]
+) -> tuple[list[str], str | None] | None:
+    # Only command paths followed by a help option or an unknown
+    # command name are resolved, since resolving other command lines
+    # would require parsing option values.
+    node, path = root, []
+    for arg in args:
+        if arg in node["help_option_names"]:
+            return path, None
+        commands = node.get("commands")
+        if commands is None or arg.startswith("-"):
+            return None
+        if arg not in commands:
+            return path, arg
+        node = commands[arg]
+        path.append(arg)
+    return None
+
+
+def _show_unknown_command(node: dict[str, Any], path: list[str], name: str) -> None:
+    import click
+    from typer import core
+
+    class IndexedCommand(click.Command):
+        # Placeholder command with usage text taken from the index
+        def get_usage(self, ctx: click.Context) -> str:  # noqa: ARG002
+            return node["usage"]
+
+    command = IndexedCommand(
+        node["name"], add_help_option=bool(node["help_option_names"])
+    )
+    ctx = click.Context(command, info_name=" ".join(path))
+    if node["help_option_names"]:
+        ctx.help_option_names = node["help_option_names"]
+    error = click.UsageError(f"No such command {name!r}.", ctx)
+    if core.rich:
+        from typer import rich_utils
+
+        rich_utils.rich_format_error(error)
+    else:
+        error.show()
+    sys.exit(error.exit_code)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, tuple | set | frozenset):
+        return list(obj)
+    return repr(obj)
@@ -0,0 +1,103 @@
+import threading
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any, ClassVar
+
+import click
+from typer.core import TyperGroup
+
+__all__ = ("LazyCommand", "LazyGroup", "import_object")
+
+
+class LazyCommand(click.Command):
+    """Placeholder of a command resolved only when it is dispatched.
+
+    Placeholders provide names and help texts for command listings
+    without importing modules defining the actual commands.
+
+    Attributes
+    ----------
+    target
+        Import path of the command in the ``'package.module:attribute'`` format.
+    loader
+        Function building the actual command from the imported target.
+        It is called once per thread dispatching the command.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: str,
+        loader: Callable[[Any], click.Command],
+        *,
+        rich_help_panel: str | None = None,
+        **attrs: Any,
+    ) -> None:
+        super().__init__(name, **attrs)
+        self.target = target
+        self.loader = loader
+        self.rich_help_panel = rich_help_panel
+        self._target: Any = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def load(self) -> click.Command:
+        """Import target (only once) and build the actual command.
+
+        Commands are built once per thread, as :mod:`click` commands built
+        by :mod:`typer` cannot be invoked concurrently, so loaders
+        may be called many times with the same target.
+        """
+        command = getattr(self._local, "command", None)
+        if command is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = import_object(self.target)
+                command = self._local.command = self.loader(self._target)
+        return command
+
+
+class LazyGroup(TyperGroup):
+    """Command group with support for lazily resolved commands.
+
+    Lazy commands are defined as a class attribute, so specialized
+    subclasses are created for individual :class:`cli.CLI` instances.
+    """
+
+    lazy_commands: ClassVar[dict[str, LazyCommand]] = {}
+
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        for name, command in self.lazy_commands.items():
+            self.commands.setdefault(name, command)
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        cmd_name, cmd, args = super().resolve_command(ctx, args)
+        if isinstance(cmd, LazyCommand):
+            cmd = cmd.load()
+        return cmd_name, cmd, args
+
+
+def import_object(path: str) -> Any:
+    """Import object from ``'package.module:attribute'`` path.
+
+    Nested attributes may be separated with dots, e.g. ``'module:Class.method'``.
+    """
+    module_name, attrs = _split_import_path(path)
+    obj = import_module(module_name)
+    for attr in attrs.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _split_import_path(path: str) -> tuple[str, str]:
+    module_name, _, attrs = path.partition(":")
+    if not module_name or not attrs:
+        errmsg = f"invalid import path '{path}', expected 'package.module:attribute'"
+        raise ValueError(errmsg)
+    return module_name, attrs
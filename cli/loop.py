@@ -0,0 +1,119 @@
+"""Shared event loop running coroutines of asynchronous commands.
+
+All invocations in a process (including batch workers and daemon requests)
+share one event loop running in a background thread. Coroutines are
+scheduled from the invoking threads, so I/O-bound commands invoked
+concurrently overlap, and no invocation pays for setting up a new loop.
+Context variables of the invoking thread are propagated to the coroutines
+and the current :mod:`click` context of the invoking thread is the current
+context while the coroutines run. Asynchronous commands called from running
+coroutines (e.g. by commands of derived classes) return awaitables
+of their validated calls instead of waiting for them.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import types
+from collections.abc import Coroutine, Generator
+from typing import Any, TypeVar
+
+__all__ = ("get_loop", "run_coroutine")
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared event loop (started on first use)."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="cli-event-loop", daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coroutine on the shared event loop and wait for the result."""
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        errmsg = "cannot wait for a command coroutine in the shared event loop"
+        raise RuntimeError(errmsg)
+    import click
+
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        coro = _run_in_context(coro, ctx)
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+async def _run_in_context(coro: Coroutine[Any, Any, T], ctx: Any) -> T:
+    return await _stepped_in_context(coro, ctx)
+
+
+@types.coroutine
+def _stepped_in_context(
+    coro: Coroutine[Any, Any, T], ctx: Any
+) -> Generator[Any, Any, T]:
+    # Coroutines of many invocations are interleaved in the loop thread,
+    # so the context is pushed on the (thread-local) stack of 'click'
+    # for every step of the coroutine and not for its whole run
+    from click.globals import pop_context, push_context
+
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        push_context(ctx)
+        try:
+            future = coro.send(value) if error is None else coro.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            pop_context()
+        try:
+            value, error = (yield future), None
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as exc:
+            value, error = None, exc
+
+
+@atexit.register
+def _shutdown() -> None:
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None or thread is None:
+        return
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+def _reset_after_fork() -> None:
+    # The loop thread does not exist in child processes
+    global _loop, _thread
+    _loop = _thread = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,14 +1,46 @@
 # ruff: noqa: UP007
 # pyright: reportArgumentType=false
 # mypy: disable-error-code="assignment"
-from collections.abc import Callable
+import shlex
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from copy import copy
+from functools import partial
+from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
+from weakref import WeakKeyDictionary
 
+import click
 from typer import Context, Exit, Typer  # noqa
-from typer.models import CommandFunctionType, DefaultPlaceholder
+from typer.core import TyperGroup
+from typer.main import (
+    _typer_developer_exception_attr_name,
+    except_hook,
+    get_command,
+    get_command_from_info,
+    get_group_from_info,
+    get_install_completion_arguments,
+)
+from typer.models import (
+    CommandFunctionType,
+    CommandInfo,
+    DefaultPlaceholder,
+    DeveloperExceptionConfig,
+    TyperInfo,
+)
 
+from .batch import ExecutorType, batch_options, run_batch
 from .commands import CommandDescriptor
+from .lazy import LazyCommand, LazyGroup, _split_import_path
+from .output import OutputFormat, output_option, rendering
+from .resources import Resources
+from .runner import Result, invoke
+from .timings import TimedContext, TimingHook, timings_option
+
+if TYPE_CHECKING:
+    from .cache import ResultCache
 
 __all__ = ("CLI",)
 
@@ -19,6 +51,42 @@ class CLI(Typer):
     This is a simple wrapper around :class:`typer.Typer`,
     which provides an extra method for registering commands
     defined in submodules.
+
+    Commands and sub-applications may be also registered lazily
+    with :meth:`add_lazy_command` and :meth:`add_lazy_typer`,
+    in which case modules defining them are imported only when
+    they are actually dispatched.
+
+    With ``batch=True`` the root command gets ``--batch``, ``--jobs``
+    and ``--executor`` options running many command lines in one process
+    or a pool of workers (see :mod:`cli.batch`).
+
+    With ``timings=True`` the root command gets ``--timings`` option printing
+    timings of phases of invocations. Timings may be also passed to hooks
+    registered with :meth:`add_timing_hook` (see :mod:`cli.timings`).
+
+    With ``output=True`` the root command gets ``--output`` option rendering
+    values returned by commands (including generators) as JSON, JSON lines
+    or raw text (see :mod:`cli.output`). When a format is passed instead,
+    values are rendered in it unless another one is selected with the option.
+
+    With ``args_from=True`` arguments are also read from response files
+    given as ``@FILE`` and from files or standard input given with
+    ``--args-from`` option of the root command, so command lines are not
+    limited by the operating system. Commands and groups of such applications
+    are created with classes parsing long command lines in linear time
+    (see :mod:`cli.argv`).
+
+    Commands registered with ``cache=True`` memoize their results on disk
+    and the root command then gets ``--no-cache`` and ``--refresh-cache``
+    options (see :mod:`cli.cache`).
+
+    With ``index=True`` help pages (also with unknown-command errors)
+    and shell completions are served from a persistent metadata index of the program
+    (see :mod:`cli.index` and :mod:`cli.completion`).
+
+    The :mod:`click` command of the application is cached
+    (see :meth:`get_command`), so repeated invocations do not rebuild it.
     """
 
     # ruff: noqa: B008
@@ -28,9 +96,19 @@ class CLI(Typer):
         context_settings: dict[Any, Any] = DefaultPlaceholder(None),
         validate: bool = True,
         allow_pdb: bool = True,
+        batch: bool = False,
+        index: bool = False,
+        timings: bool = False,
+        output: bool | OutputFormat = False,
+        args_from: bool = False,
         **kwargs: Any,
     ) -> None:
         context_settings = context_settings or {}
+        cls = kwargs.get("cls", DefaultPlaceholder(None))
+        if args_from and isinstance(cls, DefaultPlaceholder):
+            from .argv import Group
+
+            kwargs["cls"] = Group
         context_settings["obj"] = SimpleNamespace(**context_settings.get("obj", {}))
         super().__init__(
             *args,
@@ -39,6 +117,174 @@ class CLI(Typer):
         )
         self.validate = validate
         self.allow_pdb = allow_pdb
+        self.batch = batch
+        self.index = index
+        self.timings = timings
+        self.output = output
+        self.args_from = args_from
+        self.timing_hooks: list[TimingHook] = []
+        self.registered_descriptors: list[CommandDescriptor] = []
+        self.lazy_commands: dict[str, LazyCommand] = {}
+        # Files of modules registering commands, tracked by the metadata index
+        self.registering_files: set[str] = set()
+        self.resources = Resources()
+        # Commands built by 'typer' are not reentrant (their callbacks store
+        # arguments in shared dictionaries), so every thread builds its own
+        self._local = threading.local()
+        self._cache_generation = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if sys.excepthook != except_hook:
+            sys.excepthook = except_hook
+        if self.index:
+            from .completion import complete_from_index, get_complete_var
+            from .index import serve_from_index
+
+            argv = kwargs.get("args", args[0] if args else None)
+            prog_name = kwargs.get("prog_name") or click.utils._detect_program_name()
+            complete_var = kwargs.get("complete_var") or get_complete_var(prog_name)
+            complete_from_index(self, prog_name, complete_var)
+            serve_from_index(self, sys.argv[1:] if argv is None else argv, prog_name)
+        try:
+            return self.get_command()(*args, **kwargs)
+        except Exception as e:
+            setattr(
+                e,
+                _typer_developer_exception_attr_name,
+                DeveloperExceptionConfig(
+                    pretty_exceptions_enable=self.pretty_exceptions_enable,
+                    pretty_exceptions_show_locals=self.pretty_exceptions_show_locals,
+                    pretty_exceptions_short=self.pretty_exceptions_short,
+                ),
+            )
+            raise e
+
+    def get_command(self) -> click.Command:
+        """Get :mod:`click` command of the application.
+
+        Applications with lazy commands are always turned into command groups.
+        Global options enabled on the application are added to the root command.
+
+        The command is cached and rebuilt only when commands, callbacks
+        or sub-applications are registered or replaced (also on registered
+        sub-applications) or global options are changed. Rebuilds reuse
+        :mod:`click` commands of unchanged commands, so registering one more
+        command does not rebuild all the others. Use :meth:`clear_command_cache`
+        after modifying registered objects in place.
+
+        Commands are cached per thread, as :mod:`click` commands built
+        by :mod:`typer` cannot be invoked concurrently.
+        """
+        state = self._get_command_state()
+        cached = getattr(self._local, "command", None)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        command = self._build_command()
+        self._local.command = (state, command)
+        return command
+
+    def clear_command_cache(self) -> None:
+        """Clear cached :mod:`click` commands of the application (in all threads)."""
+        self._cache_generation += 1
+
+    def resource(
+        self, func: Optional[Callable[[], Any]] = None, *, name: Optional[str] = None
+    ) -> Any:
+        """Register factory of a shared resource.
+
+        Resources are created on first use, reused by all invocations
+        and injected into commands through parameters with
+        :func:`cli.Resource` defaults. Factories defined as generator
+        functions tear resources down after ``yield``.
+        See :mod:`cli.resources` for details.
+
+        Parameters
+        ----------
+        func
+            Resource factory. The method returns a decorator when ``None``.
+        name
+            Name of the resource. Defaults to the name of the factory.
+        """
+        if func is None:
+            return partial(self.resource, name=name)
+        self.resources.register(name or func.__name__, func)
+        return func
+
+    def add_typer(self, typer_instance: Typer, **kwargs: Any) -> None:
+        """Register sub-application.
+
+        Resources of :class:`CLI` sub-applications fall back to resources
+        of this application. See :meth:`typer.Typer.add_typer` for details.
+        """
+        self.registering_files.add(_get_caller_file())
+        self._link_resources(typer_instance)
+        super().add_typer(typer_instance, **kwargs)
+
+    def add_timing_hook(self, hook: TimingHook) -> TimingHook:
+        """Register hook called with timings of phases of invocations.
+
+        Hooks are called with :class:`cli.timings.Timing` objects
+        and can be also registered using this method as a decorator.
+        See :mod:`cli.timings` for details and built-in hooks.
+        """
+        self.timing_hooks.append(hook)
+        return hook
+
+    def run_batch(
+        self,
+        lines: Iterable[str | Sequence[str]],
+        *,
+        jobs: int = 1,
+        executor: ExecutorType = "thread",
+    ) -> Iterator[Result]:
+        """Run many command lines in the current process or a pool of workers.
+
+        See :func:`cli.batch.run_batch` for details.
+        """
+        return run_batch(self, lines, jobs=jobs, executor=executor)
+
+    def invoke(
+        self,
+        args: str | Sequence[str] = (),
+        *,
+        stdin: bytes | str = b"",
+        env: Optional[Mapping[str, Optional[str]]] = None,
+        prog_name: Optional[str] = None,
+    ) -> Result:
+        """Invoke the application in-process and capture its output.
+
+        Unlike calling the application, this never exits the process
+        and uncaught exceptions are reported in the result. Every call gets
+        a fresh context object (see :meth:`context_obj`) and its own standard
+        streams and environment variables, and every thread invokes its own
+        :mod:`click` command (see :meth:`get_command`), so the application
+        can be invoked from many threads at once, e.g. by services handling
+        requests.
+        See :func:`cli.runner.invoke` for details.
+
+        Parameters
+        ----------
+        args
+            Command line given as a string (split with :func:`shlex.split`)
+            or a sequence of arguments.
+        stdin
+            Data served as the standard input.
+        env
+            Environment variables set for the invocation.
+            Variables with ``None`` values are unset.
+        prog_name
+            Program name used in usage messages.
+        """
+        if isinstance(args, str):
+            args = shlex.split(args)
+        return invoke(
+            self.get_command(),
+            args,
+            stdin=stdin,
+            env=env,
+            prog_name=prog_name,
+            obj=self.context_obj(),
+        )
 
     def command(  # type: ignore
         self,
@@ -46,6 +292,7 @@ class CLI(Typer):
         *,
         validate: Optional[bool] = None,
         allow_pdb: Optional[bool] = None,
+        cache: "bool | ResultCache" = False,
         **kwargs: Any,
     ) -> Callable[[Callable[..., Any]], CommandDescriptor]:
         """Register command.
@@ -60,13 +307,255 @@ class CLI(Typer):
         allow_pdb
             Enable command post-mortem debugging.
             Defaults to ``self.allow_pdb`` when ``None``.
+        cache
+            Memoize results of the command on disk. Settings of the cache
+            may be passed as :class:`cli.cache.ResultCache`.
+            See :mod:`cli.cache` for details.
         **kwargs
             Passed to :meth:`typer.Typer.command`.
         """
         validate = self.validate if validate is None else validate
         allow_pdb = self.allow_pdb if allow_pdb is None else allow_pdb
+        if self.args_from:
+            from .argv import Command
+
+            kwargs.setdefault("cls", Command)
+        self.registering_files.add(_get_caller_file())
         parent_decorator = super().command(name, **kwargs)
-        return self._command(parent_decorator, validate=validate, allow_pdb=allow_pdb)
+        return self._command(
+            parent_decorator, validate=validate, allow_pdb=allow_pdb, cache=cache
+        )
+
+    def context_obj(self) -> SimpleNamespace:
+        """Create context object of a new invocation.
+
+        The object is a copy of the default one
+        defined in ``context_settings["obj"]``.
+        """
+        return SimpleNamespace(**vars(self.info.context_settings["obj"]))
+
+    def serve(self, path: str | Path) -> None:
+        """Serve invocations over a Unix socket from a warm process.
+
+        See :mod:`cli.daemon` for details.
+        """
+        from .daemon import serve
+
+        serve(self, path)
+
+    def add_lazy_command(
+        self,
+        name: str,
+        target: str,
+        *,
+        validate: Optional[bool] = None,
+        allow_pdb: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Register command resolved only when it is dispatched.
+
+        Parameters
+        ----------
+        name
+            Command name.
+        target
+            Import path of the command function
+            in the ``'package.module:attribute'`` format.
+        validate, allow_pdb
+            Same as in :meth:`command`.
+        **kwargs
+            Passed to :meth:`typer.Typer.command`.
+            Help texts are used for command listings without importing the target.
+        """
+        _split_import_path(target)
+        self.registering_files.add(_get_caller_file())
+        validate = self.validate if validate is None else validate
+        allow_pdb = self.allow_pdb if allow_pdb is None else allow_pdb
+        if self.args_from:
+            from .argv import Command
+
+            kwargs.setdefault("cls", Command)
+
+        infos: list[CommandInfo] = []
+
+        def load(func: Callable[..., Any]) -> click.Command:
+            def register(callback: CommandFunctionType) -> CommandFunctionType:
+                infos.append(CommandInfo(name, callback=callback, **kwargs))
+                return callback
+
+            # Commands are registered once, but built in every thread
+            if not infos:
+                self._command(register, validate=validate, allow_pdb=allow_pdb)(func)
+            return get_command_from_info(
+                infos[0],
+                pretty_exceptions_short=self.pretty_exceptions_short,
+                rich_markup_mode=self.rich_markup_mode,
+            )
+
+        self._add_lazy(name, target, load, kwargs)
+
+    def add_lazy_typer(self, target: str, *, name: str, **kwargs: Any) -> None:
+        """Register sub-application resolved only when it is dispatched.
+
+        Parameters
+        ----------
+        target
+            Import path of the :class:`typer.Typer` instance
+            in the ``'package.module:attribute'`` format.
+        name
+            Name of the command group.
+        **kwargs
+            Passed to :meth:`typer.Typer.add_typer`.
+        """
+        _split_import_path(target)
+        self.registering_files.add(_get_caller_file())
+
+        def load(typer_instance: Typer) -> click.Command:
+            if not isinstance(typer_instance, Typer):
+                errmsg = f"'{target}' is not a 'Typer' instance"
+                raise TypeError(errmsg)
+            self._link_resources(typer_instance)
+            return get_group_from_info(
+                TyperInfo(typer_instance, name=name, **kwargs),
+                pretty_exceptions_short=self.pretty_exceptions_short,
+                rich_markup_mode=self.rich_markup_mode,
+            )
+
+        self._add_lazy(name, target, load, kwargs)
+
+    def prebuild_models(self) -> None:
+        """Build validation models of all registered commands ahead of time.
+
+        Commands of sub-applications registered with :meth:`add_typer`
+        are included too.
+        """
+        for descriptor in self.registered_descriptors:
+            if descriptor.validate:
+                descriptor.model  # noqa: B018
+                descriptor.slim_model  # noqa: B018
+        for group in self.registered_groups:
+            if isinstance(group.typer_instance, CLI):
+                group.typer_instance.prebuild_models()
+
+    def _get_command_state(self) -> tuple[Any, ...]:
+        return (
+            self.batch,
+            self.timings,
+            self.output,
+            self.args_from,
+            self._cache_generation,
+            bool(self.timing_hooks),
+            self._add_completion,
+            self.pretty_exceptions_short,
+            self.rich_markup_mode,
+            _get_state(self),
+        )
+
+    def _build_command(self) -> click.Command:
+        if self.lazy_commands or _is_group(self):
+            command: click.Command = self._build_group(TyperInfo(self))
+            if self._add_completion:
+                command.params.extend(get_install_completion_arguments())
+        else:
+            command = get_command(self)
+        if self.batch:
+            command.params.extend(batch_options(self))
+        if self.timings:
+            command.params.append(timings_option())
+        if _has_cached_commands(self):
+            from .cache import cache_options
+
+            command.params.extend(cache_options())
+        if self.output:
+            command.params.append(output_option())
+            default = None if self.output is True else self.output
+            command.invoke = rendering(command.invoke, default)  # type: ignore
+        if self.args_from:
+            from .argv import enable_args_from
+
+            enable_args_from(command)
+        if self.timings or self.timing_hooks:
+            command.context_class = partial(  # type: ignore
+                TimedContext, timing_hooks=self.timing_hooks
+            )
+        return command
+
+    def _get_click_commands(self) -> WeakKeyDictionary[CommandInfo, click.Command]:
+        # Commands of the current thread built with settings of the root application
+        key = (
+            self._cache_generation,
+            self.pretty_exceptions_short,
+            self.rich_markup_mode,
+        )
+        if getattr(self._local, "click_commands_key", None) != key:
+            self._local.click_commands = WeakKeyDictionary()
+            self._local.click_commands_key = key
+        return self._local.click_commands
+
+    def _build_group(self, group_info: TyperInfo) -> TyperGroup:
+        # Same as 'typer.main.get_group_from_info', but commands are reused
+        # from the cache, so only the groups themselves are rebuilt
+        typer_instance = copy(group_info.typer_instance)
+        typer_instance.registered_commands = []  # type: ignore
+        typer_instance.registered_groups = []  # type: ignore
+        shell_info = copy(group_info)
+        shell_info.typer_instance = typer_instance
+        group = get_group_from_info(
+            shell_info,
+            pretty_exceptions_short=self.pretty_exceptions_short,
+            rich_markup_mode=self.rich_markup_mode,
+        )
+        click_commands = self._get_click_commands()
+        commands: dict[str, click.Command] = {}
+        for info in group_info.typer_instance.registered_commands:  # type: ignore
+            command = click_commands.get(info)
+            if command is None:
+                command = click_commands[info] = get_command_from_info(
+                    info,
+                    pretty_exceptions_short=self.pretty_exceptions_short,
+                    rich_markup_mode=self.rich_markup_mode,
+                )
+            if command.name:
+                commands[command.name] = command
+        for sub_info in group_info.typer_instance.registered_groups:  # type: ignore
+            sub_group = self._build_group(sub_info)
+            if sub_group.name:
+                commands[sub_group.name] = sub_group
+        # Lazy commands are added by the group and are overridden by other ones
+        for name, command in group.commands.items():
+            commands.setdefault(name, command)
+        group.commands = commands
+        return group
+
+    def _add_lazy(
+        self,
+        name: str,
+        target: str,
+        loader: Callable[[Any], click.Command],
+        kwargs: dict[str, Any],
+    ) -> None:
+        attrs = {
+            k: v
+            for k in ("help", "short_help", "hidden", "deprecated", "rich_help_panel")
+            if not isinstance(v := kwargs.get(k), DefaultPlaceholder | None)
+        }
+        self.lazy_commands[name] = LazyCommand(name, target, loader, **attrs)
+        group_cls = self.info.cls
+        if isinstance(group_cls, DefaultPlaceholder):
+            group_cls = group_cls.value
+        group_cls = group_cls or TyperGroup
+        if getattr(group_cls, "lazy_commands", None) is not self.lazy_commands:
+            bases = (
+                (group_cls,)
+                if issubclass(group_cls, LazyGroup)
+                else (LazyGroup, group_cls)
+            )
+            namespace = {"lazy_commands": self.lazy_commands}
+            self.info.cls = type(group_cls.__name__, bases, namespace)
+
+    def _link_resources(self, typer_instance: Typer) -> None:
+        if isinstance(typer_instance, CLI) and typer_instance.resources.parent is None:
+            typer_instance.resources.parent = self.resources
 
     def _command(
         self,
@@ -74,6 +563,51 @@ class CLI(Typer):
         **kwds: Any,
     ) -> Callable[[CommandFunctionType], CommandDescriptor]:
         def decorator(func: CommandFunctionType) -> CommandDescriptor:
-            return CommandDescriptor(func, parent_decorator, **kwds)
+            descriptor = CommandDescriptor(
+                func, parent_decorator, resources=self.resources, **kwds
+            )
+            self.registered_descriptors.append(descriptor)
+            return descriptor
 
         return decorator
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _get_caller_file() -> str:
+    # File of the code calling the registering method
+    return sys._getframe(2).f_code.co_filename
+
+
+def _is_group(app: Typer) -> bool:
+    # Same condition as in 'typer.main.get_command'
+    return bool(
+        app.registered_callback
+        or app.info.callback
+        or app.registered_groups
+        or len(app.registered_commands) > 1
+    )
+
+
+def _has_cached_commands(app: Typer) -> bool:
+    descriptors = getattr(app, "registered_descriptors", ())
+    return any(d.cache is not None for d in descriptors) or any(
+        _has_cached_commands(info.typer_instance)  # type: ignore
+        for info in app.registered_groups
+    )
+
+
+def _get_state(app: Typer) -> tuple[Any, ...]:
+    # Registered objects are compared by identity, so the state
+    # changes when any of them is added, removed or replaced
+    return (
+        app.registered_callback,
+        app.info.callback,
+        tuple(app.registered_commands),
+        tuple(
+            (info, _get_state(info.typer_instance))  # type: ignore
+            for info in app.registered_groups
+        ),
+        tuple(getattr(app, "lazy_commands", ())),
+    )
@@ -1,11 +1,13 @@
 # ruff: noqa: UP007
 import typing
 from collections.abc import Callable
-from inspect import signature
+from functools import cache, partial, wraps
+from inspect import Parameter, Signature, signature
 from types import UnionType
 from typing import (  # type: ignore
     Any,
     GenericAlias,  # type: ignore
+    NamedTuple,
     Optional,
     Self,
     TypeAlias,
@@ -32,6 +34,37 @@ _hint_types = [
 ]
 
 _TypeHint: TypeAlias = Union[tuple(_hint_types)]  # type: ignore # noqa
+# Immutable types of default values compared by equality in compact parameters
+_SCALAR_TYPES = (str, int, float, bool, bytes, tuple)
+
+
+class ParamSpec(NamedTuple):
+    """Signature of a callable with default values of its parameters.
+
+    Attributes
+    ----------
+    signature
+        Signature of the callable.
+    defaults
+        Default values of parameters by name
+        (:attr:`inspect.Parameter.empty` for parameters without defaults).
+    """
+
+    signature: Signature
+    defaults: dict[str, Any]
+
+
+@cache
+def get_param_spec(func: Callable[..., Any]) -> ParamSpec:
+    """Get cached parameter spec of a callable.
+
+    This is used for constructors of parameters (and :func:`pydantic.Field`),
+    so their signatures are inspected only once, even when applications
+    create thousands of parameters.
+    """
+    sig = signature(func)
+    defaults = {name: p.default for name, p in sig.parameters.items()}
+    return ParamSpec(sig, defaults)
 
 
 class ParameterInfoExtensionsMixin:
@@ -40,7 +73,7 @@ class ParameterInfoExtensionsMixin:
     def __call__(self, *args: Any, **kwargs: Any) -> ParameterInfo:
         typ = typing.cast(type[ParameterInfo], type(self))
         constructor = Argument if issubclass(typ, _ArgumentInfo) else Option
-        sig = signature(typing.cast(Callable, constructor))
+        sig = get_param_spec(typing.cast(Callable, constructor)).signature
         all_args = match_signature(sig, *args, **kwargs)
         attrs = {attr: getattr(self, attr) for attr in sig.parameters}
         new_param = typ(**{**attrs, **all_args})  # type: ignore
@@ -62,19 +95,72 @@ class ParameterInfoExtensionsMixin:
                 f"'{param.__class__.__name__}' instance"
             )
             raise TypeError(errmsg)
-        sig = signature(cls)
-        kwds = {attr: getattr(param, attr) for attr in sig.parameters}
+        kwds = {attr: getattr(param, attr) for attr in get_param_spec(cls).defaults}
         return cls(**kwds)
 
-    def validator(self, callback: Callable[..., Any]) -> Callable[..., Any]:
-        """Register validator function on the parameter."""
-        self.callback: Optional[Callable[..., Any]] = callback
+    def validator(
+        self, callback: Optional[Callable[..., Any]] = None, *, compiled: bool = False
+    ) -> Any:
+        """Register validator function on the parameter.
+
+        By default the validator is a :mod:`click` callback run during parsing.
+        With ``compiled=True`` it is instead compiled into validation models
+        of commands as an ``after`` field validator taking the validated value,
+        so all arguments are validated in a single :mod:`pydantic` pass
+        and errors are reported for the parameter in validation errors.
+        Compiled validators require commands with enabled validation.
+
+        Without a callback it returns a decorator,
+        e.g. ``@param.validator(compiled=True)``.
+        """
+        if callback is None:
+            return partial(self.validator, compiled=compiled)
+        if compiled:
+            self._validator: Optional[Callable[..., Any]] = callback
+            self.callback: Optional[Callable[..., Any]] = None
+        else:
+            self._validator = None
+            self.callback = callback
         return callback
 
+    def _compact(self) -> None:
+        # Attributes with default values are looked up in the class,
+        # so instances store only explicitly set attributes
+        defaults = get_param_spec(type(self)).defaults
+        empty = Parameter.empty
+        self.__dict__ = {
+            name: value
+            for name, value in self.__dict__.items()
+            if (default := defaults.get(name, empty)) is not value
+            and not (
+                type(value) is type(default)
+                and isinstance(default, _SCALAR_TYPES)
+                and value == default
+            )
+        }
+
 
 class ArgumentInfo(_ArgumentInfo, ParameterInfoExtensionsMixin):
-    pass
+    """Argument info storing only attributes with non-default values."""
+
+    @wraps(_ArgumentInfo.__init__)
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._compact()
 
 
 class OptionInfo(_OptionInfo, ParameterInfoExtensionsMixin):
-    pass
+    """Option info storing only attributes with non-default values."""
+
+    @wraps(_OptionInfo.__init__)
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._compact()
+
+
+# Default values of attributes of compact parameters
+for _cls in (ArgumentInfo, OptionInfo):
+    for _name, _default in get_param_spec(_cls).defaults.items():
+        if _default is not Parameter.empty:
+            setattr(_cls, _name, _default)
+del _cls, _name, _default
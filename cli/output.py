@@ -0,0 +1,141 @@
+"""Structured output of values returned by commands.
+
+Applications created with ``output=True`` (or a default format) get
+the ``--output`` option rendering values returned by commands
+to the standard output in one of the formats:
+
+``json``
+    Single JSON document. Iterators (e.g. generators) are written
+    as JSON arrays with items serialized as they are produced.
+``jsonl``
+    One JSON document per line. Lists, tuples, sets and iterators
+    are written item by item.
+``raw``
+    Strings and bytes are written as they are and other values as their
+    :class:`str`, one per line. Collections are written item by item.
+
+Values are serialized with the :mod:`pydantic` serializer, so models,
+dataclasses, dates, paths etc. are supported, and written to the buffered
+binary standard output. Values of unknown types are serialized
+as strings. ``None`` is not rendered, so commands without
+return values do not write anything.
+"""
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial, wraps
+from typing import Any, BinaryIO, Literal, get_args
+
+import click
+
+__all__ = ("OutputFormat", "output_option", "render", "rendering")
+
+OutputFormat = Literal["json", "jsonl", "raw"]
+FORMATS: tuple[str, ...] = get_args(OutputFormat)
+
+
+def render(value: Any, fmt: OutputFormat, stream: BinaryIO | None = None) -> None:
+    """Render value in a format to a binary stream.
+
+    Parameters
+    ----------
+    value
+        Value to render.
+    fmt
+        Output format.
+    stream
+        Binary stream. Defaults to the binary standard output.
+    """
+    if fmt not in FORMATS:
+        errmsg = f"unknown output format '{fmt}', expected one of {FORMATS}"
+        raise ValueError(errmsg)
+    if value is None:
+        return
+    if stream is None:
+        stream = click.get_binary_stream("stdout")
+        write = partial(_write_after_text, stream)
+    else:
+        write = stream.write
+    if fmt == "json":
+        if isinstance(value, Iterator):
+            write(b"[")
+            for i, item in enumerate(value):
+                write(b"," + _dump(item) if i else _dump(item))
+            write(b"]\n")
+        else:
+            write(_dump(value) + b"\n")
+    else:
+        dump = _dump if fmt == "jsonl" else _dump_raw
+        for item in _iter_items(value):
+            write(dump(item) + b"\n")
+    stream.flush()
+
+
+def rendering(
+    invoke: Callable[[click.Context], Any], default: OutputFormat | None = None
+) -> Callable[[click.Context], Any]:
+    """Wrap :meth:`click.Command.invoke` of a root command to render its results.
+
+    Results are rendered in the format selected with the ``--output``
+    option (see :func:`output_option`) or the default one.
+    The wrapped method returns results unchanged, unless they
+    are iterators, which are exhausted by rendering.
+    """
+
+    @wraps(invoke)
+    def wrapped(ctx: click.Context) -> Any:
+        value = invoke(ctx)
+        fmt = ctx.meta.get("cli.output", default)
+        if fmt is not None:
+            render(value, fmt)
+        return value
+
+    return wrapped
+
+
+def output_option() -> click.Option:
+    """Create ``--output`` option selecting format of rendered results."""
+
+    def callback(ctx: click.Context, _: click.Parameter, value: str | None) -> None:
+        if value is not None:
+            ctx.find_root().meta["cli.output"] = value
+
+    return click.Option(
+        ["--output"],
+        type=click.Choice(FORMATS),
+        is_eager=True,
+        expose_value=False,
+        callback=callback,
+        help="Render values returned by commands in a format.",
+    )
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _dump(value: Any) -> bytes:
+    # Same serializer as in 'TypeAdapter.dump_json', which inspects types
+    # of values at runtime when serializing 'Any', but without building
+    # an adapter and with support for values of unknown types
+    from pydantic_core import to_json
+
+    return to_json(value, serialize_unknown=True)
+
+
+def _write_after_text(stream: BinaryIO, data: bytes) -> None:
+    # Text printed by commands (also while iterators are rendered)
+    # must be written first
+    sys.stdout.flush()
+    stream.write(data)
+
+
+def _dump_raw(value: Any) -> bytes:
+    if isinstance(value, bytes | bytearray | memoryview):
+        return bytes(value)
+    return str(value).encode()
+
+
+def _iter_items(value: Any) -> Iterable[Any]:
+    if isinstance(value, list | tuple | set | frozenset | Iterator):
+        return value
+    return (value,)
@@ -1,17 +1,23 @@
 # ruff: noqa: UP007
-from collections.abc import Callable
+import warnings
+from collections.abc import Callable, Iterable, Iterator
 from functools import wraps
-from inspect import signature
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Annotated, Any, Generic, Literal, Optional, TypeVar
 
-from pydantic import Field
 from typer.models import ParameterInfo
 from typer.params import Argument as TyperArgument
 from typer.params import Option as TyperOption
 
-from .models import ArgumentInfo, OptionInfo, _TypeHint
+from .models import ArgumentInfo, OptionInfo, _TypeHint, get_param_spec
 
-__all__ = ("Argument", "Option", "Parse")
+if TYPE_CHECKING:
+    from pydantic import GetCoreSchemaHandler, TypeAdapter
+    from pydantic_core import CoreSchema
+
+__all__ = ("Argument", "Option", "Parse", "Stream")
+
+T = TypeVar("T")
+StreamErrors = Literal["raise", "skip", "warn"]
 
 
 class Parse:
@@ -30,6 +36,66 @@ class Parse:
         return f"{self.__class__.__name__}({self.ann})"
 
 
+class Stream(Iterator[T], Generic[T]):
+    """Lazily validated stream of items.
+
+    Use it as a parse type, e.g. ``Parse(Stream[Json])``, to get an iterator
+    validating input items (such as lines of a file or standard input)
+    one at a time, so memory use does not grow with the size of the input.
+    The policy for invalid items is given as the second type argument:
+
+    ``'raise'`` (default)
+        Raise :class:`pydantic.ValidationError` with the item index
+        prepended to error locations.
+    ``'skip'``
+        Silently skip invalid items.
+    ``'warn'``
+        Skip invalid items with a warning.
+
+    Examples
+    --------
+    >>> from pydantic import TypeAdapter
+    >>> adapter = TypeAdapter(Stream[int, "skip"])
+    >>> list(adapter.validate_python(["1", "x", "3"]))
+    [1, 3]
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        adapter: "TypeAdapter[T]",
+        errors: StreamErrors = "raise",
+    ) -> None:
+        self.items = iter(items)
+        self.adapter = adapter
+        self.errors = errors
+        self._index = 0
+
+    def __class_getitem__(cls, params: Any) -> Any:
+        item_type, errors = params if isinstance(params, tuple) else (params, "raise")
+        if errors not in ("raise", "skip", "warn"):
+            errmsg = f"invalid stream error policy '{errors}'"
+            raise ValueError(errmsg)
+        return Annotated[cls, _StreamSchema(item_type, errors)]
+
+    def __next__(self) -> T:
+        from pydantic import ValidationError
+
+        for item in self.items:
+            index = self._index
+            self._index += 1
+            try:
+                return self.adapter.validate_python(item)
+            except ValidationError as exc:
+                if self.errors == "raise":
+                    raise _prepend_loc(exc, index) from None
+                if self.errors == "warn":
+                    warnings.warn(
+                        f"skipping invalid stream item {index}: {exc}", stacklevel=2
+                    )
+        raise StopIteration
+
+
 @wraps(TyperArgument)
 def Argument(
     default: Optional[Any] = Ellipsis,
@@ -38,8 +104,8 @@ def Argument(
     **kwargs: Any,
 ) -> ArgumentInfo:
     arg_kwargs, field_kwargs = _separate_kwargs(TyperArgument, **kwargs)
-    arg = TyperArgument(default, **arg_kwargs)
-    arg = ArgumentInfo.from_param(arg)
+    # Same as 'typer.Argument', but without an intermediate object
+    arg = ArgumentInfo(default=default, **arg_kwargs)
     arg.field_kwargs = field_kwargs  # type: ignore
     arg.annotation = annotation  # type: ignore
     return arg
@@ -53,8 +119,8 @@ def Option(
     **kwargs: Any,
 ) -> OptionInfo:
     opt_kwargs, field_kwargs = _separate_kwargs(TyperOption, **kwargs)
-    opt = TyperOption(default, *param_decls, **opt_kwargs)
-    opt = OptionInfo.from_param(opt)
+    # Same as 'typer.Option', but without an intermediate object
+    opt = OptionInfo(default=default, param_decls=param_decls, **opt_kwargs)
     opt.field_kwargs = field_kwargs  # type: ignore
     opt.annotation = annotation  # type: ignore
     return opt
@@ -63,12 +129,60 @@ def Option(
 # Internals ----------------------------------------------------------------------------
 
 
+class _StreamSchema:
+    """Validation schema of :class:`Stream` fields."""
+
+    def __init__(self, item_type: _TypeHint, errors: StreamErrors) -> None:
+        self.item_type = item_type
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"Stream[{self.item_type}, {self.errors!r}]"
+
+    def __get_pydantic_core_schema__(
+        self, source: Any, handler: "GetCoreSchemaHandler"
+    ) -> "CoreSchema":
+        from pydantic import ConfigDict, TypeAdapter
+        from pydantic_core import core_schema
+
+        adapter = TypeAdapter(
+            self.item_type, config=ConfigDict(arbitrary_types_allowed=True)
+        )
+
+        def validate(items: Any) -> Stream:
+            return Stream(items, adapter, self.errors)
+
+        return core_schema.no_info_after_validator_function(
+            validate, core_schema.is_instance_schema(Iterable)
+        )
+
+
+def _prepend_loc(exc: Any, index: int) -> Any:
+    from pydantic import ValidationError
+
+    line_errors = [
+        {
+            "type": err["type"],
+            "loc": (index, *err["loc"]),
+            "input": err["input"],
+            **({"ctx": err["ctx"]} if "ctx" in err else {}),
+        }
+        for err in exc.errors()
+    ]
+    return ValidationError.from_exception_data(exc.title, line_errors)
+
+
 def _separate_kwargs(
     param_func: Callable[..., ParameterInfo], **kwargs: Any
 ) -> tuple[dict[str, Any], dict[str, Any]]:
-    param_params = list(signature(param_func).parameters)
-    field_params = list(signature(Field).parameters)
-    field_kwargs = {k: v for k, v in kwargs.items() if k in field_params}
+    param_params = get_param_spec(param_func).defaults
+    field_kwargs = {}
+    if any(k not in param_params for k in kwargs):
+        # 'pydantic' is imported only when field arguments are actually used
+        from pydantic.fields import Field
+
+        field_params = get_param_spec(Field).defaults
+        field_kwargs = {k: v for k, v in kwargs.items() if k in field_params}
     param_kwargs = {k: v for k, v in kwargs.items() if k in param_params}
     allowed_kwargs = {*field_kwargs, *param_params}
     for key in kwargs:
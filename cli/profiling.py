@@ -0,0 +1,212 @@
+"""On-demand profiling of commands.
+
+Profiling is enabled per invocation through the object of the root
+context (see :func:`cli.utils.profile_callback`) and applied by the same
+wrappers which start post-mortem debugger sessions, so commands
+are profiled without editing their code. Profiles cover validation
+of arguments and the command itself.
+
+CPU profiles are collected with :mod:`cProfile` and written as ``pstats``
+files or text reports and, optionally, as collapsed stacks which can
+be rendered as flame graphs (e.g. with ``flamegraph.pl`` or ``speedscope``).
+Memory profiles are collected with :mod:`tracemalloc` and written as reports
+of peak memory usage and top allocation sites of memory retained by commands.
+Reports are written to standard error when the output path is ``-``.
+"""
+
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pstats
+    import tracemalloc
+
+__all__ = ("Profile", "get_profile", "enable")
+
+# Number of root contexts with profiling enabled. It allows wrappers
+# to skip looking up the current context when profiling is not used.
+_active = 0
+_lock = threading.Lock()
+
+
+@dataclass
+class Profile:
+    """Profiling settings of an invocation.
+
+    Attributes
+    ----------
+    cpu
+        Output path of the :mod:`cProfile` profile.
+        It is written as a ``pstats`` file or as a text report
+        of top functions when the path is ``-`` (standard error).
+    memory
+        Output path of the report of peak memory usage
+        and top allocation sites of retained memory.
+    collapsed
+        Output path of collapsed stacks of the CPU profile.
+    limit
+        Number of entries in text reports.
+    """
+
+    cpu: str | None = None
+    memory: str | None = None
+    collapsed: str | None = None
+    limit: int = 25
+    running: bool = False
+
+    def run(self, func: Callable[..., Any], /, *args: Any, **kwds: Any) -> Any:
+        """Run function under enabled profilers and write their outputs.
+
+        Nested calls (e.g. of commands calling other commands)
+        are run as they are and are included in the outer profile.
+        """
+        if self.running:
+            return func(*args, **kwds)
+        import cProfile
+        import tracemalloc
+
+        profiler = cProfile.Profile() if self.cpu or self.collapsed else None
+        trace_memory = self.memory is not None and not tracemalloc.is_tracing()
+        self.running = True
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            if profiler is None:
+                return func(*args, **kwds)
+            return profiler.runcall(func, *args, **kwds)
+        finally:
+            self.running = False
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self._write_memory(snapshot, peak)
+            if profiler is not None:
+                self._write_cpu(profiler)
+
+    def _write_cpu(self, profiler: Any) -> None:
+        import pstats
+
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        if self.cpu == "-":
+            stats.sort_stats("cumulative").print_stats(self.limit)
+        elif self.cpu:
+            stats.dump_stats(self.cpu)
+        if self.collapsed:
+            lines = [
+                f"{stack} {round(t * 1e6)}"
+                for stack, t in _collapse(stats).items()
+                if round(t * 1e6) > 0
+            ]
+            _write(self.collapsed, "".join(f"{line}\n" for line in lines))
+
+    def _write_memory(self, snapshot: "tracemalloc.Snapshot", peak: int) -> None:
+        import tracemalloc
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        stats = snapshot.statistics("lineno")
+        total = sum(s.size for s in stats)
+        lines = [
+            f"Peak memory: {_format_size(peak)}",
+            f"Top {min(self.limit, len(stats))} of {len(stats)} allocation sites "
+            f"({_format_size(total)} retained):",
+        ]
+        for i, stat in enumerate(stats[: self.limit], start=1):
+            frame = stat.traceback[0]
+            lines.append(
+                f"{i:>4}. {frame.filename}:{frame.lineno}: "
+                f"{_format_size(stat.size)} in {stat.count} blocks"
+            )
+        _write(self.memory, "".join(f"{line}\n" for line in lines))  # type: ignore
+
+
+def get_profile() -> Profile | None:
+    """Get profiling settings of the current invocation."""
+    import click
+
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    return getattr(ctx.find_root().obj, "profile", None)
+
+
+def enable(ctx: Any, profile: Profile) -> None:
+    """Enable profiling of commands invoked within the root context."""
+    global _active
+
+    def disable() -> None:
+        global _active
+        with _lock:
+            _active -= 1
+
+    root = ctx.find_root()
+    root.obj.profile = profile
+    with _lock:
+        _active += 1
+    root.call_on_close(disable)
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _write(path: str, text: str) -> None:
+    if path == "-":
+        sys.stderr.write(text)
+        sys.stderr.flush()
+    else:
+        with open(path, "w") as stream:  # noqa: PTH123
+            stream.write(text)
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-in functions
+        return name.replace(";", ",")
+    return f"{name} ({filename}:{lineno})".replace(";", ",")
+
+
+def _collapse(stats: "pstats.Stats") -> dict[str, float]:
+    # Stacks are reconstructed from the call graph, so time of functions
+    # called from many places is split between their callers in proportion
+    # to time spent in calls from each of them.
+    entries = stats.stats  # type: ignore
+    callees: dict[Any, dict[Any, float]] = {}
+    for func, (*_, callers) in entries.items():
+        for caller, (*_, cumulative) in callers.items():
+            callees.setdefault(caller, {})[func] = cumulative
+    folded: dict[str, float] = {}
+
+    def walk(func: Any, stack: tuple[str, ...], seen: frozenset, share: float) -> None:
+        _, _, self_time, _, _ = entries[func]
+        stack = (*stack, _label(func))
+        key = ";".join(stack)
+        folded[key] = folded.get(key, 0.0) + self_time * share
+        for callee, cumulative in callees.get(func, {}).items():
+            total = entries[callee][3]
+            # Paths below the resolution of reported times are dropped
+            if callee in seen or not total or share * cumulative < 1e-6:
+                continue
+            walk(callee, stack, seen | {callee}, share * cumulative / total)
+
+    for func, (*_, callers) in entries.items():
+        if not callers:
+            walk(func, (), frozenset({func}), 1.0)
+    return folded
@@ -0,0 +1,175 @@
+"""Shared resources lazily created on first use.
+
+Resources, e.g. database connection pools, HTTP sessions or loaded models,
+are registered on applications with :meth:`cli.CLI.resource` and injected
+into commands through parameters with :func:`Resource` defaults.
+Such parameters are not exposed on the command line.
+
+Resources are created on first use and then reused by all invocations
+in the process, including batch runs, daemons and embedding code.
+Factories defined as generator functions set resources up before
+the first ``yield`` and tear them down after it, which happens
+in the reverse order of creation when :meth:`Resources.close`
+is called or at interpreter exit.
+
+>>> from cli import CLI, Resource
+>>> from cli.testing import CliRunner
+>>> app = CLI(output="raw")
+>>> @app.resource
+... def numbers():
+...     print("setup")
+...     yield [1, 2, 3]
+...     print("teardown")
+>>> @app.command()
+... def total(scale: int = 1, numbers: list[int] = Resource()) -> int:
+...     return scale * sum(numbers)
+>>> runner = CliRunner()
+>>> print(runner.invoke(app, "--scale 2").output, end="")
+setup
+12
+>>> print(runner.invoke(app, "--scale 3").output, end="")
+18
+>>> app.resources.close()
+teardown
+
+Resources of applications added with :meth:`typer.Typer.add_typer`
+fall back to resources of their parent applications. Processes forked
+by process pools do not reuse resources created in their parents,
+but create their own ones.
+"""
+
+import atexit
+import os
+import threading
+from collections.abc import Callable, Generator
+from inspect import isgenerator
+from typing import Any, NamedTuple
+from weakref import WeakSet
+
+__all__ = ("Resource", "ResourceInfo", "Resources")
+
+
+class ResourceInfo(NamedTuple):
+    """Marker of parameters receiving resources.
+
+    Attributes
+    ----------
+    name
+        Name of the resource or ``None`` for the name of the parameter.
+    """
+
+    name: str | None = None
+
+
+def Resource(name: str | None = None) -> Any:
+    """Declare parameter receiving a resource.
+
+    Parameters
+    ----------
+    name
+        Name of the resource. Defaults to the name of the parameter.
+    """
+    return ResourceInfo(name)
+
+
+class Resources:
+    """Registry of resource factories and created resources.
+
+    Attributes
+    ----------
+    factories
+        Resource factories by names.
+    parent
+        Registry used for resources not registered in this one.
+    """
+
+    def __init__(self, parent: "Resources | None" = None) -> None:
+        self.factories: dict[str, Callable[[], Any]] = {}
+        self.parent = parent
+        self._instances: dict[str, Any] = {}
+        self._generators: list[Generator[Any, None, None]] = []
+        self._lock = threading.RLock()
+        self._atexit = False
+        _registries.add(self)
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Register resource factory.
+
+        Already created resource with the same name is kept
+        until the registry is closed.
+        """
+        self.factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """Get resource and create it on first use."""
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        if name not in self.factories:
+            if self.parent is not None:
+                return self.parent.get(name)
+            errmsg = f"unknown resource '{name}'"
+            raise LookupError(errmsg)
+        with self._lock:
+            # Created by another thread in the meantime
+            if name in self._instances:
+                return self._instances[name]
+            value = self.factories[name]()
+            if isgenerator(value):
+                generator = value
+                value = next(generator)
+                self._generators.append(generator)
+            if not self._atexit:
+                self._atexit = True
+                atexit.register(self.close)
+            self._instances[name] = value
+            return value
+
+    def close(self) -> None:
+        """Tear down created resources in the reverse order of creation.
+
+        Resources are created again when they are used after closing.
+        The first error raised by teardowns is re-raised after
+        all resources are torn down.
+        """
+        with self._lock:
+            generators = self._generators[::-1]
+            self._instances.clear()
+            self._generators.clear()
+            if self._atexit:
+                self._atexit = False
+                atexit.unregister(self.close)
+        error = None
+        for generator in generators:
+            try:
+                next(generator)
+            except StopIteration:
+                pass
+            except Exception as exc:
+                error = error or exc
+            else:
+                generator.close()
+                error = error or RuntimeError("resource factory yielded twice")
+        if error is not None:
+            raise error
+
+    def _reset(self) -> None:
+        # Resources of parent processes are not torn down in children
+        self._instances.clear()
+        self._generators.clear()
+        self._lock = threading.RLock()
+
+
+# Internals ----------------------------------------------------------------------------
+
+_registries: "WeakSet[Resources]" = WeakSet()
+
+
+def _after_fork() -> None:
+    for registry in list(_registries):
+        registry._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,310 @@
+"""In-process invocation of commands with captured input and output.
+
+Standard streams are captured per invocation using context variables,
+so captures in different threads (or :mod:`asyncio` tasks) do not interfere.
+While any capture is active, :data:`sys.stdin`, :data:`sys.stdout`
+and :data:`sys.stderr` are replaced with proxies routing reads and writes
+to the streams of the current capture (or the original streams otherwise).
+Environment variables set for invocations with :func:`environment`
+are routed the same way through a proxy of :data:`os.environ`, which
+is installed only while any such environment is set.
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import traceback
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import click
+
+__all__ = ("Result", "capture", "environment", "invoke")
+
+
+@dataclass
+class Result:
+    """Result of an in-process command invocation.
+
+    Attributes
+    ----------
+    exit_code
+        Exit code of the command.
+    stdout
+        Captured standard output.
+    stderr
+        Captured standard error.
+    exception
+        Uncaught exception raised by the command (if any).
+    error
+        Structured description of the uncaught exception with its
+        ``type``, ``message`` and, for :class:`pydantic.ValidationError`,
+        the list of validation ``errors``. Unlike the exception itself,
+        it can be always pickled or serialized to JSON.
+    """
+
+    exit_code: int
+    stdout: bytes = b""
+    stderr: bytes = b""
+    exception: BaseException | None = None
+    error: dict[str, Any] | None = None
+
+    @property
+    def output(self) -> str:
+        """Decoded standard output."""
+        return self.stdout.decode()
+
+
+@contextmanager
+def capture(stdin: bytes | None = b"") -> Iterator[tuple[io.BytesIO, io.BytesIO]]:
+    """Capture standard streams in the current context.
+
+    Parameters
+    ----------
+    stdin
+        Data served as the standard input.
+        The current standard input is kept when ``None``.
+
+    Yields
+    ------
+    stdout, stderr
+        Binary buffers with the captured output.
+    """
+    stdout, stderr = io.BytesIO(), io.BytesIO()
+    streams = [
+        io.TextIOWrapper(stdout, encoding="utf-8", write_through=True),
+        io.TextIOWrapper(stderr, encoding="utf-8", write_through=True),
+    ]
+    variables = list(_streams[1:])
+    if stdin is not None:
+        streams.insert(0, io.TextIOWrapper(io.BytesIO(stdin), encoding="utf-8"))
+        variables.insert(0, _streams[0])
+    tokens = [var.set(stream) for var, stream in zip(variables, streams, strict=True)]
+    _install_stream_proxies()
+    try:
+        yield stdout, stderr
+    finally:
+        for var, token, stream in zip(variables, tokens, streams, strict=True):
+            var.reset(token)
+            stream.flush()
+            # Detach so that garbage collection does not close the buffers
+            stream.detach()
+        _uninstall_stream_proxies()
+
+
+@contextmanager
+def environment(env: Mapping[str, str | None]) -> Iterator[MutableMapping[str, str]]:
+    """Set environment variables in the current context.
+
+    Variables are seen through :data:`os.environ` (and :func:`os.getenv`)
+    only in the current context, so the environment of the process
+    and of other threads is not changed. Changes made within the context
+    are discarded at exit. Subprocesses started without an explicit
+    environment inherit the environment of the process.
+
+    Parameters
+    ----------
+    env
+        Variables to set. Variables with ``None`` values are unset.
+
+    Yields
+    ------
+    environ
+        Environment of the current context.
+    """
+    environ = dict(os.environ)
+    for key, value in env.items():
+        if value is None:
+            environ.pop(key, None)
+        else:
+            environ[key] = value
+    token = _environ.set(environ)
+    _install_environ_proxy()
+    try:
+        yield environ
+    finally:
+        _environ.reset(token)
+        _uninstall_environ_proxy()
+
+
+def invoke(
+    command: "click.Command",
+    args: Sequence[str],
+    *,
+    stdin: bytes | str = b"",
+    env: Mapping[str, str | None] | None = None,
+    prog_name: str | None = None,
+    **extra: Any,
+) -> Result:
+    """Invoke :mod:`click` command in-process with captured streams.
+
+    Parameters
+    ----------
+    command
+        Command to invoke.
+    args
+        Command-line arguments.
+    stdin
+        Data served as the standard input.
+    env
+        Environment variables set for the invocation (see :func:`environment`).
+    prog_name
+        Program name used in usage messages.
+    **extra
+        Passed to :meth:`click.Command.main` and then to the context,
+        e.g. ``obj``.
+    """
+    if isinstance(stdin, str):
+        stdin = stdin.encode()
+    with ExitStack() as stack:
+        if env is not None:
+            stack.enter_context(environment(env))
+        return _invoke(command, args, stdin, prog_name, extra)
+
+
+# Internals ----------------------------------------------------------------------------
+
+
+def _invoke(
+    command: "click.Command",
+    args: Sequence[str],
+    stdin: bytes,
+    prog_name: str | None,
+    extra: dict[str, Any],
+) -> Result:
+    exit_code, exception, error = 0, None, None
+    with capture(stdin) as (stdout, stderr):
+        try:
+            command.main(list(args), prog_name=prog_name, standalone_mode=True, **extra)
+        except SystemExit as exc:
+            exit_code = _get_exit_code(exc)
+        except Exception as exc:
+            exit_code, exception, error = 1, exc, _describe_exception(exc)
+            traceback.print_exception(exc)
+    return Result(exit_code, stdout.getvalue(), stderr.getvalue(), exception, error)
+
+
+_streams: tuple[ContextVar[IO[str] | None], ...] = tuple(
+    ContextVar(f"cli_{name}", default=None) for name in ("stdin", "stdout", "stderr")
+)
+_stream_names = ("stdin", "stdout", "stderr")
+_environ: ContextVar[dict[str, str] | None] = ContextVar("cli_environ", default=None)
+_proxies_lock = threading.Lock()
+_proxies_counts = {"streams": 0, "environ": 0}
+
+
+class _StreamProxy:
+    """Proxy of a standard stream routing to the stream of the current capture."""
+
+    def __init__(self, original: IO[str], var: ContextVar[IO[str] | None]) -> None:
+        self._original = original
+        self._var = var
+
+    @property
+    def _stream(self) -> IO[str]:
+        stream = self._var.get()
+        return self._original if stream is None else stream
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._stream, attr)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._stream)
+
+    def __next__(self) -> str:
+        return next(self._stream)
+
+
+class _EnvironProxy(MutableMapping[str, str]):
+    """Proxy of :data:`os.environ` routing to the environment of the current context."""
+
+    def __init__(self, original: MutableMapping[str, str]) -> None:
+        self._original = original
+
+    @property
+    def _environ(self) -> MutableMapping[str, str]:
+        environ = _environ.get()
+        return self._original if environ is None else environ
+
+    def __getitem__(self, key: str) -> str:
+        return self._environ[key]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._environ[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._environ[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._environ)
+
+    def __len__(self) -> int:
+        return len(self._environ)
+
+    def __repr__(self) -> str:
+        return repr(self._environ)
+
+    def copy(self) -> dict[str, str]:
+        return dict(self._environ)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._original, attr)
+
+
+def _install_stream_proxies() -> None:
+    with _proxies_lock:
+        if _proxies_counts["streams"] == 0:
+            for name, var in zip(_stream_names, _streams, strict=True):
+                setattr(sys, name, _StreamProxy(getattr(sys, name), var))
+        _proxies_counts["streams"] += 1
+
+
+def _uninstall_stream_proxies() -> None:
+    with _proxies_lock:
+        _proxies_counts["streams"] -= 1
+        if _proxies_counts["streams"] == 0:
+            for name in _stream_names:
+                stream = getattr(sys, name)
+                if isinstance(stream, _StreamProxy):
+                    setattr(sys, name, stream._original)
+
+
+def _install_environ_proxy() -> None:
+    with _proxies_lock:
+        if _proxies_counts["environ"] == 0:
+            os.environ = _EnvironProxy(os.environ)  # type: ignore # noqa: B003
+        _proxies_counts["environ"] += 1
+
+
+def _uninstall_environ_proxy() -> None:
+    with _proxies_lock:
+        _proxies_counts["environ"] -= 1
+        if _proxies_counts["environ"] == 0 and isinstance(os.environ, _EnvironProxy):
+            os.environ = os.environ._original  # type: ignore # noqa: B003
+
+
+def _describe_exception(exc: Exception) -> dict[str, Any]:
+    cls = type(exc)
+    error: dict[str, Any] = {
+        "type": f"{cls.__module__}.{cls.__qualname__}",
+        "message": str(exc),
+    }
+    pydantic = sys.modules.get("pydantic")
+    if pydantic is not None and isinstance(exc, pydantic.ValidationError):
+        error["errors"] = json.loads(exc.json(include_url=False))
+    return error
+
+
+def _get_exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
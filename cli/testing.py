@@ -0,0 +1,29 @@
+from collections.abc import Sequence
+from typing import Any
+
+from click.testing import CliRunner as ClickCliRunner
+from click.testing import Result
+from typer import Typer
+from typer.testing import CliRunner as TyperCliRunner
+
+from .main import CLI
+
+__all__ = ("CliRunner",)
+
+
+class CliRunner(TyperCliRunner):
+    """Test runner for :class:`cli.CLI` applications.
+
+    Applications are invoked through :meth:`cli.CLI.get_command`,
+    so lazy commands and global options are included.
+    """
+
+    def invoke(  # type: ignore
+        self,
+        app: Typer,
+        args: str | Sequence[str] | None = None,
+        **kwargs: Any,
+    ) -> Result:
+        if isinstance(app, CLI):
+            return ClickCliRunner.invoke(self, app.get_command(), args, **kwargs)
+        return super().invoke(app, args, **kwargs)
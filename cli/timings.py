@@ -0,0 +1,244 @@
+"""Timings of phases of command invocations.
+
+Hooks registered with :meth:`cli.CLI.add_timing_hook` (and the summary
+printed with the ``--timings`` option of applications created with
+``timings=True``) receive a :class:`Timing` for each phase of an invocation:
+
+``parse``
+    Parsing of the command line, including callbacks of command groups.
+``model``
+    Building (or looking up cached) validation models.
+``validation``
+    Validation of arguments, including command validators.
+``execution``
+    Execution of the command.
+``debugger``
+    Post-mortem debugger session after an error.
+``total``
+    Whole invocation, reported when the root context is closed.
+
+Commands with async validators or called with missing arguments
+(i.e. not from the command line) are timed as a whole in the ``execution``
+phase and so are commands with variadic parameters and cached commands.
+Commands called by other commands are included in the phases
+of the outer command.
+
+When no hook is registered, invocations are not instrumented and the only
+overhead is a check of a module-level counter in command invokers.
+"""
+
+import json
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import IO, Any, NamedTuple
+
+import click
+
+__all__ = (
+    "Timing",
+    "TimingHook",
+    "Recorder",
+    "TimedContext",
+    "JSONLinesSink",
+    "Summary",
+    "enable",
+    "get_recorder",
+    "timings_option",
+)
+
+PHASES = ("parse", "model", "validation", "execution", "debugger", "total")
+
+# Number of root contexts with timings enabled. It allows command invokers
+# to skip looking up the current context when timings are not used.
+_active = 0
+_lock = threading.Lock()
+
+
+class Timing(NamedTuple):
+    """Timing of a phase of a command invocation.
+
+    Attributes
+    ----------
+    command
+        Command path, e.g. ``prog sub command``.
+    phase
+        Name of the phase.
+    duration
+        Duration in seconds.
+    """
+
+    command: str
+    phase: str
+    duration: float
+
+
+TimingHook = Callable[[Timing], Any]
+
+
+class Recorder:
+    """Recorder of timings of an invocation passing them to hooks."""
+
+    def __init__(self, hooks: list[TimingHook], start: float) -> None:
+        self.hooks = hooks
+        self.start = start
+        self.command = ""
+        self.phase: str | None = None
+        self.phase_start = start
+        self.parsed = False
+
+    @property
+    def running(self) -> bool:
+        """Whether a phase of a command is being recorded."""
+        return self.phase is not None
+
+    def begin(self, phase: str) -> None:
+        """Begin phase and end the current one (or parsing)."""
+        now = perf_counter()
+        if not self.parsed:
+            ctx = click.get_current_context(silent=True)
+            self.command = ctx.command_path if ctx is not None else ""
+            self.parsed = True
+            self.emit("parse", now - self.start)
+        elif self.phase is not None:
+            self.emit(self.phase, now - self.phase_start)
+        self.phase = phase
+        self.phase_start = perf_counter()
+
+    def end(self) -> None:
+        """End the current phase."""
+        if self.phase is not None:
+            self.emit(self.phase, perf_counter() - self.phase_start)
+            self.phase = None
+
+    def run(
+        self, phase: str, func: Callable[..., Any], /, *args: Any, **kwds: Any
+    ) -> Any:
+        """Run function in a phase."""
+        self.begin(phase)
+        try:
+            return func(*args, **kwds)
+        finally:
+            self.end()
+
+    def emit(self, phase: str, duration: float) -> None:
+        """Pass timing of a phase to hooks."""
+        timing = Timing(self.command, phase, duration)
+        for hook in self.hooks:
+            hook(timing)
+
+    def close(self) -> None:
+        """Report the whole invocation."""
+        if self.parsed:
+            self.emit("total", perf_counter() - self.start)
+
+
+class TimedContext(click.Context):
+    """Context recording the start of parsing of the root command.
+
+    Timings are enabled when the context is created with ``timing_hooks``.
+    """
+
+    def __init__(
+        self, *args: Any, timing_hooks: list[TimingHook] | None = None, **kwds: Any
+    ) -> None:
+        self.created = perf_counter()
+        super().__init__(*args, **kwds)
+        if timing_hooks:
+            enable(self, *timing_hooks)
+
+
+class JSONLinesSink:
+    """Hook writing timings as JSON lines to a file or a stream.
+
+    Files are opened in append mode for each timing, so many
+    processes can write to the same file.
+    """
+
+    def __init__(self, target: str | Path | IO[str]) -> None:
+        self.target = target
+
+    def __call__(self, timing: Timing) -> None:
+        line = json.dumps(timing._asdict()) + "\n"
+        if isinstance(self.target, str | Path):
+            with Path(self.target).open("a") as stream:
+                stream.write(line)
+        else:
+            self.target.write(line)
+            self.target.flush()
+
+
+class Summary:
+    """Hook printing summary of timings of an invocation to standard error."""
+
+    def __init__(self) -> None:
+        self.timings: list[Timing] = []
+
+    def __call__(self, timing: Timing) -> None:
+        self.timings.append(timing)
+        if timing.phase == "total":
+            self.report()
+
+    def report(self) -> None:
+        """Print durations of phases summed over all commands."""
+        durations = dict.fromkeys(PHASES, 0.0)
+        for _, phase, duration in self.timings:
+            durations[phase] += duration
+        phases = {t.phase for t in self.timings}
+        command = self.timings[0].command if self.timings else ""
+        lines = [f"Timings of '{command}':"]
+        lines.extend(
+            f"  {phase:<12}{durations[phase] * 1e3:>10.3f} ms"
+            for phase in PHASES
+            if phase in phases
+        )
+        click.echo("\n".join(lines), err=True)
+        self.timings.clear()
+
+
+def get_recorder() -> Recorder | None:
+    """Get recorder of timings of the current invocation."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    return ctx.find_root().meta.get("cli.timings")
+
+
+def enable(ctx: click.Context, *hooks: TimingHook) -> Recorder:
+    """Enable timings of the invocation of the root context with hooks."""
+    global _active
+
+    def close() -> None:
+        global _active
+        with _lock:
+            _active -= 1
+        recorder.close()
+
+    root = ctx.find_root()
+    recorder = root.meta.get("cli.timings")
+    if recorder is None:
+        start = getattr(root, "created", perf_counter())
+        recorder = root.meta["cli.timings"] = Recorder([], start)
+        with _lock:
+            _active += 1
+        root.call_on_close(close)
+    recorder.hooks.extend(hooks)
+    return recorder
+
+
+def timings_option() -> click.Option:
+    """Create ``--timings`` option printing summary of timings of phases."""
+
+    def callback(ctx: click.Context, _: click.Parameter, value: bool) -> None:
+        if value and not ctx.resilient_parsing:
+            enable(ctx, Summary())
+
+    return click.Option(
+        ["--timings"],
+        is_flag=True,
+        is_eager=True,
+        expose_value=False,
+        callback=callback,
+        help="Print timings of phases of the invocation to stderr.",
+    )
@@ -1,10 +1,8 @@
 from collections.abc import Callable
 from inspect import Signature, signature
-from typing import Any
+from typing import Any, Optional
 
-from typer import Option
-
-from .main import Context
+from typer import Context, Option
 
 
 def pdb_callback(
@@ -17,6 +15,35 @@ def pdb_callback(
         ctx.obj.pdb = True
 
 
+def profile_callback(
+    ctx: Context,
+    profile: Optional[str] = Option(  # type: ignore # noqa: UP007
+        None,
+        metavar="FILE",
+        help="Profile command with cProfile and write pstats to FILE "
+        "(or report to stderr with '-').",
+        is_eager=True,
+    ),
+    profile_memory: Optional[str] = Option(  # type: ignore # noqa: UP007
+        None,
+        metavar="FILE",
+        help="Profile memory allocations of command with tracemalloc "
+        "and write report to FILE (or stderr with '-').",
+        is_eager=True,
+    ),
+    profile_collapsed: Optional[str] = Option(  # type: ignore # noqa: UP007
+        None,
+        metavar="FILE",
+        help="Write collapsed stacks of CPU profile to FILE (for flame graphs).",
+        is_eager=True,
+    ),
+) -> None:
+    if profile or profile_memory or profile_collapsed:
+        from .profiling import Profile, enable
+
+        enable(ctx, Profile(profile, profile_memory, profile_collapsed))
+
+
 def match_signature(
     sig: Signature | Callable[..., Any], *args: Any, **kwargs: Any
 ) -> dict[str, Any]:
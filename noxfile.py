@@ -20,3 +20,9 @@ def mypy(session: nox.Session) -> None:
 def test(session: nox.Session) -> None:
     session.install(".[test]")
     session.run("pytest")
+
+
+@nox.session(**session_opts)
+def bench(session: nox.Session) -> None:
+    session.install(".")
+    session.run("python", "benchmarks/bench_suite.py", *session.posargs)
@@ -1,5 +1,6 @@
 import pytest
-from typer.testing import CliRunner
+
+from cli.testing import CliRunner
 
 
 @pytest.fixture(scope="session")
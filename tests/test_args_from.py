@@ -0,0 +1,102 @@
+# type: ignore
+# ruff: noqa: B008
+import io
+from pathlib import Path
+from typing import Annotated
+
+import click
+import pytest
+from pydantic import PositiveInt
+from typer.core import TyperGroup
+
+from cli import CLI, Option, Parse
+from cli.argv import ParserMixin, expand_args
+from cli.testing import CliRunner
+
+
+@pytest.fixture
+def app() -> CLI:
+    app = CLI(args_from=True, output="raw")
+
+    @app.command("count")
+    def count(
+        numbers: Annotated[list[int], Parse(set[PositiveInt])] = Option(
+            [], "--number", "-n"
+        ),
+        label: str = "",
+    ) -> str:
+        return f"{label}{len(numbers)}:{sum(numbers)}"
+
+    @app.command("echo")
+    def echo(words: list[str]) -> str:
+        return " ".join(words)
+
+    return app
+
+
+def test_stdin(runner: CliRunner, app: CLI) -> None:
+    result = runner.invoke(app, "count --args-from -", input="-n 1\n-n 2 -n 2\n")
+    assert result.exit_code == 0
+    assert result.stdout == "2:3\n"
+    result = runner.invoke(app, "count --args-from=- --label x", input="-n 5\n")
+    assert result.stdout == "x1:5\n"
+
+
+def test_response_files(runner: CliRunner, app: CLI, tmp_path: Path) -> None:
+    path = tmp_path / "args.txt"
+    path.write_text("--label 'a b'\n-n 1\n\n--number 2\n")
+    result = runner.invoke(app, ["count", f"@{path}", "-n", "3"])
+    assert result.stdout == "a b3:6\n"
+    result = runner.invoke(app, ["echo", "@@x", "--", f"@{path}"])
+    assert result.stdout == f"@x @{path}\n"
+    result = runner.invoke(app, ["count", f"@{tmp_path / 'missing'}"])
+    assert result.exit_code != 0
+    assert "missing" in result.output
+    assert "--args-from" in runner.invoke(app, "--help").stdout
+
+
+def test_many_arguments(runner: CliRunner, app: CLI) -> None:
+    n = 20_000
+    data = "".join(f"-n {i}\n" for i in range(1, n + 1))
+    result = runner.invoke(app, "count --args-from -", input=data)
+    assert result.stdout == f"{n}:{n * (n + 1) // 2}\n"
+    result = runner.invoke(app, ["count", *data.split()])
+    assert result.stdout == f"{n}:{n * (n + 1) // 2}\n"
+
+
+def test_expand_args() -> None:
+    stdin = io.StringIO("a 'b c'\nd\\ e\n")
+    assert expand_args(["x", "@-", "--args-from"], stdin) == [
+        "x",
+        "a",
+        "b c",
+        "d e",
+        "--args-from",
+    ]
+    with pytest.raises(click.FileError):
+        expand_args(["--args-from", "/nonexistent/args"])
+
+
+def test_disabled(runner: CliRunner) -> None:
+    app = CLI(output="raw")
+
+    @app.command()
+    def echo(words: list[str]) -> str:
+        return " ".join(words)
+
+    result = runner.invoke(app, ["@x"])
+    assert result.stdout == "@x\n"
+    # Parsing of other applications is left to 'click'
+    assert not isinstance(app.get_command(), ParserMixin)
+    app.command("other")(lambda: None)
+    group = app.get_command()
+    assert not isinstance(group, ParserMixin)
+    assert not isinstance(group.commands["echo"], ParserMixin)
+
+
+def test_custom_class() -> None:
+    app = CLI(args_from=True, cls=TyperGroup)
+    app.command("a")(lambda: None)
+    app.command("b")(lambda: None)
+    with pytest.raises(TypeError, match="expanding arguments"):
+        app.get_command()
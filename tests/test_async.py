@@ -0,0 +1,162 @@
+# type: ignore
+import asyncio
+import threading
+import time
+from typing import Any
+
+import click
+import pytest
+
+from cli import CLI, Argument, Option
+from cli.loop import get_loop
+
+app = CLI(batch=True)
+
+
+@app.callback()
+def callback() -> None:
+    pass
+
+
+@app.command("function")
+async def command(x: int = Argument(1), y: int = Option(2)) -> None:
+    await asyncio.sleep(0)
+    print(x, y, threading.current_thread().name)
+
+
+@app.command("context")
+async def context(x: int = Argument(1)) -> None:
+    await asyncio.sleep(0.01)
+    ctx = click.get_current_context()
+    await asyncio.sleep(0.01)
+    print(x, ctx.params["x"], click.get_current_context() is ctx, ctx.obj is not None)
+
+
+class StaticMethod:
+    @app.command("staticmethod")
+    @staticmethod
+    async def command(x: int = Argument(1), y: int = Option(2)) -> None:
+        await asyncio.sleep(0)
+        print(x, y, threading.current_thread().name)
+
+
+class ClassMethod:
+    @app.command("classmethod")
+    @classmethod
+    async def command(cls, x: int = Argument(1), y: int = Option(2)) -> None:
+        await asyncio.sleep(0)
+        print(x, y, threading.current_thread().name)
+
+
+class DerivedClassMethod(ClassMethod):
+    @app.command("derived_classmethod")
+    @classmethod
+    async def command(cls, x: int = Argument(1), y: int = Option(2)) -> None:
+        await super().command(x, y=y)
+        print("derived", cls.__name__)
+
+
+@app.command("before")
+def before(x: int = Argument(1), y: int = Option(2)) -> None:
+    print(x, y)
+
+
+@before.validator(mode="before")
+async def validate_before(obj: dict[str, Any]) -> dict[str, Any]:
+    await asyncio.sleep(0)
+    obj["x"] = int(obj["x"]) * 10
+    return obj
+
+
+class After:
+    @app.command("after")
+    @staticmethod
+    async def command(x: int = Argument(1), y: int = Option(2)) -> None:
+        print(x, y)
+
+    @command.validator(mode="after")
+    async def validate(cls, obj: Any) -> Any:
+        await asyncio.sleep(0)
+        obj.y += obj.x
+        return obj
+
+
+@app.command("sleep")
+async def sleep(delay: float = Argument(0.2)) -> None:
+    await asyncio.sleep(delay)
+    print(id(asyncio.get_running_loop()))
+
+
+@app.command("fail")
+async def fail() -> None:
+    await asyncio.sleep(0)
+    raise ValueError
+
+
+@pytest.mark.parametrize("command", ["function", "staticmethod", "classmethod"])
+def test_async_commands(runner, command: str) -> None:
+    results = runner.invoke(app, f"{command} 3 --y 4")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "3 4 cli-event-loop"
+
+
+def test_derived_async_commands(runner, capsys) -> None:
+    results = runner.invoke(app, "derived_classmethod 3 --y 4")
+    assert results.exit_code == 0
+    assert results.stdout.splitlines() == [
+        "3 4 cli-event-loop",
+        "derived DerivedClassMethod",
+    ]
+    DerivedClassMethod.command("5", y=1)
+    assert capsys.readouterr().out.splitlines() == [
+        "5 1 cli-event-loop",
+        "derived DerivedClassMethod",
+    ]
+
+
+@pytest.mark.parametrize(("command", "output"), [("before", "30 2"), ("after", "3 5")])
+def test_async_validators(runner, command: str, output: str) -> None:
+    results = runner.invoke(app, f"{command} 3")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == output
+
+
+def test_async_errors(runner) -> None:
+    results = runner.invoke(app, "function x")
+    assert results.exit_code == 2
+    results = runner.invoke(app, "fail")
+    assert results.exit_code == 1
+    assert isinstance(results.exception, ValueError)
+
+
+def test_direct_calls(capsys) -> None:
+    StaticMethod.command("5", y="6")
+    ClassMethod.command(5, y=1)
+    After.command(1, y=1)
+    assert capsys.readouterr().out.split("\n")[:3] == [
+        "5 6 cli-event-loop",
+        "5 1 cli-event-loop",
+        "1 2",
+    ]
+
+
+def test_async_validator_mode() -> None:
+    with pytest.raises(TypeError, match="'before' or 'after'"):
+
+        @command.validator(mode="wrap")
+        async def validate(obj: Any, handler: Any) -> Any:
+            return await handler(obj)
+
+
+def test_async_batch_overlaps() -> None:
+    start = time.perf_counter()
+    results = list(app.run_batch(["sleep 0.3"] * 8, jobs=8))
+    elapsed = time.perf_counter() - start
+    assert [r.exit_code for r in results] == [0] * 8
+    assert {r.output.strip() for r in results} == {str(id(get_loop()))}
+    assert elapsed < 0.3 * 4
+
+
+def test_async_click_context() -> None:
+    results = list(app.run_batch([f"context {i}" for i in range(16)], jobs=8))
+    assert [r.output for r in results] == [f"{i} {i} True True\n" for i in range(16)]
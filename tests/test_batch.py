@@ -0,0 +1,112 @@
+# type: ignore
+# ruff: noqa: B008
+import sys
+import threading
+
+import pytest
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, Context, Option
+from cli.batch import run_batch
+from cli.utils import pdb_callback
+
+app = CLI(batch=True)
+
+
+@app.callback()
+def callback(ctx: Context, pdb: bool = Option(False)) -> None:
+    pdb_callback(ctx, pdb)
+
+
+@app.command("command")
+def command(x: PositiveInt = Argument(1), name: str = Option("x")) -> None:
+    print(name * x)
+
+
+LINES = [
+    "command 2",
+    "# comment",
+    "",
+    ["command", "1", "--name", "a b"],
+    "command -- -1",
+    "missing",
+]
+
+
+def test_run_batch() -> None:
+    results = list(app.run_batch(LINES))
+    assert [r.exit_code for r in results] == [0, 0, 1, 2]
+    assert [r.output for r in results[:2]] == ["xx\n", "a b\n"]
+    assert b"ValidationError" in results[2].stderr
+    assert b"No such command" in results[3].stderr
+
+
+def test_run_batch_builds_once(monkeypatch) -> None:
+    calls = []
+    get_command = app.get_command
+    monkeypatch.setattr(app, "get_command", lambda: calls.append(1) or get_command())
+    results = list(app.run_batch(["command"] * 10))
+    assert len(results) == 10
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("lines", "exit_code"), [("command 2\ncommand 3", 0), ("command\nmissing", 2)]
+)
+def test_batch_option(runner, lines: str, exit_code: int) -> None:
+    results = runner.invoke(app, "--batch -", input=lines)
+    assert results.exit_code == exit_code
+    if exit_code:
+        assert results.stdout.startswith("x\n")
+        assert "Batch command 2 failed with exit code 2" in results.stdout
+    else:
+        assert results.stdout == "xx\nxxx\n"
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_run_batch_parallel(executor: str) -> None:
+    lines = [f"command --name {i} -- {i}" for i in range(-2, 20)]
+    # Process workers import the application when other threads are running
+    results = list(run_batch(f"{__name__}:app", lines, jobs=4, executor=executor))
+    assert [r.exit_code for r in results] == [1, 1, 1, *[0] * 19]
+    assert [r.output for r in results[3:]] == [f"{str(i) * i}\n" for i in range(1, 20)]
+    for result in results[:3]:
+        assert result.error["type"] == "pydantic_core._pydantic_core.ValidationError"
+        assert result.error["errors"][0]["loc"] == ["x"]
+
+
+def test_batch_option_jobs(runner) -> None:
+    lines = "\n".join(f"command {i}" for i in range(1, 10))
+    results = runner.invoke(app, "--batch - --jobs 3", input=lines)
+    assert results.exit_code == 0
+    assert results.stdout.split() == ["x" * i for i in range(1, 10)]
+
+
+def test_run_batch_threads_isolated() -> None:
+    threaded = CLI()
+    namespace = {}
+    options = ", ".join(f"o{i}: str = ''" for i in range(30))
+    source = f"def echo(name: str, {options}) -> None:\n    print(name, o0, o29)\n"
+    exec(source, namespace)  # noqa: S102
+    threaded.command("echo")(namespace["echo"])
+    threaded.command("other")(lambda: None)
+    lines = [f"echo v{i} --o0 {i} --o29 {i}" for i in range(2000)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        results = list(threaded.run_batch(lines, jobs=8, executor="thread"))
+    finally:
+        sys.setswitchinterval(interval)
+    assert [r.output for r in results] == [f"v{i} {i} {i}\n" for i in range(2000)]
+
+
+def test_run_batch_no_fork_with_threads() -> None:
+    event = threading.Event()
+    thread = threading.Thread(target=event.wait)
+    thread.start()
+    try:
+        with pytest.raises(ValueError, match="import path"):
+            list(app.run_batch(["command"], jobs=2, executor="process"))
+    finally:
+        event.set()
+        thread.join()
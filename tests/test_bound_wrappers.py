@@ -0,0 +1,61 @@
+# type: ignore
+import gc
+import weakref
+
+import pytest
+
+from cli import CLI, Argument
+
+app = CLI()
+
+
+@app.callback()
+def callback():
+    pass
+
+
+class StaticMethod:
+    @app.command("staticmethod")
+    @staticmethod
+    def command(x: int = Argument(1)) -> None:
+        print(x)
+
+
+class ClassMethod:
+    @app.command("classmethod")
+    @classmethod
+    def command(cls, x: int = Argument(1)) -> None:
+        print(cls.__name__, x)
+
+
+class DerivedClassMethod(ClassMethod):
+    @app.command("derived_classmethod")
+    @classmethod
+    def command(cls, x: int = Argument(1)) -> None:
+        super().command(x)
+
+
+@pytest.mark.parametrize("owner", [StaticMethod, ClassMethod, DerivedClassMethod])
+def test_identity(owner) -> None:
+    assert owner.command is owner.command
+    assert owner().command is owner.command
+
+
+def test_bound_per_class(runner) -> None:
+    assert ClassMethod.command is not DerivedClassMethod.command
+    result = runner.invoke(app, "derived_classmethod 2")
+    assert result.stdout == "DerivedClassMethod 2\n"
+
+
+def test_dynamic_subclasses_collected() -> None:
+    descriptor = ClassMethod.__dict__["command"]
+    subclass = type("Subclass", (ClassMethod,), {})
+    wrapper = subclass.command
+    assert subclass in descriptor._bound
+    assert wrapper.__wrapped__.__name__ == "command"
+    wrapper(3)
+    ref = weakref.ref(subclass)
+    del subclass, wrapper
+    gc.collect()
+    assert ref() is None
+    assert all(cls.__name__ != "Subclass" for cls in descriptor._bound)
@@ -0,0 +1,128 @@
+# type: ignore
+import click
+import pytest
+from typer import Typer
+
+from cli import CLI
+from cli.testing import CliRunner
+
+
+def make_app() -> CLI:
+    app = CLI()
+
+    @app.command("first")
+    def first(x: int) -> None:
+        print(x)
+
+    @app.command("second")
+    def second() -> None:
+        print("second")
+
+    return app
+
+
+def test_cached_command(runner: CliRunner) -> None:
+    app = make_app()
+    command = app.get_command()
+    assert app.get_command() is command
+    for x in range(3):
+        result = runner.invoke(app, f"first {x}")
+        assert result.output == f"{x}\n"
+    assert app.get_command() is command
+
+
+def test_incremental_rebuild(runner: CliRunner) -> None:
+    app = make_app()
+    command = app.get_command()
+
+    @app.command("third")
+    def third() -> None:
+        print("third")
+
+    new = app.get_command()
+    assert new is not command
+    assert list(new.commands) == ["first", "second", "third"]
+    assert new.commands["first"] is command.commands["first"]
+    assert new.commands["second"] is command.commands["second"]
+    assert runner.invoke(app, "third").output == "third\n"
+
+
+def test_replaced_command(runner: CliRunner) -> None:
+    app = make_app()
+    command = app.get_command()
+    info = app.registered_commands[1]
+    app.registered_commands[1] = new_info = type(info)(
+        "second", callback=lambda: print("replaced")
+    )
+    new = app.get_command()
+    assert new.commands["second"] is not command.commands["second"]
+    assert runner.invoke(app, "second").output == "replaced\n"
+    app.registered_commands.remove(new_info)
+    assert not isinstance(app.get_command(), click.Group)
+
+
+def test_callback_and_settings() -> None:
+    app = make_app()
+    command = app.get_command()
+
+    @app.callback()
+    def callback() -> None:
+        """Application."""
+
+    new = app.get_command()
+    assert new is not command
+    assert new.help == "Application."
+    app.batch = True
+    batch = app.get_command()
+    assert batch is not new
+    assert "batch" in [p.name for p in batch.params]
+    app.add_timing_hook(lambda _: None)
+    assert app.get_command() is not batch
+
+
+@pytest.mark.parametrize("sub", [CLI(), Typer()])
+def test_sub_apps(runner: CliRunner, sub: Typer) -> None:
+    app = make_app()
+    app.add_typer(sub, name="sub")
+
+    @sub.command("one")
+    def one() -> None:
+        print("one")
+
+    command = app.get_command()
+    assert runner.invoke(app, "sub one").output == "one\n"
+
+    @sub.command("two")
+    def two() -> None:
+        print("two")
+
+    new = app.get_command()
+    assert new is not command
+    assert new.commands["first"] is command.commands["first"]
+    assert isinstance(new.commands["sub"], click.Group)
+    assert runner.invoke(app, "sub two").output == "two\n"
+
+
+def test_clear_command_cache() -> None:
+    app = make_app()
+    command = app.get_command()
+    app.registered_commands[0].help = "Changed."
+    assert app.get_command() is command
+    app.clear_command_cache()
+    new = app.get_command()
+    assert new.commands["first"] is not command.commands["first"]
+    assert new.commands["first"].help == "Changed."
+
+
+def test_single_command(runner: CliRunner) -> None:
+    app = CLI()
+
+    @app.command()
+    def command(x: int) -> None:
+        print(x)
+
+    assert app.get_command() is app.get_command()
+    assert runner.invoke(app, "1").output == "1\n"
+    assert runner.invoke(app, "2").output == "2\n"
+    names = [p.name for p in app.get_command().params]
+    assert len(names) == len(set(names))
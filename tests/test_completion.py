@@ -0,0 +1,152 @@
+# type: ignore
+# ruff: noqa: B008
+import os
+import subprocess
+import sys
+from enum import StrEnum
+from pathlib import Path
+from typing import Annotated, Literal
+
+import pytest
+
+from cli import CLI, Argument, Option, Parse
+from cli.index import build_index
+
+
+class Color(StrEnum):
+    red = "red"
+    green = "green"
+
+
+def complete_name(ctx, param, incomplete: str) -> list[str]:  # noqa: ARG001
+    return [n for n in ("alice", "bob") if n.startswith(incomplete)]
+
+
+app = CLI(index=True)
+
+
+@app.callback()
+def callback(verbose: bool = Option(False)) -> None:
+    """Root."""
+
+
+@app.command("paint")
+def paint(
+    path: Path = Argument(...),
+    color: Color = Option(Color.red),
+    shade: Annotated[str, Parse(Literal["light", "dark"])] = Option("light"),
+    name: str = Option("x", shell_complete=complete_name),
+) -> None:
+    """Paint things."""
+
+
+@app.command("print")
+def print_(copies: int = Option(1, "--copies", "-c")) -> None:
+    """Print things."""
+
+
+sub = CLI()
+
+
+@sub.command("hello")
+def hello() -> None:
+    """Say hello."""
+
+
+app.add_typer(sub, name="sub")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_CACHE_DIR", str(tmp_path))
+
+
+def complete(monkeypatch, capsys, line: str, *, index: bool = True) -> list[str]:
+    words = line.split()
+    cword = len(words) if line.endswith(" ") else len(words) - 1
+    monkeypatch.setenv("_PROG_COMPLETE", "complete_bash")
+    monkeypatch.setenv("COMP_WORDS", line)
+    monkeypatch.setenv("COMP_CWORD", str(cword))
+    monkeypatch.setattr(app, "index", index)
+    with pytest.raises(SystemExit) as excinfo:
+        app([], prog_name="prog")
+    assert excinfo.value.code == 0
+    return capsys.readouterr().out.splitlines()
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "prog ",
+        "prog p",
+        "prog --",
+        "prog --verbose pr",
+        "prog paint --",
+        "prog paint --color ",
+        "prog paint --color=g",
+        "prog paint x --color red --c",
+        "prog paint --name ",
+        "prog paint --name a",
+        "prog print -c 2 -",
+        "prog sub ",
+    ],
+)
+def test_completion_matches_click(monkeypatch, capsys, line: str) -> None:
+    expected = complete(monkeypatch, capsys, line, index=False)
+    assert complete(monkeypatch, capsys, line) == expected
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("prog ", ["paint", "print", "sub"]),
+        ("prog paint --color ", ["red", "green"]),
+        ("prog paint --shade ", ["light", "dark"]),
+        ("prog paint --shade d", ["dark"]),
+        ("prog print -", ["--copies", "-c", "--help"]),
+        ("prog missing ", [""]),
+    ],
+)
+def test_static_completion(monkeypatch, capsys, line: str, expected: list[str]) -> None:
+    build_index(app, "prog")
+    monkeypatch.setattr(app, "get_command", pytest.fail)
+    assert complete(monkeypatch, capsys, line) == expected
+
+
+def test_dynamic_completion(monkeypatch, capsys) -> None:
+    build_index(app, "prog")
+    assert complete(monkeypatch, capsys, "prog paint --name b") == ["bob"]
+
+
+def test_fast_complete(tmp_path, monkeypatch) -> None:
+    script = tmp_path / "prog"
+    script.write_text(
+        "import atexit, cli, sys\n"
+        "slow = {'typing', 'json', 'hashlib', 'click'}\n"
+        "report = lambda: sys.stderr.write(repr(sorted(slow & set(sys.modules))))\n"
+        "atexit.register(report)\n"
+        "if sys.argv[1:] == ['fast']:\n"
+        "    cli.fast_complete()\n"
+        "sys.stdout.write(repr(sorted(m for m in sys.modules if m == 'typer')))\n"
+    )
+    env = {
+        **os.environ,
+        "CLI_CACHE_DIR": str(tmp_path),
+        "_PROG_COMPLETE": "complete_bash",
+        "COMP_WORDS": "prog paint --color ",
+        "COMP_CWORD": "3",
+    }
+    options = {"capture_output": True, "text": True, "env": env, "check": True}
+    # Without an index the request is left to the application
+    proc = subprocess.run([sys.executable, str(script), "fast"], **options)  # noqa: S603
+    assert proc.stdout == "[]"
+    # Indexes are kept per script
+    monkeypatch.setattr(sys, "argv", [str(script)])
+    build_index(app, "prog")
+    # Importing the package alone never answers requests
+    proc = subprocess.run([sys.executable, str(script)], **options)  # noqa: S603
+    assert proc.stdout == "[]"
+    proc = subprocess.run([sys.executable, str(script), "fast"], **options)  # noqa: S603
+    assert proc.stdout.splitlines() == ["red", "green"]
+    # Requests are answered without importing slow modules
+    assert proc.stderr == "[]"
@@ -8,7 +8,7 @@ from pydantic import Json, PositiveInt, ValidationError
 
 from cli import CLI, Argument, Option, Parse
 
-app = CLI(validate=True)
+app = CLI(validate=True, output="jsonl")
 
 
 @app.callback()
@@ -22,9 +22,8 @@ def command(
     numbers: Annotated[list[int], Parse(set[PositiveInt])] | None = Option(
         None, "--number", "-n"
     ),
-) -> None:
-    print(data)
-    print(numbers)
+) -> tuple[list, set[int]]:
+    return data, numbers
 
 
 @pytest.mark.parametrize("data", [['{"a": 1}'], ['{"a": 1, "b": [1, 2]}', "[1,2]"]])
@@ -41,6 +40,6 @@ def test_complex_params(runner, data: list[str], numbers: list[int]):
     else:
         assert results.exit_code == 0
         data = list(map(json.loads, data))
-        out_data, out_numbers = list(map(eval, results.stdout.strip().split("\n")))
+        out_data, out_numbers = map(json.loads, results.stdout.splitlines())
         assert data == out_data
-        assert out_numbers == set(numbers)
+        assert set(out_numbers) == set(numbers)
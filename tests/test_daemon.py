@@ -0,0 +1,67 @@
+# type: ignore
+# ruff: noqa: B008
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, Context, Option
+from cli.daemon import Server, request
+from cli.utils import pdb_callback
+
+app = CLI()
+
+
+@app.callback()
+def callback(ctx: Context, pdb: bool = Option(False)) -> None:
+    pdb_callback(ctx, pdb)
+
+
+@app.command("command")
+def command(x: PositiveInt = Argument(1)) -> None:
+    print(x, os.environ.get("CLI_TEST_VAR"), Path.cwd())
+
+
+@app.command("echo")
+def echo() -> None:
+    sys.stdout.write(sys.stdin.read().upper())
+    print("done", file=sys.stderr)
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    server = Server(app, tmp_path / "cli.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def test_daemon_command(socket_path, tmp_path) -> None:
+    env = {"CLI_TEST_VAR": "value"}
+    result = request(socket_path, ["command", "2"], env=env, cwd=str(tmp_path))
+    assert result.exit_code == 0
+    assert result.output.split() == ["2", "value", str(tmp_path)]
+    assert "CLI_TEST_VAR" not in os.environ
+
+
+def test_daemon_stdin(socket_path) -> None:
+    result = request(socket_path, ["echo"], stdin=b"abc")
+    assert result.exit_code == 0
+    assert result.stdout == b"ABC"
+    assert result.stderr == b"done\n"
+
+
+@pytest.mark.parametrize(
+    ("argv", "exit_code", "stderr"),
+    [(["command", "--", "-1"], 1, b"ValidationError"), (["missing"], 2, b"missing")],
+)
+def test_daemon_errors(socket_path, argv, exit_code, stderr) -> None:
+    result = request(socket_path, argv)
+    assert result.exit_code == exit_code
+    assert stderr in result.stderr
+    assert request(socket_path, ["command"]).exit_code == 0
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Budget for cumulative time of cold 'import cli' in microseconds
+IMPORT_TIME_BUDGET = 30_000
+
+ROOT = Path(__file__).parent.parent
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Get cumulative import times in microseconds from ``-X importtime``."""
+    stderr = run_python("-X", "importtime", "-c", statement).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time() -> None:
+    times = min((import_times("import cli") for _ in range(3)), key=lambda t: t["cli"])
+    assert times["cli"] <= IMPORT_TIME_BUDGET
+    assert not {"typer", "click", "pydantic"} & set(times)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from cli import CLI, Argument, Option, Parse",
+        "from cli.utils import pdb_callback",
+        "from cli import CLI, Argument\n"
+        "app = CLI()\n"
+        "@app.command()\n"
+        "def command(x: int = Argument(1)) -> None: pass",
+    ],
+)
+def test_lazy_imports(statement: str) -> None:
+    code = f"{statement}\nimport sys\nprint(*sorted(sys.modules))"
+    modules = set(run_python("-c", code).stdout.split())
+    assert "pydantic" not in modules
+    assert "IPython" not in modules
@@ -0,0 +1,163 @@
+# type: ignore
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from cli import CLI
+from cli.index import build_index, load_index
+
+MODULE = """
+from cli import CLI, Argument, Option
+
+sub = CLI()
+
+@sub.command("hello")
+def hello(name: str = Argument("sub"), loud: bool = Option(False)) -> None:
+    \"\"\"Say hello.\"\"\"
+    print(f"hello {name}")
+
+def command(x: int = Argument(1)) -> None:
+    print(x * 2)
+"""
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    name = "indexed_commands_module"
+    path = tmp_path / f"{name}.py"
+    path.write_text(textwrap.dedent(MODULE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("CLI_CACHE_DIR", str(tmp_path / "cache"))
+    yield path
+    sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def app(module):
+    app = CLI(index=True)
+
+    @app.callback()
+    def callback():
+        """Indexed application."""
+
+    app.add_lazy_command("command", f"{module.stem}:command", help="Lazy command.")
+    app.add_lazy_typer(f"{module.stem}:sub", name="sub", help="Lazy group.")
+    return app
+
+
+def run(app, args, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        app(args, prog_name="prog")
+    out, err = capsys.readouterr()
+    return excinfo.value.code, out, err
+
+
+def test_index_metadata(app, module) -> None:
+    index = build_index(app, "prog")
+    assert str(module) in index["sources"]
+    assert "cli" in index["versions"]
+    assert any(s.endswith(("METADATA", "PKG-INFO")) for s in index["sources"])
+    root = index["root"]
+    assert root["help"] == "Indexed application."
+    assert set(root["commands"]) == {"command", "sub"}
+    hello = root["commands"]["sub"]["commands"]["hello"]
+    assert hello["help"] == "Say hello."
+    params = {p["name"]: p for p in hello["params"]}
+    assert params["name"]["default"] == "sub"
+    assert params["loud"]["opts"] == ["--loud"]
+    assert params["loud"]["secondary_opts"] == ["--no-loud"]
+    assert load_index("prog") == index
+
+
+@pytest.mark.parametrize(
+    "args", [["--help"], ["sub", "--help"], ["sub", "hello", "--help"]]
+)
+def test_help_from_index(app, module, capsys, args) -> None:
+    code, expected, _ = run(app, args, capsys)
+    assert code == 0
+    assert module.stem in sys.modules
+    sys.modules.pop(module.stem)
+    code, out, _ = run(app, args, capsys)
+    assert code == 0
+    assert out == expected
+    assert module.stem not in sys.modules
+
+
+def test_unknown_command_from_index(app, module, capsys) -> None:
+    build_index(app, "prog")
+    sys.modules.pop(module.stem)
+    code, _, err = run(app, ["sub", "missing", "--help"], capsys)
+    assert code == 2
+    assert "No such command 'missing'." in err
+    assert "prog sub" in err
+    assert module.stem not in sys.modules
+
+
+def test_stale_index(app, module) -> None:
+    build_index(app, "prog")
+    assert load_index("prog") is not None
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_index("prog") is None
+
+
+def test_stale_registering_module(tmp_path, monkeypatch) -> None:
+    registering = tmp_path / "registering_module.py"
+    registering.write_text(
+        "from cli import CLI\n"
+        "app = CLI(index=True)\n"
+        "app.add_lazy_command('command', 'json:dumps')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setenv("CLI_CACHE_DIR", str(tmp_path / "cache"))
+    try:
+        from registering_module import app
+
+        index = build_index(app, "prog")
+    finally:
+        sys.modules.pop("registering_module", None)
+    assert str(registering) in index["sources"]
+    stat = registering.stat()
+    os.utime(registering, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_index("prog") is None
+
+
+def test_commands_not_served(app, capsys, monkeypatch) -> None:
+    build_index(app, "prog")
+    monkeypatch.setattr("cli.index.load_index", pytest.fail)
+    code, out, _ = run(app, ["sub", "hello", "x"], capsys)
+    assert code == 0
+    assert out == "hello x\n"
+    code, _, err = run(app, ["sub", "missing"], capsys)
+    assert code == 2
+    assert "No such command 'missing'." in err
+
+
+def test_programs_with_same_name(tmp_path) -> None:
+    env = {
+        **os.environ,
+        "CLI_CACHE_DIR": str(tmp_path / "cache"),
+        "PYTHONPATH": str(Path(__file__).parents[1]),
+    }
+    scripts = {}
+    for name in ("alpha", "beta"):
+        script = tmp_path / name / "app.py"
+        script.parent.mkdir()
+        script.write_text(
+            "from cli import CLI\n"
+            "app = CLI(index=True)\n"
+            f"app.command({name!r}, help='Run {name}.')(lambda: None)\n"
+            "app.command('other')(lambda: None)\n"
+            "app()\n"
+        )
+        scripts[name] = script
+    options = {"capture_output": True, "text": True, "env": env, "check": True}
+    for name, script in scripts.items():
+        for _ in range(2):
+            args = [sys.executable, str(script), name, "--help"]
+            proc = subprocess.run(args, **options)  # noqa: S603
+            assert f"Run {name}." in proc.stdout
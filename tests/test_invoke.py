@@ -0,0 +1,114 @@
+# type: ignore
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+import pytest
+
+from cli import CLI
+from cli.runner import capture, environment
+
+
+@pytest.fixture
+def app() -> CLI:
+    app = CLI(output="jsonl", context_settings={"obj": {"calls": 0}})
+
+    @app.command("greet")
+    def greet(name: str, shout: bool = False) -> dict:
+        ctx = click.get_current_context()
+        ctx.obj.calls += 1
+        greeting = os.environ.get("GREETING", "hello")
+        print(greeting if not shout else greeting.upper())
+        return {"name": name, "calls": ctx.obj.calls}
+
+    @app.command("cat")
+    def cat() -> None:
+        for line in sys.stdin:
+            print(line.strip()[::-1])
+
+    @app.command("fail")
+    def fail() -> None:
+        errmsg = "failed"
+        raise RuntimeError(errmsg)
+
+    return app
+
+
+def test_invoke(app: CLI) -> None:
+    stdout = sys.stdout
+    result = app.invoke("greet world --shout", env={"GREETING": "hi"})
+    assert result.exit_code == 0
+    assert result.stdout == b'HI\n{"name":"world","calls":1}\n'
+    assert app.invoke(["greet", "x"]).output.startswith("hello\n")
+    assert app.invoke("cat", stdin="abc\ndef\n").output == "cba\nfed\n"
+    failed = app.invoke("fail")
+    assert failed.exit_code == 1
+    assert isinstance(failed.exception, RuntimeError)
+    assert b"RuntimeError: failed" in failed.stderr
+    assert app.invoke("greet").exit_code == 2
+    assert sys.stdout is stdout
+    assert "GREETING" not in os.environ
+
+
+def test_concurrent_invocations(app: CLI) -> None:
+    # Many parameters widen the window in which shared commands mix up arguments
+    namespace = {}
+    options = ", ".join(f"o{i}: str = ''" for i in range(30))
+    source = f"def echo(name: str, {options}) -> None:\n    print(name, o0, o29)\n"
+    exec(source, namespace)  # noqa: S102
+    app.command("echo")(namespace["echo"])
+
+    def run(i: int) -> bool:
+        greet = app.invoke(["greet", str(i)], env={"GREETING": f"hi-{i}"})
+        echo = app.invoke(f"echo v{i} --o0 {i} --o29 {i}")
+        return (greet.output, echo.output) == (
+            f'hi-{i}\n{{"name":"{i}","calls":1}}\n',
+            f"v{i} {i} {i}\n",
+        )
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            assert all(pool.map(run, range(2000)))
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_commands_per_thread(app: CLI) -> None:
+    barrier = threading.Barrier(4)
+
+    def get_command() -> click.Command:
+        barrier.wait()
+        return app.get_command()
+
+    with ThreadPoolExecutor(4) as pool:
+        commands = [pool.submit(get_command) for _ in range(4)]
+        commands = [future.result() for future in commands]
+    assert len({id(command) for command in commands}) == 4
+    assert app.get_command() is app.get_command()
+
+
+def test_environment() -> None:
+    # Environment is replaced only for invocations setting variables
+    original = os.environ
+    app = CLI()
+    app.command("environ")(lambda: print(os.environ is original))
+    with capture():
+        assert os.environ is original
+    assert app.invoke("").output == "True\n"
+    assert app.invoke("", env={}).output == "False\n"
+    assert os.environ is original
+    os.environ["CLI_TEST_VAR"] = "outer"
+    try:
+        with environment({"CLI_TEST_VAR": None, "CLI_OTHER": "1"}) as environ:
+            assert "CLI_TEST_VAR" not in os.environ
+            assert os.getenv("CLI_OTHER") == "1"
+            os.environ["CLI_THIRD"] = "3"
+            assert environ["CLI_THIRD"] == "3"
+        assert os.environ["CLI_TEST_VAR"] == "outer"
+        assert "CLI_THIRD" not in os.environ
+    finally:
+        del os.environ["CLI_TEST_VAR"]
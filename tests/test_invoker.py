@@ -0,0 +1,41 @@
+# type: ignore
+# ruff: noqa: B008
+import traceback
+
+import pytest
+from pydantic import PositiveInt, ValidationError
+
+from cli import CLI, Argument, Option
+
+app = CLI(validate=True)
+
+
+@app.command("command")
+def command(x: PositiveInt = Argument(1), y=2, *, z: str = Option("z")) -> tuple:
+    if z == "fail":
+        raise RuntimeError
+    return x, y, z
+
+
+invoker = app.registered_commands[0].callback
+
+
+def test_invoker_call() -> None:
+    assert invoker(1, 2, z="a") == (1, 2, "a")
+    assert invoker(x="3", y=4, z="b") == (3, 4, "b")
+    with pytest.raises(ValidationError):
+        invoker(0, 2, z="a")
+
+
+def test_invoker_missing_args() -> None:
+    with pytest.raises(ValidationError):
+        invoker(1, 2)
+
+
+def test_invoker_single_frame() -> None:
+    with pytest.raises(RuntimeError) as excinfo:
+        invoker(1, 2, z="fail")
+    frames = [
+        f.f_code.co_name for f, _ in traceback.walk_tb(excinfo.value.__traceback__)
+    ]
+    assert frames[-2:] == ["__invoke__", "command"]
@@ -0,0 +1,92 @@
+# type: ignore
+import sys
+import textwrap
+import threading
+
+import pytest
+from click.testing import CliRunner as ClickCliRunner
+
+from cli import CLI
+
+MODULE = """
+from cli import CLI, Argument
+
+sub = CLI()
+
+@sub.command("hello")
+def hello(name: str = Argument("sub")) -> None:
+    print(f"hello {name}")
+
+def command(x: int = Argument(1)) -> None:
+    print(x * 2)
+"""
+
+N_LAZY = 200
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    name = "lazy_commands_module"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(MODULE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def app(module):
+    app = CLI()
+
+    @app.callback()
+    def callback():
+        pass
+
+    for i in range(N_LAZY):
+        app.add_lazy_command(f"missing-{i}", f"missing_module_{i}:command")
+    app.add_lazy_command("command", f"{module}:command", help="Lazy command.")
+    app.add_lazy_typer(f"{module}:sub", name="sub", help="Lazy group.")
+    return app
+
+
+def test_lazy_help(runner, app, module) -> None:
+    results = runner.invoke(app, "--help")
+    assert results.exit_code == 0
+    assert "Lazy command." in results.stdout
+    assert "missing-199" in results.stdout
+    assert module not in sys.modules
+
+
+@pytest.mark.parametrize(
+    ("command", "output"),
+    [("command 3", "6"), ("sub hello", "hello sub"), ("sub hello x", "hello x")],
+)
+def test_lazy_dispatch(runner, app, module, command: str, output: str) -> None:
+    results = runner.invoke(app, command)
+    assert results.exit_code == 0
+    assert results.stdout.strip() == output
+    assert module in sys.modules
+    assert not any(f"missing_module_{i}" in sys.modules for i in range(N_LAZY))
+
+
+def test_lazy_only(module) -> None:
+    app = CLI()
+    app.add_lazy_command("command", f"{module}:command")
+    results = ClickCliRunner().invoke(app.get_command(), "command 2")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "4"
+
+
+def test_lazy_invalid_target() -> None:
+    with pytest.raises(ValueError, match="invalid import path"):
+        CLI().add_lazy_command("command", "module.command")
+
+
+def test_lazy_threads(app) -> None:
+    lazy = app.lazy_commands["command"]
+    commands = []
+    thread = threading.Thread(target=lambda: commands.append(lazy.load()))
+    thread.start()
+    thread.join()
+    assert lazy.load() is lazy.load() is not commands[0]
+    assert len(app.registered_descriptors) == 1
+    assert lazy.load().callback is not commands[0].callback
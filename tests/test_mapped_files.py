@@ -0,0 +1,113 @@
+# type: ignore
+# ruff: noqa: B008
+import mmap
+import os
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from cli import CLI, Argument, Option
+from cli.files import Mapped, MappedBytes, MappedFile
+
+app = CLI(validate=True)
+
+
+@app.callback()
+def callback():
+    pass
+
+
+@app.command("file")
+def file(path: MappedFile = Argument()) -> None:
+    assert isinstance(path, mmap.mmap)
+    print(path.readline().decode().strip())
+
+
+@app.command("bytes")
+def view(
+    path: MappedBytes = Argument(),
+    limited: Mapped.bytes(max_size=4) | None = Option(None),
+) -> None:
+    assert isinstance(path, memoryview)
+    assert path.readonly
+    print(path.nbytes, bytes(path[-3:]).decode())
+    if limited is not None:
+        print(limited.nbytes)
+
+
+@pytest.fixture
+def data(tmp_path: Path) -> Path:
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"first\nsecond\nend")
+    return path
+
+
+def test_mapped_file(runner, data: Path) -> None:
+    results = runner.invoke(app, f"file {data}")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "first"
+
+
+def test_mapped_bytes(runner, data: Path, tmp_path: Path) -> None:
+    small = tmp_path / "small"
+    small.write_bytes(b"abc")
+    results = runner.invoke(app, f"bytes {data} --limited {small}")
+    assert results.exit_code == 0
+    assert results.stdout.split() == ["16", "end", "3"]
+
+
+def test_empty_file(runner, tmp_path: Path) -> None:
+    empty = tmp_path / "empty"
+    empty.touch()
+    results = runner.invoke(app, f"bytes {empty}")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "0"
+    results = runner.invoke(app, f"file {empty}")
+    assert results.exit_code == 1
+    assert "cannot memory-map empty file" in str(results.exception)
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        ("bytes {tmp}/missing", "does not exist"),
+        ("bytes {tmp}", "is not a regular file"),
+        ("bytes {data} --limited {data}", "is larger than 4 bytes"),
+    ],
+)
+def test_invalid_files(runner, data: Path, args: str, message: str) -> None:
+    results = runner.invoke(app, args.format(tmp=data.parent, data=data))
+    assert results.exit_code == 1
+    assert isinstance(results.exception, ValidationError)
+    assert message in str(results.exception)
+
+
+@pytest.mark.skipif(os.geteuid() == 0, reason="root can read any file")
+def test_unreadable_file(runner, data: Path) -> None:
+    data.chmod(0)
+    results = runner.invoke(app, f"file {data}")
+    assert results.exit_code == 1
+    assert "is not readable" in str(results.exception)
+
+
+def test_contents_mapped(data: Path) -> None:
+    mapped = Mapped().open(data)
+    assert isinstance(mapped, mmap.mmap)
+    assert len(mapped) == data.stat().st_size
+    view = Mapped(view=True).open(data)
+    assert isinstance(view.obj, mmap.mmap)
+    assert view.nbytes == data.stat().st_size
+
+
+def test_maps_closed(runner, data: Path) -> None:
+    app = CLI()
+    maps = []
+
+    @app.command("keep")
+    def keep(path: MappedFile = Argument(), view: MappedBytes = Option(None)) -> None:
+        maps.extend([path, view.obj])
+
+    results = runner.invoke(app, f"{data} --view {data}")
+    assert results.exit_code == 0
+    assert all(m.closed for m in maps)
@@ -0,0 +1,61 @@
+# type: ignore
+# ruff: noqa: B008
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from cli import CLI, Argument
+
+
+@pytest.fixture
+def apps() -> SimpleNamespace:
+    app = CLI(validate=True)
+
+    @app.callback()
+    def callback():
+        pass
+
+    @app.command("command")
+    def command(x: int = Argument(1), y: int = Argument(2)) -> None:
+        print(x, y)
+
+    sub = CLI(validate=True)
+
+    @sub.command("subcommand")
+    def subcommand(x: int = Argument(1)) -> None:
+        print(x)
+
+    app.add_typer(sub, name="sub")
+    return SimpleNamespace(app=app, sub=sub, command=command, subcommand=subcommand)
+
+
+def test_model_cache(runner, apps) -> None:
+    model = apps.command.model
+    assert apps.command.model is model
+    results = runner.invoke(apps.app, "command")
+    assert results.exit_code == 0
+    assert apps.command.model is model
+
+
+def test_model_cache_validator(runner, apps) -> None:
+    model = apps.command.model
+
+    @apps.command.validator(mode="after")
+    def validate(obj: Any) -> Any:
+        obj.x *= obj.y
+        return obj
+
+    assert apps.command.model is not model
+    results = runner.invoke(apps.app, "command")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "2 2"
+
+
+def test_prebuild_models(apps) -> None:
+    descriptors = (*apps.app.registered_descriptors, *apps.sub.registered_descriptors)
+    for descriptor in descriptors:
+        descriptor._model = None
+    apps.app.prebuild_models()
+    assert apps.command._model is not None
+    assert apps.subcommand._model is not None
@@ -0,0 +1,116 @@
+# type: ignore
+import io
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+from pydantic import BaseModel
+
+from cli import CLI
+from cli.output import render
+from cli.testing import CliRunner
+
+app = CLI(output=True)
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+@dataclass
+class Item:
+    name: str
+    day: date
+
+
+@app.command("points")
+def points(n: int) -> list[Point]:
+    return [Point(x=i, y=-i) for i in range(n)]
+
+
+@app.command("items")
+def items(n: int) -> Iterator[Item]:
+    for i in range(n):
+        yield Item(f"item-{i}", date(2024, 1, i + 1))
+
+
+@app.command("text")
+def text() -> str:
+    print("printed")
+    return "returned"
+
+
+@app.command("nothing")
+def nothing() -> None:
+    pass
+
+
+def test_json(runner: CliRunner) -> None:
+    result = runner.invoke(app, "--output json points 2")
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == [{"x": 0, "y": 0}, {"x": 1, "y": -1}]
+    result = runner.invoke(app, "--output json items 2")
+    assert json.loads(result.stdout) == [
+        {"name": "item-0", "day": "2024-01-01"},
+        {"name": "item-1", "day": "2024-01-02"},
+    ]
+    assert runner.invoke(app, "--output json items 0").stdout == "[]\n"
+
+
+def test_jsonl(runner: CliRunner) -> None:
+    result = runner.invoke(app, "--output jsonl items 3")
+    names = [json.loads(line)["name"] for line in result.stdout.splitlines()]
+    assert names == ["item-0", "item-1", "item-2"]
+    result = runner.invoke(app, "--output jsonl text")
+    assert result.stdout == 'printed\n"returned"\n'
+
+
+def test_raw(runner: CliRunner) -> None:
+    assert runner.invoke(app, "--output raw text").stdout == "printed\nreturned\n"
+    result = runner.invoke(app, "--output raw points 1")
+    assert result.stdout == "x=0 y=0\n"
+
+
+def test_no_output(runner: CliRunner) -> None:
+    assert runner.invoke(app, "text").stdout == "printed\n"
+    assert runner.invoke(app, "--output json nothing").stdout == ""
+    result = runner.invoke(app, "--output yaml text")
+    assert result.exit_code == 2
+
+
+def test_default_format(runner: CliRunner) -> None:
+    default = CLI(output="jsonl")
+
+    @default.command()
+    def command(n: int) -> Iterator[int]:
+        yield from range(n)
+
+    assert runner.invoke(default, "3").stdout == "0\n1\n2\n"
+    assert runner.invoke(default, "--output json 3").stdout == "[0,1,2]\n"
+    plain = CLI()
+    plain.command()(command.func)
+    assert "--output" not in runner.invoke(plain, "--help").stdout
+
+
+def test_streaming() -> None:
+    stream = io.BytesIO()
+    produced = []
+
+    def generate() -> Iterator[int]:
+        for i in range(3):
+            produced.append(i)
+            # Previous items are already written
+            assert stream.getvalue().count(b",") == max(i - 1, 0)
+            yield i
+
+    render(generate(), "json", stream)
+    assert produced == [0, 1, 2]
+    assert stream.getvalue() == b"[0,1,2]\n"
+    stream = io.BytesIO()
+    render({"a": {1}, "b": b"x", "c": object}, "json", stream)
+    assert json.loads(stream.getvalue())["a"] == [1]
+    with pytest.raises(ValueError, match="unknown output format"):
+        render(1, "yaml", stream)
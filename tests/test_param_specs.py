@@ -0,0 +1,60 @@
+# type: ignore
+import pytest
+from typer.models import OptionInfo as TyperOptionInfo
+
+from cli import CLI, Argument, Option
+from cli.commands import _MAX_KEYWORDS
+from cli.models import ArgumentInfo, OptionInfo, get_param_spec
+
+
+def test_compact_params() -> None:
+    opt = Option(1, "--count", "-c", help="Count.", ge=0)
+    assert set(vars(opt)) == {
+        "default",
+        "param_decls",
+        "help",
+        "field_kwargs",
+        "annotation",
+    }
+    assert opt.show_default is True
+    assert opt.errors == "strict"
+    assert opt.param_decls == ("--count", "-c")
+    assert opt.field_kwargs == {"ge": 0, "description": "Count."}
+    arg = Argument(..., hidden=True)
+    assert arg.hidden is True
+    assert arg.metavar is None
+
+
+def test_copy_params() -> None:
+    opt = Option(1, "--count", help="Count.", ge=0)
+    new = opt(2, hidden=True)
+    assert isinstance(new, OptionInfo)
+    assert (new.default, new.hidden, new.help) == (2, True, "Count.")
+    assert new.param_decls == ("--count",)
+    assert new.field_kwargs == opt.field_kwargs
+    typer_opt = TyperOptionInfo(default=3, help="Typer.")
+    converted = OptionInfo.from_param(typer_opt)
+    assert (converted.default, converted.help) == (3, "Typer.")
+    with pytest.raises(TypeError):
+        ArgumentInfo.from_param(typer_opt)
+
+
+def test_param_spec_cache() -> None:
+    assert get_param_spec(OptionInfo) is get_param_spec(OptionInfo)
+    assert "param_decls" in get_param_spec(OptionInfo).defaults
+
+
+def test_many_options(runner) -> None:
+    n = _MAX_KEYWORDS + 45
+    options = {f"o{i}": Option(i, f"--o{i}", ge=0) for i in range(n)}
+    params = ", ".join(f"{name}: int = __options[{name!r}]" for name in options)
+    namespace = {"__options": options}
+    code = f"def command({params}) -> None:\n    print(o0 + o{n - 1})\n"
+    exec(code, namespace)  # noqa: S102
+    app = CLI()
+    app.command("command")(namespace["command"])
+    result = runner.invoke(app, ["--o0", "10"])
+    assert result.exit_code == 0
+    assert result.stdout == f"{10 + n - 1}\n"
+    result = runner.invoke(app, ["--o0", "-1"])
+    assert result.exit_code == 1
@@ -1,4 +1,7 @@
-from cli import CLI, Argument
+import pytest
+from pydantic import ValidationError
+
+from cli import CLI, Argument, Option
 
 app = CLI(validate=True)
 
@@ -21,3 +24,35 @@ def test_param_validators(runner):
     results = runner.invoke(app, catch_exceptions=False)
     assert results.exit_code == 0
     assert results.stdout.strip() == "4 6"
+
+
+def test_compiled_param_validators(runner):
+    app = CLI(validate=True)
+    Number = Option(1, "--number", annotation=int)
+
+    @Number.validator(compiled=True)
+    def check(x):
+        if x > 10:
+            errmsg = "too large"
+            raise ValueError(errmsg)
+        return x * 2
+
+    Other = Number(1, "--other")
+
+    @app.command("command")
+    def command(number: Number.ann = Number, other: Other.ann = Other) -> None:
+        print(number, other)
+
+    @app.command("other")
+    def other() -> None:
+        pass
+
+    results = runner.invoke(app, "command --number 2 --other 3")
+    assert results.stdout.strip() == "4 6"
+    results = runner.invoke(app, "command --number 20 --other 30")
+    assert isinstance(results.exception, ValidationError)
+    errors = results.exception.errors()
+    assert [e["loc"] for e in errors] == [("number",), ("other",)]
+    assert "too large" in errors[0]["msg"]
+    with pytest.raises(TypeError, match="validate=True"):
+        CLI(validate=False).command()(command.func)
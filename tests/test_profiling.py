@@ -0,0 +1,90 @@
+# type: ignore
+import asyncio
+import pstats
+from pathlib import Path
+
+import pytest
+
+from cli import CLI, Argument, Context, Option
+from cli.utils import profile_callback
+
+app = CLI()
+
+
+@app.callback()
+def callback(
+    ctx: Context,
+    profile: str = Option(None),
+    profile_memory: str = Option(None),
+    profile_collapsed: str = Option(None),
+) -> None:
+    profile_callback(ctx, profile, profile_memory, profile_collapsed)
+
+
+retained = []
+
+
+def allocate(n: int) -> list[bytes]:
+    data = [bytes(1000) for _ in range(n)]
+    retained.append(data)
+    return data
+
+
+@app.command("command")
+def command(n: int = Argument(100)) -> None:
+    print(len(allocate(n)))
+
+
+class Commands:
+    @app.command("static")
+    @staticmethod
+    def static(n: int = Argument(100)) -> None:
+        print(len(allocate(n)))
+
+    @app.command("nested")
+    @staticmethod
+    def nested(n: int = Argument(100)) -> None:
+        Commands.static(n)
+
+
+@app.command("async")
+async def async_command(n: int = Argument(100)) -> None:
+    await asyncio.sleep(0)
+    print(len(allocate(n)))
+
+
+@pytest.mark.parametrize("name", ["command", "nested", "async"])
+def test_profile(runner, tmp_path: Path, name: str) -> None:
+    profile = tmp_path / "profile.pstats"
+    collapsed = tmp_path / "profile.collapsed"
+    args = ["--profile", str(profile), "--profile-collapsed", str(collapsed), name]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert result.stdout == "100\n"
+    stats = pstats.Stats(str(profile))
+    assert any(n == "allocate" for *_, n in stats.stats)
+    stacks = [line.rpartition(" ")[0] for line in collapsed.read_text().splitlines()]
+    func = "async_command" if name == "async" else name
+    assert any(f"{func} (" in s and "allocate (" in s for s in stacks)
+
+
+def test_profile_report(runner) -> None:
+    result = runner.invoke(app, ["--profile", "-", "command"])
+    assert result.exit_code == 0
+    assert "function calls" in result.stdout
+    assert "allocate" in result.stdout
+
+
+def test_profile_memory(runner) -> None:
+    result = runner.invoke(app, ["--profile-memory", "-", "command", "1000"])
+    assert result.exit_code == 0
+    assert "Peak memory" in result.stdout
+    assert "test_profiling.py" in result.stdout.split("\n")[3]
+
+
+def test_profile_disabled(runner) -> None:
+    result = runner.invoke(app, ["command"])
+    assert result.stdout == "100\n"
+    from cli import profiling
+
+    assert profiling._active == 0
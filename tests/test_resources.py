@@ -0,0 +1,179 @@
+# type: ignore
+# ruff: noqa: B008
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+import pytest
+
+from cli import CLI, Resource
+from cli.cache import ResultCache
+from cli.resources import Resources, _after_fork
+from cli.testing import CliRunner
+
+
+class Session(Protocol):
+    def get(self, key: str) -> str: ...
+
+
+class FakeSession:
+    def __init__(self, events: list[str]) -> None:
+        self.events = events
+
+    def get(self, key: str) -> str:
+        return key.upper()
+
+
+@pytest.fixture
+def events() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def app(events: list[str]) -> CLI:
+    app = CLI(output="raw")
+
+    @app.resource
+    def config() -> dict[str, str]:
+        events.append("config")
+        return {"prefix": ">"}
+
+    @app.resource(name="session")
+    def make_session():
+        events.append("setup")
+        yield FakeSession(events)
+        events.append("teardown")
+
+    @app.command("get")
+    def get(
+        key: str,
+        session: Session = Resource(),
+        cfg: dict = Resource("config"),
+    ) -> str:
+        return cfg["prefix"] + session.get(key)
+
+    @app.command("other")
+    def other(session: Session = Resource()) -> str:
+        return type(session).__name__
+
+    yield app
+    app.resources.close()
+
+
+def test_injection(runner: CliRunner, app: CLI, events: list[str]) -> None:
+    for key in ("a", "b"):
+        result = runner.invoke(app, f"get {key}")
+        assert result.exit_code == 0
+        assert result.stdout == f">{key.upper()}\n"
+    assert runner.invoke(app, "other").stdout == "FakeSession\n"
+    assert events == ["setup", "config"]
+    help_page = runner.invoke(app, "get --help").stdout
+    assert "session" not in help_page.lower()
+    assert "config" not in help_page.lower()
+
+
+def test_batch(app: CLI, events: list[str]) -> None:
+    results = list(app.run_batch(["get a", "get b", "other"], jobs=2))
+    assert [r.output for r in results] == [">A\n", ">B\n", "FakeSession\n"]
+    assert events.count("setup") == 1
+
+
+def test_teardown(runner: CliRunner, app: CLI, events: list[str]) -> None:
+    runner.invoke(app, "get a")
+    app.resources.close()
+    assert events == ["setup", "config", "teardown"]
+    runner.invoke(app, "get a")
+    assert events[-2:] == ["setup", "config"]
+    app.resources.close()
+    app.resources.close()
+    assert events.count("teardown") == 2
+
+
+def test_teardown_errors() -> None:
+    resources = Resources()
+    closed = []
+
+    def first():
+        yield 1
+        closed.append(1)
+        errmsg = "first"
+        raise ValueError(errmsg)
+
+    def second():
+        yield 2
+        closed.append(2)
+
+    resources.register("first", first)
+    resources.register("second", second)
+    assert resources.get("first") + resources.get("second") == 3
+    with pytest.raises(ValueError, match="first"):
+        resources.close()
+    assert closed == [2, 1]
+    with pytest.raises(LookupError, match="unknown resource 'third'"):
+        resources.get("third")
+
+
+def test_sub_apps(runner: CliRunner, app: CLI) -> None:
+    sub = CLI(output="raw")
+
+    @sub.command("one")
+    def one(session: Session = Resource()) -> str:
+        return session.get("one")
+
+    @sub.command("two")
+    def two() -> None:
+        pass
+
+    app.add_typer(sub, name="sub")
+    assert sub.resources.parent is app.resources
+    assert runner.invoke(app, "sub one").stdout == "ONE\n"
+
+
+def test_threads() -> None:
+    resources = Resources()
+    created = []
+
+    def slow() -> object:
+        time.sleep(0.01)
+        created.append(1)
+        return object()
+
+    resources.register("slow", slow)
+    values = []
+    threads = [
+        threading.Thread(target=lambda: values.append(resources.get("slow")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert len({id(v) for v in values}) == 1
+    _after_fork()
+    assert resources.get("slow") is not values[0]
+    resources.close()
+
+
+def test_cached_commands(tmp_path: Path) -> None:
+    calls = []
+
+    class Commands:
+        app = CLI()
+
+        @app.resource
+        def counter() -> list:
+            return calls
+
+        @app.command("count", cache=ResultCache(directory=tmp_path))
+        @staticmethod
+        def count(x: int, counter: list = Resource()) -> int:
+            counter.append(x)
+            return len(counter)
+
+    assert Commands.count(1) == Commands.count(1) == 1
+    # Resources are not part of cache keys
+    Commands.app.resources.close()
+    assert Commands.count(1) == 1
+    assert calls == [1]
@@ -0,0 +1,156 @@
+# type: ignore
+# ruff: noqa: B008
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Annotated, TextIO
+
+import click
+import pytest
+import typer
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, MappedBytes, Option, Parse, Stream
+from cli.cache import Entry, ResultCache, make_key
+from cli.testing import CliRunner
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResultCache:
+    return ResultCache(directory=tmp_path)
+
+
+@pytest.fixture
+def app(cache: ResultCache) -> CLI:
+    app = CLI(output="jsonl")
+    app.calls = []
+
+    @app.command("report", cache=cache)
+    def report(
+        numbers: Annotated[list[int], Parse(set[PositiveInt])] = Option(
+            [], "--number", "-n"
+        ),
+    ) -> Iterator[int]:
+        app.calls.append(numbers)
+        print("computing")
+        yield from sorted(numbers)
+
+    @app.command("plain")
+    def plain() -> None:
+        pass
+
+    return app
+
+
+def test_cached_results(runner: CliRunner, app: CLI, cache: ResultCache) -> None:
+    first = runner.invoke(app, "report -n 2 -n 1")
+    assert first.exit_code == 0
+    assert first.stdout == "computing\n1\n2\n"
+    # Keys are made from validated arguments
+    second = runner.invoke(app, "report -n 1 -n 2 -n 1")
+    assert second.stdout == first.stdout
+    assert app.calls == [{1, 2}]
+    assert len(list(cache.path.glob("*.pkl"))) == 1
+    runner.invoke(app, "report -n 3")
+    assert len(app.calls) == 2
+
+
+def test_cache_overrides(runner: CliRunner, app: CLI) -> None:
+    runner.invoke(app, "report -n 1")
+    result = runner.invoke(app, "--no-cache report -n 1")
+    assert result.stdout == "computing\n1\n"
+    assert len(app.calls) == 2
+    runner.invoke(app, "--refresh-cache report -n 1")
+    runner.invoke(app, "report -n 1")
+    assert len(app.calls) == 3
+    assert "--no-cache" in runner.invoke(app, "--help").stdout
+    plain = CLI()
+    plain.command()(lambda: None)
+    assert "--no-cache" not in runner.invoke(plain, "--help").stdout
+
+
+def test_failures_not_cached(runner: CliRunner, app: CLI, cache: ResultCache) -> None:
+    result = runner.invoke(app, "report -n -1")
+    assert result.exit_code == 1
+    assert not list(cache.path.glob("*.pkl"))
+    calls = []
+
+    @app.command("fail", cache=cache)
+    def fail() -> None:
+        calls.append(1)
+        print("failing")
+        raise RuntimeError
+
+    for _ in range(2):
+        result = runner.invoke(app, "fail")
+        assert result.stdout == "failing\n"
+        assert isinstance(result.exception, RuntimeError)
+    assert len(calls) == 2
+
+
+def test_ttl_and_eviction(tmp_path: Path) -> None:
+    cache = ResultCache(ttl=60, max_size=1000, directory=tmp_path)
+    cache.set("a", Entry(b"a" * 400, created=time.time()))
+    cache.set("b", Entry(b"b" * 400, created=time.time() - 120))
+    assert cache.get("a").value == b"a" * 400
+    assert cache.get("b") is None
+    old = time.time() - 30
+    os.utime(tmp_path / "a.pkl", (old, old))
+    cache.set("c", Entry(b"c" * 400, created=time.time()))
+    cache.set("d", Entry(b"d" * 400, created=time.time()))
+    assert cache.get("a") is None
+    assert {p.stem for p in tmp_path.glob("*.pkl")} == {"c", "d"}
+    (tmp_path / "c.pkl").write_bytes(b"corrupted")
+    assert cache.get("c") is None
+    assert not cache.set("e", Entry(lambda: None))
+    cache.clear()
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_direct_calls(cache: ResultCache) -> None:
+    calls = []
+
+    class Commands:
+        app = CLI()
+
+        @app.command("square", cache=cache)
+        @staticmethod
+        def square(x: int) -> int:
+            calls.append(x)
+            return x * x
+
+    assert Commands.square(3) == Commands.square(x=3) == 9
+    assert calls == [3]
+    assert make_key("a", {"x": 1}) != make_key("b", {"x": 1})
+    with pytest.raises(TypeError, match="variadic"):
+        Commands.app.command(cache=True)(lambda *_: None)
+
+
+def test_no_keys_without_cache(
+    runner: CliRunner, app: CLI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("cli.cache.make_key", pytest.fail)
+    result = runner.invoke(app, "--no-cache report -n 1")
+    assert result.exit_code == 0
+    assert result.stdout == "computing\n1\n"
+
+
+@pytest.mark.parametrize(
+    ("annotation", "default"),
+    [
+        (Annotated[Iterator[str], Parse(Stream[int])], Argument()),
+        (Annotated[Iterator[str], Parse(Stream[int])] | None, Argument(None)),
+        (MappedBytes, Argument()),
+        (TextIO, Argument()),
+        (typer.FileText, Option("-")),
+        (str, Option("-", click_type=click.File())),
+    ],
+)
+def test_uncacheable_params(cache: ResultCache, annotation, default) -> None:
+    def command(source=default) -> None:
+        pass
+
+    command.__annotations__["source"] = annotation
+    with pytest.raises(TypeError, match="'source' is one"):
+        CLI().command(cache=cache)(command)
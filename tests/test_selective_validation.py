@@ -0,0 +1,123 @@
+# type: ignore
+# ruff: noqa: B008, UP007
+from typing import Annotated, Any, Optional
+
+import pytest
+from pydantic import Json, PositiveInt, ValidationError
+
+from cli import CLI, Argument, Option, Parse
+
+app = CLI(validate=True)
+
+
+@app.callback()
+def callback():
+    pass
+
+
+@app.command("plain")
+def plain(
+    x: int = Argument(1, help="Plain argument."),
+    y: Optional[str] = Option(None),
+    z: Optional[float] = Option(None),
+) -> None:
+    print(x, y, z)
+
+
+@app.command("mixed")
+def mixed(
+    x: int = Argument(1),
+    y: PositiveInt = Option(1),
+    z: Annotated[str, Parse(Json)] = Option("null"),
+    w: int = Option(0, ge=0),
+) -> None:
+    print(x, y, z, w)
+
+
+@app.command("validated")
+def validated(x: int = Argument(1), y: int = Argument(2)) -> None:
+    print(x, y)
+
+
+@validated.validator(mode="after")
+def validate(obj: Any) -> Any:
+    obj.x *= obj.y
+    return obj
+
+
+def test_validated_fields() -> None:
+    assert plain.validated_fields == []
+    assert plain.slim_model is None
+    assert mixed.validated_fields == ["y", "z", "w"]
+    assert list(mixed.slim_model.model_fields) == ["y", "z", "w"]
+
+
+def test_plain_command_skips_models(runner, monkeypatch) -> None:
+    def fail(*_, **__):
+        raise AssertionError
+
+    monkeypatch.setattr(plain, "_create_model", fail)
+    results = runner.invoke(app, "plain 2 --y a --z 1.5")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "2 a 1.5"
+
+
+@pytest.mark.parametrize(
+    ("args", "output"),
+    [
+        ("mixed 2 --y 3", "2 3 None 0"),
+        ("mixed --z [1]", "1 1 [1] 0"),
+        ("mixed --y 0", None),
+        ("mixed --w -1", None),
+    ],
+)
+def test_mixed_command(runner, args: str, output: str | None) -> None:
+    results = runner.invoke(app, args)
+    if output is None:
+        assert results.exit_code == 1
+        assert isinstance(results.exception, ValidationError)
+    else:
+        assert results.exit_code == 0
+        assert results.stdout.strip() == output
+
+
+def test_none_defaults_of_plain_types(runner) -> None:
+    app = CLI()
+
+    @app.command("none")
+    def none(x: int = Option(None), y: Optional[int] = Option(None)) -> None:
+        print(x, y)
+
+    assert none.validated_fields == ["x"]
+    results = runner.invoke(app, "")
+    assert results.exit_code == 1
+    assert isinstance(results.exception, ValidationError)
+    assert "valid integer" in str(results.exception)
+    results = runner.invoke(app, "--x 1")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "1 None"
+
+
+def test_command_validator_uses_full_model(runner) -> None:
+    results = runner.invoke(app, "validated 2 3")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "6 3"
+
+
+def test_direct_calls_use_full_model() -> None:
+    class Commands:
+        app = CLI()
+
+        @app.command("plain")
+        @classmethod
+        def plain(cls, x: int = Argument(1)) -> Any:
+            return x
+
+        @app.command("other")
+        @staticmethod
+        def other() -> None:
+            pass
+
+    assert Commands.plain("3") == 3
+    with pytest.raises(ValidationError):
+        Commands.plain("abc")
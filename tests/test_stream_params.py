@@ -0,0 +1,104 @@
+# type: ignore
+# ruff: noqa: B008
+import json
+from collections.abc import Iterable
+from typing import Annotated
+
+import pytest
+from pydantic import Json, PositiveInt, ValidationError
+from typer import FileText
+
+from cli import CLI, Argument, Option, Parse, Stream
+
+app = CLI(validate=True)
+
+
+@app.callback()
+def callback():
+    pass
+
+
+@app.command("records")
+def records(
+    data: Annotated[FileText, Parse(Stream[Json])] = Argument("-"),
+) -> None:
+    assert not isinstance(data, list)
+    for record in data:
+        print(json.dumps(record))
+
+
+@app.command("skip")
+def skip(
+    numbers: Annotated[list[str], Parse(Stream[PositiveInt, "skip"])] = Argument(),
+) -> None:
+    print(sum(numbers))
+
+
+@app.command("warn")
+def warn(
+    numbers: Annotated[list[str], Parse(Stream[PositiveInt, "warn"])] = Option(
+        [], "-n"
+    ),
+) -> None:
+    print(sum(numbers))
+
+
+@app.command("iterable")
+def iterable(
+    numbers: Annotated[list[str], Parse(Iterable[PositiveInt])] = Argument(),
+) -> None:
+    print(sum(numbers))
+
+
+def test_stream_records(runner) -> None:
+    lines = ['{"a": 1}', "[1, 2]", "null"]
+    results = runner.invoke(app, "records", input="\n".join(lines))
+    assert results.exit_code == 0
+    assert list(map(json.loads, results.stdout.splitlines())) == [
+        {"a": 1},
+        [1, 2],
+        None,
+    ]
+
+
+def test_stream_raise(runner) -> None:
+    results = runner.invoke(app, "records", input='{"a": 1}\n{"a": \n')
+    assert results.exit_code == 1
+    assert results.stdout == '{"a": 1}\n'
+    assert isinstance(results.exception, ValidationError)
+    assert results.exception.errors()[0]["loc"] == (1,)
+
+
+def test_stream_skip(runner) -> None:
+    results = runner.invoke(app, "skip 1 -- -1 x 2")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "3"
+
+
+def test_stream_warn(runner) -> None:
+    with pytest.warns(UserWarning, match="skipping invalid stream item 1"):
+        results = runner.invoke(app, "warn -n 1 -n 0 -n 5")
+    assert results.exit_code == 0
+    assert results.stdout.strip() == "6"
+
+
+@pytest.mark.parametrize(("args", "exit_code"), [("1 2", 0), ("1 -- -2", 1)])
+def test_iterable(runner, args: str, exit_code: int) -> None:
+    results = runner.invoke(app, f"iterable {args}")
+    assert results.exit_code == exit_code
+
+
+def test_stream_is_lazy() -> None:
+    from pydantic import TypeAdapter
+
+    def items():
+        yield "1"
+        raise AssertionError
+
+    stream = TypeAdapter(Stream[int]).validate_python(items())
+    assert next(stream) == 1
+
+
+def test_stream_invalid_policy() -> None:
+    with pytest.raises(ValueError, match="invalid stream error policy"):
+        Stream[int, "ignore"]
@@ -0,0 +1,115 @@
+# type: ignore
+# ruff: noqa: B008
+import io
+import json
+
+import pytest
+from pydantic import PositiveInt
+
+from cli import CLI, Argument, Context, Option
+from cli.timings import JSONLinesSink
+from cli.utils import pdb_callback
+
+app = CLI(timings=True)
+timings = []
+app.add_timing_hook(timings.append)
+
+
+@app.callback()
+def callback(ctx: Context, pdb: bool = Option(False)) -> None:
+    pdb_callback(ctx, pdb)
+
+
+@app.command("command")
+def command(x: PositiveInt = Argument(1)) -> None:
+    print(x)
+
+
+@command.validator(mode="after")
+def validate(obj):
+    obj.x *= 2
+    return obj
+
+
+class Commands:
+    @app.command("nested")
+    @staticmethod
+    def nested(x: int = Argument(1)) -> None:
+        Commands.base(x)
+
+    @app.command("base")
+    @staticmethod
+    def base(x: int = Argument(1)) -> None:
+        print(x)
+
+
+@pytest.fixture(autouse=True)
+def clear():
+    timings.clear()
+
+
+@pytest.mark.parametrize(
+    ("args", "phases"),
+    [
+        ("command 2", ["parse", "model", "validation", "execution", "total"]),
+        ("nested 3", ["parse", "model", "validation", "execution", "total"]),
+        ("command -- -1", ["parse", "model", "validation", "debugger", "total"]),
+    ],
+)
+def test_timing_hooks(runner, args: str, phases: list[str]) -> None:
+    runner.invoke(app, args, prog_name="prog")
+    assert [t.phase for t in timings] == phases
+    assert all(t.command == f"prog {args.split()[0]}" for t in timings[:-1])
+    assert all(t.duration >= 0 for t in timings)
+    assert timings[-1].duration >= sum(t.duration for t in timings[:-1])
+
+
+def test_timings_debugger(runner, monkeypatch) -> None:
+    monkeypatch.setattr("cli.commands.post_mortem", lambda: print("post-mortem"))
+    result = runner.invoke(app, "--pdb command -- -1")
+    assert "post-mortem" in result.stdout
+    assert [t.phase for t in timings][-2:] == ["debugger", "total"]
+
+
+def test_timings_summary(runner) -> None:
+    result = runner.invoke(app, "--timings command 2", prog_name="prog")
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    assert lines[0] == "4"
+    assert lines[1] == "Timings of 'prog command':"
+    assert [line.split()[0] for line in lines[2:]] == [
+        "parse",
+        "model",
+        "validation",
+        "execution",
+        "total",
+    ]
+
+
+def test_json_lines_sink(runner, tmp_path) -> None:
+    path = tmp_path / "timings.jsonl"
+    stream = io.StringIO()
+    app.timing_hooks.extend([JSONLinesSink(path), JSONLinesSink(stream)])
+    try:
+        runner.invoke(app, "command 2", prog_name="prog")
+        runner.invoke(app, "command 3", prog_name="prog")
+    finally:
+        del app.timing_hooks[1:]
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 10
+    assert lines[0]["command"] == "prog command"
+    assert lines[0]["phase"] == "parse"
+    assert stream.getvalue() == path.read_text()
+
+
+def test_no_timings() -> None:
+    from cli import timings
+
+    assert timings._active == 0
+    plain = CLI()
+
+    @plain.command("command")
+    def command(x: int = Argument(1)) -> None:
+        pass
+
+    assert "TimedContext" not in repr(plain.get_command().context_class)